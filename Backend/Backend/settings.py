@@ -50,6 +50,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.common.BrokenLinkEmailsMiddleware',  # For monitoring potential attacks
+    'performance.profiles.ProfileMapMiddleware',
 ]
 
 ROOT_URLCONF = 'Backend.urls'
@@ -209,4 +210,16 @@ CSRF_TRUSTED_ORIGINS = [
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 SECURE_SSL_REDIRECT = False
 SESSION_COOKIE_SECURE = False
-CSRF_COOKIE_SECURE = False
\ No newline at end of file
+CSRF_COOKIE_SECURE = False
+
+# Shared between the gunicorn workers, the job worker and the scheduler; migration api.0017 creates the table.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'django_cache'),
+    }
+}
+
+# Overrides of the nine-box axis weights, e.g. {'performance': {'manager': 0.4, 'tasks': 0.05}}.
+# Unlisted inputs keep the defaults from api.services.nine_box.DEFAULT_NINE_BOX_WEIGHTS.
+NINE_BOX_WEIGHTS = {}
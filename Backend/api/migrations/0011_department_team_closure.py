@@ -0,0 +1,63 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _closure_rows(nodes):
+    parents = dict(nodes)
+    rows = []
+    for node_id in parents:
+        current, depth, seen = node_id, 0, set()
+        while current is not None and current not in seen:
+            seen.add(current)
+            rows.append((current, node_id, depth))
+            current = parents.get(current)
+            depth += 1
+    return rows
+
+
+def backfill_closures(apps, schema_editor):
+    for model_name, closure_name in (('Department', 'DepartmentClosure'), ('Team', 'TeamClosure')):
+        Model = apps.get_model('api', model_name)
+        Closure = apps.get_model('api', closure_name)
+        rows = _closure_rows(Model.objects.values_list('id', 'parent_id'))
+        Closure.objects.bulk_create(
+            [Closure(ancestor_id=ancestor, descendant_id=descendant, depth=depth) for ancestor, descendant, depth in rows],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_assessment_ai_refactor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepartmentClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(default=0)),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='api.department')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='api.department')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'ancestor'], name='department_closure_desc_idx')],
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TeamClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(default=0)),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='api.team')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='api.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'ancestor'], name='team_closure_desc_idx')],
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunPython(backfill_closures, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_department_team_closure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NineBoxEmployeeMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item', models.JSONField(blank=True, default=dict)),
+                ('last_input_change', models.DateTimeField(default=django.utils.timezone.now)),
+                ('computed_at', models.DateTimeField(blank=True, null=True)),
+                ('employee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='nine_box_metrics', to='api.employee')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_input_change'], name='ninebox_metrics_change_idx')],
+            },
+        ),
+    ]
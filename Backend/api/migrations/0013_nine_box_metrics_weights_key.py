@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_nine_box_employee_metrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='nineboxemployeemetrics',
+            name='weights_key',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+    ]
@@ -0,0 +1,85 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.utils import timezone
+
+
+def backfill_goal_progress(apps, schema_editor):
+    Goal = apps.get_model('api', 'Goal')
+    Task = apps.get_model('api', 'Task')
+    PotentialAssessment = apps.get_model('api', 'PotentialAssessment')
+    NineBoxEmployeeMetrics = apps.get_model('api', 'NineBoxEmployeeMetrics')
+
+    progress = {}
+    goals = Goal.objects.values('goal_participants__employee_id').annotate(
+        total=Count('id', distinct=True),
+        completed=Count('id', filter=Q(is_completed=True), distinct=True),
+    )
+    for row in goals:
+        if row['goal_participants__employee_id']:
+            progress.setdefault(row['goal_participants__employee_id'], {}).update(
+                goals_total=row['total'], goals_completed=row['completed']
+            )
+    tasks = Task.objects.values('goal__goal_participants__employee_id').annotate(
+        total=Count('id', distinct=True),
+        completed=Count('id', filter=Q(is_completed=True), distinct=True),
+    )
+    for row in tasks:
+        if row['goal__goal_participants__employee_id']:
+            progress.setdefault(row['goal__goal_participants__employee_id'], {}).update(
+                tasks_total=row['total'], tasks_completed=row['completed']
+            )
+    for employee_id in PotentialAssessment.objects.values_list('employee_id', flat=True).distinct():
+        progress.setdefault(employee_id, {})
+
+    now = timezone.now()
+    NineBoxEmployeeMetrics.objects.bulk_create(
+        [NineBoxEmployeeMetrics(employee_id=employee_id, last_input_change=now, **counters) for employee_id, counters in progress.items()],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['employee'],
+        update_fields=['goals_total', 'goals_completed', 'tasks_total', 'tasks_completed'],
+    )
+
+    latest = (
+        PotentialAssessment.objects.filter(employee_id=OuterRef('employee_id'))
+        .order_by('-created_at', '-pk')
+        .values('pk')[:1]
+    )
+    NineBoxEmployeeMetrics.objects.update(latest_potential=Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_nine_box_metrics_weights_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='nineboxemployeemetrics',
+            name='goals_completed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='nineboxemployeemetrics',
+            name='goals_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='nineboxemployeemetrics',
+            name='latest_potential',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.potentialassessment'),
+        ),
+        migrations.AddField(
+            model_name='nineboxemployeemetrics',
+            name='tasks_completed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='nineboxemployeemetrics',
+            name='tasks_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_goal_progress, migrations.RunPython.noop),
+    ]
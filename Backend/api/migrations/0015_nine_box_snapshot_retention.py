@@ -0,0 +1,47 @@
+import json
+import zlib
+
+from django.db import migrations, models
+
+
+def compress_snapshot_matrices(apps, schema_editor):
+    NineBoxSnapshot = apps.get_model('api', 'NineBoxSnapshot')
+
+    snapshots = NineBoxSnapshot.objects.filter(payload__has_key='matrix').only('id', 'payload')
+    batch = []
+    for snapshot in snapshots.iterator(chunk_size=100):
+        payload = dict(snapshot.payload)
+        matrix = payload.pop('matrix')
+        snapshot.matrix_blob = zlib.compress(json.dumps(matrix, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        snapshot.payload = payload
+        batch.append(snapshot)
+        if len(batch) >= 100:
+            NineBoxSnapshot.objects.bulk_update(batch, ['matrix_blob', 'payload'])
+            batch = []
+    if batch:
+        NineBoxSnapshot.objects.bulk_update(batch, ['matrix_blob', 'payload'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_nine_box_goal_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='nineboxsnapshot',
+            name='matrix_blob',
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='nineboxsnapshot',
+            name='rollup',
+            field=models.CharField(blank=True, choices=[('', 'Нет'), ('daily', 'Итог дня'), ('weekly', 'Итог недели')], default='', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='nineboxsnapshot',
+            index=models.Index(fields=['scope', 'generated_at'], name='ninebox_scope_generated_idx'),
+        ),
+        migrations.RunPython(compress_snapshot_matrices, migrations.RunPython.noop),
+    ]
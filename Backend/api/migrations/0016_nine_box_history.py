@@ -0,0 +1,29 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_nine_box_snapshot_retention'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NineBoxHistoryPoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('performance_score', models.FloatField()),
+                ('potential_score', models.FloatField()),
+                ('nine_box_x', models.PositiveSmallIntegerField()),
+                ('nine_box_y', models.PositiveSmallIntegerField()),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nine_box_history', to='api.employee')),
+            ],
+            options={
+                'ordering': ['employee_id', 'date'],
+                'indexes': [models.Index(fields=['date'], name='ninebox_history_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'date'), name='ninebox_history_employee_date_uniq')],
+            },
+        ),
+    ]
@@ -1,7 +1,12 @@
+import json
 import uuid
+import zlib
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Exists, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 
 class Organization(models.Model):
@@ -45,10 +50,33 @@ class Department(models.Model):
         blank=True,
         related_name='children',
     )
-    
+
     def __str__(self):
         return self.name
 
+    @property
+    def closure_model(self):
+        return DepartmentClosure
+
+    def subtree(self) -> models.QuerySet:
+        """The department together with all of its sub-departments."""
+        return Department.objects.filter(ancestor_links__ancestor_id=self.pk)
+
+    def ancestors(self) -> models.QuerySet:
+        return Department.objects.filter(descendant_links__descendant_id=self.pk).exclude(pk=self.pk)
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            moved = _prepare_hierarchy_save(self)
+            super().save(*args, **kwargs)
+            if moved:
+                _attach_subtree(self)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            _detach_children(self)
+            return super().delete(*args, **kwargs)
+
 
 class Team(models.Model):
     department = models.ForeignKey(
@@ -73,6 +101,141 @@ class Team(models.Model):
     def __str__(self) -> str:
         return f"{self.department.name} • {self.name}"
 
+    @property
+    def closure_model(self):
+        return TeamClosure
+
+    def subtree(self) -> models.QuerySet:
+        """The team together with all of its sub-teams."""
+        return Team.objects.filter(ancestor_links__ancestor_id=self.pk)
+
+    def ancestors(self) -> models.QuerySet:
+        return Team.objects.filter(descendant_links__descendant_id=self.pk).exclude(pk=self.pk)
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            moved = _prepare_hierarchy_save(self)
+            super().save(*args, **kwargs)
+            if moved:
+                _attach_subtree(self)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            _detach_children(self)
+            return super().delete(*args, **kwargs)
+
+
+class DepartmentClosure(models.Model):
+    """Ancestor/descendant pairs of the department tree (including self-links).
+
+    Lets "everything under department X" be a single indexed join instead of
+    walking ``parent`` recursively. Maintained by ``Department.save``/``delete``.
+    """
+
+    ancestor = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['ancestor', 'descendant']
+        indexes = [
+            models.Index(fields=['descendant', 'ancestor'], name='department_closure_desc_idx'),
+        ]
+
+
+class TeamClosure(models.Model):
+    """Ancestor/descendant pairs of the team tree, see ``DepartmentClosure``."""
+
+    ancestor = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['ancestor', 'descendant']
+        indexes = [
+            models.Index(fields=['descendant', 'ancestor'], name='team_closure_desc_idx'),
+        ]
+
+
+def _prepare_hierarchy_save(node) -> bool:
+    """Validate a pending parent change and detach the subtree from its old ancestors.
+
+    Returns ``True`` when the closure rows have to be (re)attached after save.
+    """
+    from django.core.exceptions import ValidationError
+
+    closure = node.closure_model
+    if not node.pk:
+        return True
+
+    previous_parent_id = type(node).objects.filter(pk=node.pk).values_list('parent_id', flat=True).first()
+    has_links = closure.objects.filter(ancestor_id=node.pk, descendant_id=node.pk).exists()
+    if has_links and previous_parent_id == node.parent_id:
+        return False
+
+    subtree_ids = closure.objects.filter(ancestor_id=node.pk).values('descendant_id')
+    if node.parent_id and (
+        node.parent_id == node.pk
+        or closure.objects.filter(ancestor_id=node.pk, descendant_id=node.parent_id).exists()
+    ):
+        raise ValidationError('Нельзя сделать родителем элемент из собственного поддерева.')
+
+    closure.objects.filter(descendant_id__in=subtree_ids).exclude(ancestor_id__in=subtree_ids).delete()
+    return True
+
+
+def _attach_subtree(node) -> None:
+    closure = node.closure_model
+    closure.objects.get_or_create(ancestor_id=node.pk, descendant_id=node.pk, defaults={'depth': 0})
+    if not node.parent_id:
+        return
+
+    ancestors = list(closure.objects.filter(descendant_id=node.parent_id).values_list('ancestor_id', 'depth'))
+    descendants = list(closure.objects.filter(ancestor_id=node.pk).values_list('descendant_id', 'depth'))
+    closure.objects.bulk_create(
+        [
+            closure(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=up + down + 1)
+            for ancestor_id, up in ancestors
+            for descendant_id, down in descendants
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def _detach_children(node) -> None:
+    """Drop links that tie the node's descendants to the node's ancestors.
+
+    ``parent`` is ``SET_NULL``, so after deletion each child becomes a root of
+    its own subtree; the links through the deleted node itself cascade away.
+    """
+    if not node.pk:
+        return
+    closure = node.closure_model
+    closure.objects.filter(
+        ancestor_id__in=closure.objects.filter(descendant_id=node.pk).exclude(ancestor_id=node.pk).values('ancestor_id'),
+        descendant_id__in=closure.objects.filter(ancestor_id=node.pk).exclude(descendant_id=node.pk).values('descendant_id'),
+    ).delete()
+
+
+class EmployeeQuerySet(models.QuerySet):
+    def in_department_subtree(self, department):
+        department_id = getattr(department, 'pk', department)
+        return self.filter(department__ancestor_links__ancestor_id=department_id)
+
+    def in_team_subtree(self, team):
+        team_id = getattr(team, 'pk', team)
+        return self.filter(team__ancestor_links__ancestor_id=team_id)
+
+    def with_active_assignments(self):
+        """Prefetch active role assignments into ``Employee.prefetched_active_assignments``."""
+        return self.prefetch_related(
+            models.Prefetch(
+                'role_assignments',
+                queryset=EmployeeRoleAssignment.objects.active().with_scope_objects(),
+                to_attr='prefetched_active_assignments',
+            )
+        )
+
 
 class Employee(models.Model):
     class Role(models.TextChoices):
@@ -105,7 +268,9 @@ class Employee(models.Model):
     )
     is_manager = models.BooleanField(default=False)
     hire_date = models.DateField()
-    
+
+    objects = EmployeeQuerySet.as_manager()
+
     def __str__(self):
         position_label = self.position.title if self.position else self.position_title or '—'
         team_label = f" • {self.team.name}" if self.team_id else ''
@@ -130,16 +295,32 @@ class Employee(models.Model):
             return self.department.organization
         return None
 
-    def active_role_assignments(self):
-        return self.role_assignments.filter(is_active=True, revoked_at__isnull=True)
+    def active_role_assignments(self) -> list:
+        """Active assignments as a list, served from ``with_active_assignments`` when prefetched."""
+        cached = getattr(self, 'prefetched_active_assignments', None)
+        if cached is not None:
+            return list(cached)
+        return list(self.role_assignments.active().with_scope_objects())
+
+    def clear_active_assignments_cache(self) -> None:
+        self.__dict__.pop('prefetched_active_assignments', None)
+
+    def has_active_role(self, roles, **scope) -> bool:
+        cached = getattr(self, 'prefetched_active_assignments', None)
+        if cached is None:
+            return self.role_assignments.active().filter(role__in=roles, **scope).exists()
+        return any(
+            assignment.role in roles
+            and all(getattr(assignment, field) == value for field, value in scope.items())
+            for assignment in cached
+        )
 
     def has_global_visibility(self) -> bool:
         if self.user and self.user.is_superuser:
             return True
         if self.role in {self.Role.ADMIN, self.Role.BUSINESS_PARTNER}:
             return True
-        assignments = self.active_role_assignments()
-        return assignments.filter(role__in=EmployeeRoleAssignment.Role.global_roles()).exists()
+        return self.has_active_role(EmployeeRoleAssignment.Role.global_roles())
 
     @property
     def has_leadership_scope(self) -> bool:
@@ -147,70 +328,72 @@ class Employee(models.Model):
             return True
         if self.role in {self.Role.ADMIN, self.Role.BUSINESS_PARTNER}:
             return True
-        return self.active_role_assignments().filter(
-            role__in=EmployeeRoleAssignment.Role.leadership_roles()
-        ).exists()
+        return self.has_active_role(EmployeeRoleAssignment.Role.leadership_roles())
 
-    def visible_employee_ids(self, include_self: bool = True) -> set[int]:
-        qs = Employee.objects.all()
+    def visible_employees(self, include_self: bool = True) -> models.QuerySet:
         if self.has_global_visibility():
-            return set(qs.values_list('id', flat=True))
+            return Employee.objects.all()
 
-        visible_ids = set()
+        condition = Exists(
+            EmployeeRoleAssignment.objects.active().filter(employee_id=self.pk).covering()
+        )
         if include_self and self.pk:
-            visible_ids.add(self.pk)
-
-        assignments = list(self.active_role_assignments())
-        for assignment in assignments:
-            visible_ids.update(assignment.visible_employee_ids())
+            condition |= Q(pk=self.pk)
+        return Employee.objects.filter(condition)
 
-        return visible_ids
-
-    def managed_employee_ids(self) -> set[int]:
-        managed = set()
+    def managed_employees(self) -> models.QuerySet:
         if self.has_global_visibility():
-            managed.update(
-                Employee.objects.exclude(pk=self.pk).values_list('id', flat=True)
+            return Employee.objects.exclude(pk=self.pk)
+
+        return Employee.objects.filter(
+            Exists(
+                EmployeeRoleAssignment.objects.active()
+                .leadership()
+                .filter(employee_id=self.pk)
+                .covering()
             )
-        assignments = self.active_role_assignments()
-        for assignment in assignments:
-            managed.update(assignment.visible_employee_ids())
-        managed.discard(self.pk)
-        return managed
+        ).exclude(pk=self.pk)
+
+    def responsible_managers(self) -> models.QuerySet:
+        """Employees whose active leadership scope covers this employee."""
+        return Employee.objects.filter(
+            Exists(
+                EmployeeRoleAssignment.objects.active()
+                .leadership()
+                .filter(employee_id=OuterRef('pk'))
+                .covering_employee(self)
+            )
+        ).exclude(pk=self.pk)
+
+    def visible_employee_ids(self, include_self: bool = True) -> set[int]:
+        return set(self.visible_employees(include_self=include_self).values_list('id', flat=True))
 
     def managed_employee_ids(self) -> set[int]:
-        if self.has_global_visibility():
-            return set(
-                Employee.objects.exclude(pk=self.pk).values_list('id', flat=True)
-            )
+        return set(self.managed_employees().values_list('id', flat=True))
 
-        managed_ids: set[int] = set()
-        for assignment in self.active_role_assignments().filter(
-            role__in=EmployeeRoleAssignment.Role.leadership_roles()
-        ):
-            managed_ids.update(assignment.visible_employee_ids())
+    def manageable_employee_ids(self, employee_ids) -> set[int]:
+        """Subset of ``employee_ids`` this employee may manage, resolved in one query."""
+        candidate_ids = {int(pk) for pk in employee_ids if pk is not None}
+        if not candidate_ids or not self.pk:
+            return set()
+        if self.user and self.user.is_superuser:
+            return candidate_ids
+        if self.role in (self.Role.ADMIN, self.Role.BUSINESS_PARTNER):
+            return candidate_ids
 
-        managed_ids.discard(self.pk)
-        return managed_ids
+        allowed = {self.pk} & candidate_ids
+        remaining = candidate_ids - allowed
+        if remaining:
+            allowed.update(self.managed_employees().filter(pk__in=remaining).values_list('pk', flat=True))
+        return allowed
 
     def can_manage_employee(self, other: 'Employee | None') -> bool:
-        if other is None or not self.pk:
+        if other is None:
             return False
-        if self.user and self.user.is_superuser:
-            return True
-        if self.role == self.Role.ADMIN:
-            return True
-        if self.role == self.Role.BUSINESS_PARTNER:
-            return True
-        if other.pk == self.pk:
-            return True
-        return other.pk in self.managed_employee_ids()
+        return other.pk in self.manageable_employee_ids([other.pk])
 
     def sync_role_from_assignments(self, *, commit: bool = True) -> dict:
-        assignments = self.active_role_assignments()
-        has_leadership = assignments.filter(
-            role__in=EmployeeRoleAssignment.Role.leadership_roles()
-        ).exists()
+        has_leadership = self.has_active_role(EmployeeRoleAssignment.Role.leadership_roles())
 
         desired_role = self.role
         if self.user and self.user.is_superuser:
@@ -236,6 +419,47 @@ class Employee(models.Model):
 
         return updates
 
+def _count_subquery(queryset, group_field: str):
+    counted = queryset.order_by().values(group_field).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counted, output_field=models.IntegerField()), 0)
+
+
+class GoalQuerySet(models.QuerySet):
+    def with_progress(self):
+        """Annotate task and evaluation counters used by ``GoalSerializer``.
+
+        Each counter is a correlated subquery, so joins do not multiply rows and
+        a page of goals is served without per-goal queries.
+        """
+        tasks = Task.objects.filter(goal_id=OuterRef('pk'))
+        evaluations = GoalEvaluationNotification.objects.filter(goal_id=OuterRef('pk'))
+        participant_assessments = SelfAssessment.objects.filter(
+            goal_id=OuterRef('goal_id'),
+            employee_id=OuterRef('employee_id'),
+        )
+        return self.annotate(
+            tasks_total=_count_subquery(tasks, 'goal_id'),
+            tasks_completed=_count_subquery(tasks.filter(is_completed=True), 'goal_id'),
+            evaluations_total=_count_subquery(evaluations, 'goal_id'),
+            evaluations_completed=_count_subquery(evaluations.filter(is_completed=True), 'goal_id'),
+            evaluations_pending=_count_subquery(evaluations.filter(is_completed=False), 'goal_id'),
+            self_assessment_submitted=Exists(
+                GoalParticipant.objects.filter(goal_id=OuterRef('pk')).filter(Exists(participant_assessments))
+            ),
+            awaits_self_assessment=models.ExpressionWrapper(
+                Q(evaluation_launched=True)
+                & Exists(
+                    GoalParticipant.objects.filter(goal_id=OuterRef('pk')).exclude(Exists(participant_assessments))
+                ),
+                output_field=models.BooleanField(),
+            ),
+            awaits_peer_reviews=models.ExpressionWrapper(
+                Q(evaluation_launched=True) & Exists(evaluations.filter(is_completed=False)),
+                output_field=models.BooleanField(),
+            ),
+        )
+
+
 class Goal(models.Model):
     GOAL_TYPES = [
         ('strategic', 'Стратегическая цель'),
@@ -269,7 +493,9 @@ class Goal(models.Model):
         through='GoalParticipant',
         related_name='shared_goals'
     )
-    
+
+    objects = GoalQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
     
@@ -462,13 +688,30 @@ class AssessmentQuestionTemplate(models.Model):
         scope = self.department.name if self.department_id else 'Все отделы'
         return f"{self.get_context_display()} • {scope} • {self.title[:60]}"
 
+class GoalEvaluationNotificationQuerySet(models.QuerySet):
+    def for_feed(self):
+        """Load everything the notification feed renders in two queries."""
+        return self.select_related(
+            'recipient__user',
+            'goal__employee__user',
+            'goal__employee__department',
+        ).prefetch_related(
+            models.Prefetch(
+                'goal__goal_participants',
+                queryset=GoalParticipant.objects.select_related('employee__user', 'employee__department'),
+            )
+        )
+
+
 class GoalEvaluationNotification(models.Model):
     recipient = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='evaluation_notifications')
     goal = models.ForeignKey(Goal, on_delete=models.CASCADE, related_name='evaluation_notifications')
     is_read = models.BooleanField(default=False)
     is_completed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
-    
+
+    objects = GoalEvaluationNotificationQuerySet.as_manager()
+
     class Meta:
         unique_together = ['recipient', 'goal']
         ordering = ['-created_at']
@@ -478,10 +721,22 @@ class GoalEvaluationNotification(models.Model):
 
 
 class NineBoxSnapshot(models.Model):
+    """A stored nine-box matrix of a scope.
+
+    The matrix is kept zlib-compressed in ``matrix_blob``; ``payload`` only holds
+    matrices of rows written before compression was introduced. ``rollup`` marks
+    the rows that retention keeps as the last snapshot of a day or week.
+    """
+
     class Source(models.TextChoices):
         SCHEDULED = 'scheduled', 'Плановое обновление'
         ON_DEMAND = 'on_demand', 'Запрос пользователя'
 
+    class Rollup(models.TextChoices):
+        NONE = '', 'Нет'
+        DAILY = 'daily', 'Итог дня'
+        WEEKLY = 'weekly', 'Итог недели'
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     scope = models.CharField(max_length=64, default='global')
     generated_at = models.DateTimeField(auto_now_add=True)
@@ -495,16 +750,185 @@ class NineBoxSnapshot(models.Model):
         related_name='nine_box_snapshots',
     )
     payload = models.JSONField(default=dict, blank=True)
+    matrix_blob = models.BinaryField(null=True, blank=True, editable=False)
     stats = models.JSONField(default=dict, blank=True)
     ai_recommendations = models.JSONField(default=list, blank=True)
+    rollup = models.CharField(max_length=10, choices=Rollup.choices, blank=True, default=Rollup.NONE)
 
     class Meta:
         ordering = ['-generated_at']
         indexes = [
             models.Index(fields=['scope', 'valid_until'], name='ninebox_scope_valid_idx'),
             models.Index(fields=['generated_at'], name='ninebox_generated_idx'),
+            models.Index(fields=['scope', 'generated_at'], name='ninebox_scope_generated_idx'),
         ]
 
+    @property
+    def matrix(self) -> list:
+        if not hasattr(self, '_matrix'):
+            if self.matrix_blob:
+                self._matrix = json.loads(zlib.decompress(bytes(self.matrix_blob)))
+            else:
+                self._matrix = (self.payload or {}).get('matrix', [])
+        return self._matrix
+
+    def set_matrix(self, matrix: list) -> None:
+        self._matrix = matrix
+        self.matrix_blob = compress_matrix(matrix)
+        self.payload = {key: value for key, value in (self.payload or {}).items() if key != 'matrix'}
+
+
+def compress_matrix(matrix: list) -> bytes:
+    return zlib.compress(json.dumps(matrix, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+class NineBoxHistoryPoint(models.Model):
+    """Position of an employee in the organisation matrix on a given day.
+
+    Written alongside the organisation snapshot (the last refresh of a day
+    wins), so trajectories are read from this table instead of old matrices.
+    """
+
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='nine_box_history')
+    date = models.DateField()
+    performance_score = models.FloatField()
+    potential_score = models.FloatField()
+    nine_box_x = models.PositiveSmallIntegerField()
+    nine_box_y = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['employee_id', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'date'], name='ninebox_history_employee_date_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='ninebox_history_date_idx'),
+        ]
+
+
+def _existing_employee_ids(employee_ids) -> set:
+    """Drop ids of employees deleted meanwhile (the updates run after the commit that may have removed them)."""
+    employee_ids = {pk for pk in employee_ids if pk}
+    if not employee_ids:
+        return employee_ids
+    return set(Employee.objects.filter(pk__in=employee_ids).values_list('pk', flat=True))
+
+
+class NineBoxEmployeeMetricsQuerySet(models.QuerySet):
+    def stale(self):
+        return self.filter(Q(computed_at__isnull=True) | Q(computed_at__lt=models.F('last_input_change')))
+
+    def mark_dirty(self, employee_ids) -> None:
+        """Record that the nine-box inputs of these employees changed right now."""
+        employee_ids = _existing_employee_ids(employee_ids)
+        if not employee_ids:
+            return
+        now = timezone.now()
+        self.bulk_create(
+            [NineBoxEmployeeMetrics(employee_id=pk, last_input_change=now) for pk in employee_ids],
+            update_conflicts=True,
+            unique_fields=['employee'],
+            update_fields=['last_input_change'],
+        )
+
+    def refresh_goal_progress(self, employee_ids) -> None:
+        """Recount goal and task completion of these employees and mark their metrics stale."""
+        employee_ids = _existing_employee_ids(employee_ids)
+        if not employee_ids:
+            return
+        goals = {
+            row['goal_participants__employee_id']: row
+            for row in Goal.objects.filter(goal_participants__employee_id__in=employee_ids)
+            .values('goal_participants__employee_id')
+            .annotate(
+                total=Count('id', distinct=True),
+                completed=Count('id', filter=Q(is_completed=True), distinct=True),
+            )
+        }
+        tasks = {
+            row['goal__goal_participants__employee_id']: row
+            for row in Task.objects.filter(goal__goal_participants__employee_id__in=employee_ids)
+            .values('goal__goal_participants__employee_id')
+            .annotate(
+                total=Count('id', distinct=True),
+                completed=Count('id', filter=Q(is_completed=True), distinct=True),
+            )
+        }
+        now = timezone.now()
+        self.bulk_create(
+            [
+                NineBoxEmployeeMetrics(
+                    employee_id=pk,
+                    goals_total=goals.get(pk, {}).get('total', 0),
+                    goals_completed=goals.get(pk, {}).get('completed', 0),
+                    tasks_total=tasks.get(pk, {}).get('total', 0),
+                    tasks_completed=tasks.get(pk, {}).get('completed', 0),
+                    last_input_change=now,
+                )
+                for pk in employee_ids
+            ],
+            update_conflicts=True,
+            unique_fields=['employee'],
+            update_fields=['goals_total', 'goals_completed', 'tasks_total', 'tasks_completed', 'last_input_change'],
+        )
+
+    def refresh_latest_potential(self, employee_ids) -> None:
+        """Point these employees at their newest potential assessment and mark their metrics stale."""
+        employee_ids = _existing_employee_ids(employee_ids)
+        if not employee_ids:
+            return
+        self.mark_dirty(employee_ids)
+        latest = (
+            PotentialAssessment.objects.filter(employee_id=OuterRef('employee_id'))
+            .order_by('-created_at', '-pk')
+            .values('pk')[:1]
+        )
+        self.filter(employee_id__in=employee_ids).update(latest_potential=Subquery(latest))
+
+
+class NineBoxEmployeeMetrics(models.Model):
+    """Pre-aggregated nine-box inputs and the last computed matrix item of an employee.
+
+    ``last_input_change`` is bumped whenever one of the inputs of the employee's
+    scores is written; the row is stale while ``computed_at`` is older, so a
+    snapshot refresh only recomputes the employees that actually changed.
+    ``weights_key`` fingerprints the axis weights the item was scored with, so
+    changing ``NINE_BOX_WEIGHTS`` invalidates every row.
+
+    The goal/task counters and ``latest_potential`` are maintained by the
+    receivers in ``api.signals`` so that scoring reads them by primary key
+    instead of joining through every goal membership of the scope.
+    """
+
+    employee = models.OneToOneField(Employee, on_delete=models.CASCADE, related_name='nine_box_metrics')
+    item = models.JSONField(default=dict, blank=True)
+    weights_key = models.CharField(max_length=16, blank=True, default='')
+    last_input_change = models.DateTimeField(default=timezone.now)
+    computed_at = models.DateTimeField(null=True, blank=True)
+    goals_total = models.PositiveIntegerField(default=0)
+    goals_completed = models.PositiveIntegerField(default=0)
+    tasks_total = models.PositiveIntegerField(default=0)
+    tasks_completed = models.PositiveIntegerField(default=0)
+    latest_potential = models.ForeignKey(
+        PotentialAssessment,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+
+    objects = NineBoxEmployeeMetricsQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['last_input_change'], name='ninebox_metrics_change_idx'),
+        ]
+
+    @property
+    def is_stale(self) -> bool:
+        return self.computed_at is None or self.computed_at < self.last_input_change
+
+
 class FinalReview(models.Model):
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
     review_period = models.CharField(max_length=50)  # Например: "1 полугодие 2025"
@@ -533,6 +957,53 @@ class EmployeeRoleAssignmentQuerySet(models.QuerySet):
     def active(self):
         return self.filter(is_active=True, revoked_at__isnull=True)
 
+    def with_scope_objects(self):
+        return self.select_related('organization', 'department', 'team', 'position', 'target_employee__user')
+
+    def leadership(self):
+        return self.filter(role__in=EmployeeRoleAssignment.Role.leadership_roles())
+
+    def covering(self, employee_path: str = ''):
+        """Assignments whose scope covers the employee referenced by the outer query.
+
+        ``employee_path`` is the lookup prefix from the outer model to ``Employee``
+        (``''`` when the outer query is over employees, ``'employee__'`` for
+        models with an ``employee`` foreign key). Meant to be wrapped in
+        ``Exists`` so the scoping is evaluated by the database. Department and
+        team scopes include sub-departments and sub-teams via the closure tables.
+        """
+        roles = EmployeeRoleAssignment.Role
+        return self.filter(
+            Q(
+                role=roles.ORGANIZATION_LEAD,
+                organization_id=OuterRef(f'{employee_path}department__organization_id'),
+            )
+            | Q(
+                role=roles.DEPARTMENT_HEAD,
+                department__descendant_links__descendant_id=OuterRef(f'{employee_path}department_id'),
+            )
+            | Q(role=roles.TEAM_LEAD, team__descendant_links__descendant_id=OuterRef(f'{employee_path}team_id'))
+            | Q(role=roles.POSITION_LEAD, position_id=OuterRef(f'{employee_path}position_id'))
+            | Q(role__in=roles.support_roles(), target_employee_id=OuterRef(f'{employee_path}pk'))
+        )
+
+
+    def covering_employee(self, employee: 'Employee'):
+        """Assignments whose scope covers the given employee instance."""
+        roles = EmployeeRoleAssignment.Role
+        condition = Q(role__in=roles.support_roles(), target_employee_id=employee.pk)
+        if employee.department_id:
+            condition |= Q(role=roles.ORGANIZATION_LEAD, organization__departments__id=employee.department_id)
+            condition |= Q(
+                role=roles.DEPARTMENT_HEAD,
+                department__descendant_links__descendant_id=employee.department_id,
+            )
+        if employee.team_id:
+            condition |= Q(role=roles.TEAM_LEAD, team__descendant_links__descendant_id=employee.team_id)
+        if employee.position_id:
+            condition |= Q(role=roles.POSITION_LEAD, position_id=employee.position_id)
+        return self.filter(condition)
+
 
 class EmployeeRoleAssignment(models.Model):
     class Role(models.TextChoices):
@@ -667,11 +1138,13 @@ class EmployeeRoleAssignment(models.Model):
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
+        self.employee.clear_active_assignments_cache()
         self.employee.sync_role_from_assignments(commit=True)
 
     def delete(self, *args, **kwargs):
         employee = self.employee
         super().delete(*args, **kwargs)
+        employee.clear_active_assignments_cache()
         employee.sync_role_from_assignments(commit=True)
 
     def active(self) -> bool:
@@ -690,30 +1163,15 @@ class EmployeeRoleAssignment(models.Model):
             return self.target_employee.user.get_full_name()
         return '—'
 
-    def visible_employee_ids(self) -> set[int]:
+    def visible_employees(self) -> models.QuerySet:
         if not self.active():
-            return set()
-        if self.role == self.Role.ORGANIZATION_LEAD and self.organization_id:
-            return set(
-                Employee.objects.filter(
-                    department__organization_id=self.organization_id
-                ).values_list('id', flat=True)
-            )
-        if self.role == self.Role.DEPARTMENT_HEAD and self.department_id:
-            return set(
-                Employee.objects.filter(department_id=self.department_id).values_list('id', flat=True)
-            )
-        if self.role == self.Role.TEAM_LEAD and self.team_id:
-            return set(
-                Employee.objects.filter(team_id=self.team_id).values_list('id', flat=True)
-            )
-        if self.role == self.Role.POSITION_LEAD and self.position_id:
-            return set(
-                Employee.objects.filter(position_id=self.position_id).values_list('id', flat=True)
-            )
-        if self.role in self.Role.support_roles() and self.target_employee_id:
-            return {self.target_employee_id}
-        return set()
+            return Employee.objects.none()
+        return Employee.objects.filter(
+            Exists(EmployeeRoleAssignment.objects.filter(pk=self.pk).covering())
+        )
+
+    def visible_employee_ids(self) -> set[int]:
+        return set(self.visible_employees().values_list('id', flat=True))
 
     def covers_employee(self, employee: Employee) -> bool:
         if not self.active():
@@ -722,9 +1180,15 @@ class EmployeeRoleAssignment(models.Model):
             org = employee.organization()
             return org and org.id == self.organization_id
         if self.role == self.Role.DEPARTMENT_HEAD and self.department_id:
-            return employee.department_id == self.department_id
+            return bool(employee.department_id) and DepartmentClosure.objects.filter(
+                ancestor_id=self.department_id,
+                descendant_id=employee.department_id,
+            ).exists()
         if self.role == self.Role.TEAM_LEAD and self.team_id:
-            return employee.team_id == self.team_id
+            return bool(employee.team_id) and TeamClosure.objects.filter(
+                ancestor_id=self.team_id,
+                descendant_id=employee.team_id,
+            ).exists()
         if self.role == self.Role.POSITION_LEAD and self.position_id:
             return employee.position_id == self.position_id
         if self.role in self.Role.support_roles() and self.target_employee_id:
@@ -51,6 +51,11 @@ class DepartmentSerializer(serializers.ModelSerializer):
             'parent', 'parent_name', 'employees_count', 'positions'
         ]
 
+    def validate_parent(self, value):
+        if value and self.instance and self.instance.subtree().filter(pk=value.pk).exists():
+            raise serializers.ValidationError('Нельзя выбрать родителем сам отдел или его подотдел.')
+        return value
+
     def create(self, validated_data):
         positions_data = validated_data.pop('positions', [])
         department = super().create(validated_data)
@@ -121,6 +126,11 @@ class TeamSerializer(serializers.ModelSerializer):
             'manager_email',
         ]
 
+    def validate_parent(self, value):
+        if value and self.instance and self.instance.subtree().filter(pk=value.pk).exists():
+            raise serializers.ValidationError('Нельзя выбрать родителем саму команду или её подкоманду.')
+        return value
+
     def _active_team_lead(self, obj):
         cached = getattr(obj, '_cached_team_lead', None)
         if cached is not None:
@@ -234,10 +244,10 @@ class EmployeeSerializer(serializers.ModelSerializer):
             return False
         if obj.has_global_visibility():
             return True
-        return obj.active_role_assignments().filter(
-            role=EmployeeRoleAssignment.Role.DEPARTMENT_HEAD,
+        return obj.has_active_role(
+            (EmployeeRoleAssignment.Role.DEPARTMENT_HEAD,),
             department_id=obj.department_id,
-        ).exists()
+        )
 
     def get_active_roles(self, obj):
         assignments = obj.active_role_assignments()
@@ -438,40 +448,61 @@ class GoalSerializer(serializers.ModelSerializer):
             'created_by': {'required': False, 'allow_null': True},
         }
     
+    @staticmethod
+    def _annotated(obj, name, fallback):
+        """Prefer the value annotated by ``GoalQuerySet.with_progress``."""
+        if hasattr(obj, name):
+            return getattr(obj, name)
+        return fallback()
+
     def get_tasks_completed(self, obj):
-        return obj.tasks.filter(is_completed=True).count()
-    
+        return self._annotated(obj, 'tasks_completed', lambda: obj.tasks.filter(is_completed=True).count())
+
     def get_tasks_total(self, obj):
-        return obj.tasks.count()
+        return self._annotated(obj, 'tasks_total', lambda: obj.tasks.count())
 
     def get_evaluations_total(self, obj):
-        return obj.evaluation_notifications.count()
+        return self._annotated(obj, 'evaluations_total', lambda: obj.evaluation_notifications.count())
 
     def get_evaluations_completed(self, obj):
-        return obj.evaluation_notifications.filter(is_completed=True).count()
+        return self._annotated(
+            obj, 'evaluations_completed', lambda: obj.evaluation_notifications.filter(is_completed=True).count()
+        )
 
     def get_evaluations_pending(self, obj):
-        return obj.evaluation_notifications.filter(is_completed=False).count()
+        return self._annotated(
+            obj, 'evaluations_pending', lambda: obj.evaluation_notifications.filter(is_completed=False).count()
+        )
 
     def get_self_assessment_submitted(self, obj):
-        return obj.self_assessments.filter(employee__in=obj.participants.all()).exists()
+        return self._annotated(
+            obj,
+            'self_assessment_submitted',
+            lambda: obj.self_assessments.filter(employee__in=obj.participants.all()).exists(),
+        )
 
     def get_awaits_self_assessment(self, obj):
         if not obj.evaluation_launched:
             return False
-        return obj.participants.exclude(
-            id__in=obj.self_assessments.values_list('employee_id', flat=True)
-        ).exists()
+        return self._annotated(
+            obj,
+            'awaits_self_assessment',
+            lambda: obj.participants.exclude(
+                id__in=obj.self_assessments.values_list('employee_id', flat=True)
+            ).exists(),
+        )
 
     def get_awaits_peer_reviews(self, obj):
         if not obj.evaluation_launched:
             return False
-        return obj.evaluation_notifications.filter(is_completed=False).exists()
+        return self._annotated(
+            obj, 'awaits_peer_reviews', lambda: obj.evaluation_notifications.filter(is_completed=False).exists()
+        )
 
     def get_employee_name(self, obj):
         if obj.employee_id:
             return obj.employee.user.get_full_name()
-        participants = obj.goal_participants.select_related('employee__user')
+        participants = obj.goal_participants.all()
         return ', '.join([p.employee.user.get_full_name() for p in participants])
 
     def get_department_name(self, obj):
@@ -479,7 +510,7 @@ class GoalSerializer(serializers.ModelSerializer):
             return obj.employee.department.name
         departments = {
             participant.employee.department.name
-            for participant in obj.goal_participants.select_related('employee__department')
+            for participant in obj.goal_participants.all()
             if participant.employee.department
         }
         return ', '.join(sorted(departments)) if departments else ''
@@ -489,7 +520,7 @@ class GoalSerializer(serializers.ModelSerializer):
             return obj.employee.department_id
         department_ids = {
             participant.employee.department_id
-            for participant in obj.goal_participants.select_related('employee__department')
+            for participant in obj.goal_participants.all()
             if participant.employee.department_id
         }
         return next(iter(department_ids), None)
@@ -599,7 +630,7 @@ class GoalEvaluationNotificationSerializer(serializers.ModelSerializer):
             return obj.goal.employee.user.get_full_name()
         return ', '.join(
             participant.employee.user.get_full_name()
-            for participant in obj.goal.goal_participants.select_related('employee__user')
+            for participant in obj.goal.goal_participants.all()
         )
 
     def get_department_name(self, obj):
@@ -607,7 +638,7 @@ class GoalEvaluationNotificationSerializer(serializers.ModelSerializer):
             return obj.goal.employee.department.name
         departments = {
             participant.employee.department.name
-            for participant in obj.goal.goal_participants.select_related('employee__department')
+            for participant in obj.goal.goal_participants.all()
             if participant.employee.department
         }
         return ', '.join(sorted(departments)) if departments else ''
@@ -1,10 +1,34 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+from django.core.cache import cache
+from django.db.models import Q
+
+from .cache_versions import bump_cache_version, cache_version
 from ..models import AssessmentQuestionTemplate
 
+QUESTION_BANK_CACHE_TTL = 24 * 60 * 60
+QUESTION_BANK_VERSION_KEY = 'assessment_question_bank:version'
+
+# Template columns kept in the cached bank: what scoring and the department merge need, nothing else.
+QUESTION_BANK_FIELDS = (
+    'id',
+    'department_id',
+    'order',
+    'title',
+    'category',
+    'answer_type',
+    'correct_answer',
+    'tolerance',
+    'max_score',
+    'weight',
+)
+
+# (answer) -> (normalised answer, score, is_correct)
+Scorer = Callable[[Any], Tuple[Any, float, bool]]
+
 
 @dataclass
 class QuestionEvaluation:
@@ -45,19 +69,6 @@ class EvaluationResult:
         return [answer.as_json() for answer in self.answers]
 
 
-def get_effective_question_bank(context: str, department_id: Optional[int]) -> List[AssessmentQuestionTemplate]:
-    base_queryset = AssessmentQuestionTemplate.objects.filter(context=context, is_active=True).order_by('order', 'created_at')
-    global_questions = list(base_queryset.filter(department__isnull=True))
-    if not department_id:
-        return global_questions
-
-    department_questions = list(base_queryset.filter(department_id=department_id))
-    result: Dict[int, AssessmentQuestionTemplate] = {question.order: question for question in global_questions}
-    for question in department_questions:
-        result[question.order] = question
-    return [result[key] for key in sorted(result.keys())]
-
-
 def _parse_boolean(answer: Any) -> Optional[bool]:
     if isinstance(answer, bool):
         return answer
@@ -108,86 +119,217 @@ def _build_category_breakdown(evaluations: Iterable[QuestionEvaluation]) -> List
     return breakdown
 
 
+@dataclass(frozen=True)
+class CompiledQuestion:
+    question_id: str
+    title: str
+    category: str
+    answer_type: str
+    max_score: float
+    weight: int
+    score: Scorer
+
+
+def _scale_scorer(question: Dict[str, Any]) -> Scorer:
+    limit = float(question['max_score'])
+    threshold = question['max_score'] * 0.7
+    weight = question['weight']
+
+    def score(raw_answer):
+        numeric_answer = _parse_number(raw_answer)
+        if numeric_answer is None:
+            return None, 0.0, False
+        clamped = max(0.0, min(limit, numeric_answer))
+        return numeric_answer, clamped * weight, clamped >= threshold
+
+    return score
+
+
+def _numeric_scorer(question: Dict[str, Any], max_score: float) -> Scorer:
+    expected = _parse_number(question['correct_answer'])
+    tolerance = float(question['tolerance'] or 0)
+
+    def score(raw_answer):
+        numeric_answer = _parse_number(raw_answer)
+        if numeric_answer is not None and expected is not None and abs(numeric_answer - expected) <= tolerance:
+            return numeric_answer, max_score, True
+        return numeric_answer, 0.0, False
+
+    return score
+
+
+def _single_choice_scorer(question: Dict[str, Any], max_score: float) -> Scorer:
+    expected = question['correct_answer']
+    is_collection = isinstance(expected, (list, tuple, set))
+
+    def score(raw_answer):
+        if raw_answer is None or expected is None:
+            return raw_answer, 0.0, False
+        is_correct = raw_answer in expected if is_collection else raw_answer == expected
+        return raw_answer, max_score if is_correct else 0.0, is_correct
+
+    return score
+
+
+def _boolean_scorer(question: Dict[str, Any], max_score: float) -> Scorer:
+    expected = _parse_boolean(question['correct_answer'])
+
+    def score(raw_answer):
+        bool_answer = _parse_boolean(raw_answer)
+        if bool_answer is None or expected is None:
+            return bool_answer, 0.0, False
+        is_correct = bool_answer is expected
+        return bool_answer, max_score if is_correct else 0.0, is_correct
+
+    return score
+
+
+def _unscored(raw_answer):
+    return raw_answer, 0.0, False
+
+
+def compile_question(question: Dict[str, Any]) -> CompiledQuestion:
+    """Compile a template row with the ``QUESTION_BANK_FIELDS`` columns."""
+    max_score = float(question['max_score'] or 0) * question['weight']
+    answer_type = question['answer_type']
+    if answer_type == 'scale':
+        scorer = _scale_scorer(question)
+    elif answer_type == 'numeric':
+        scorer = _numeric_scorer(question, max_score)
+    elif answer_type == 'single_choice':
+        scorer = _single_choice_scorer(question, max_score)
+    elif answer_type == 'boolean':
+        scorer = _boolean_scorer(question, max_score)
+    else:
+        scorer = _unscored
+    return CompiledQuestion(
+        question_id=str(question['id']),
+        title=question['title'],
+        category=question['category'] or '',
+        answer_type=answer_type,
+        max_score=max_score,
+        weight=question['weight'],
+        score=scorer,
+    )
+
+
+class QuestionBank:
+    """Effective questions of a (context, department) pair, compiled for scoring."""
+
+    def __init__(self, questions: List[Dict[str, Any]]) -> None:
+        self.questions = questions
+        self.compiled = [compile_question(question) for question in questions]
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def evaluate(self, answers: Iterable[Dict[str, Any]]) -> EvaluationResult:
+        answer_map = {str(item.get('question_id') or item.get('id')): item for item in answers if item}
+
+        evaluations: List[QuestionEvaluation] = []
+        total_score = 0.0
+        total_max = 0.0
+
+        for question in self.compiled:
+            raw_answer_payload = answer_map.get(question.question_id, {})
+            raw_answer = raw_answer_payload.get('answer') if isinstance(raw_answer_payload, dict) else raw_answer_payload
+            answer_value, score, is_correct = question.score(raw_answer)
+
+            total_score += score
+            total_max += question.max_score
+            evaluations.append(
+                QuestionEvaluation(
+                    question_id=question.question_id,
+                    title=question.title,
+                    category=question.category,
+                    answer_type=question.answer_type,
+                    answer=answer_value,
+                    score=score,
+                    max_score=question.max_score,
+                    weight=question.weight,
+                    is_correct=is_correct,
+                )
+            )
+
+        accuracy = (total_score / total_max * 100) if total_max else 0.0
+        categories = _build_category_breakdown(evaluations)
+
+        return EvaluationResult(
+            answers=evaluations,
+            total_score=total_score,
+            total_max_score=total_max,
+            accuracy=accuracy,
+            categories=categories,
+        )
+
+
+# (context, department_id) -> (version, bank); rebuilt when another process bumps the version.
+_compiled_banks: Dict[Tuple[str, Optional[int]], Tuple[int, QuestionBank]] = {}
+
+
+def _load_questions(context: str, department_id: Optional[int]) -> List[Dict[str, Any]]:
+    scope = Q(department__isnull=True)
+    if department_id:
+        scope |= Q(department_id=department_id)
+    questions = list(
+        AssessmentQuestionTemplate.objects.filter(scope, context=context, is_active=True)
+        .order_by('order', 'created_at')
+        .values(*QUESTION_BANK_FIELDS)
+    )
+    if not department_id:
+        return questions
+
+    # Department questions replace the global ones with the same order.
+    result: Dict[int, Dict[str, Any]] = {}
+    for question in questions:
+        if question['department_id'] is None:
+            result[question['order']] = question
+    for question in questions:
+        if question['department_id'] is not None:
+            result[question['order']] = question
+    return [result[key] for key in sorted(result.keys())]
+
+
+def get_question_bank(context: str, department_id: Optional[int]) -> QuestionBank:
+    """Return the compiled question bank, from this process, the shared cache or the database.
+
+    The bank version is read through ``cache_version``, which keeps it in
+    process for a few seconds, so a warm bank costs no query at all.
+    """
+    department_id = int(department_id) if department_id else None
+    version = cache_version(QUESTION_BANK_VERSION_KEY)
+    key = (context, department_id)
+
+    cached = _compiled_banks.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    cache_key = f'assessment_question_bank:{version}:{context}:{department_id or "global"}'
+    questions = cache.get(cache_key)
+    if questions is None:
+        questions = _load_questions(context, department_id)
+        cache.set(cache_key, questions, QUESTION_BANK_CACHE_TTL)
+
+    bank = QuestionBank(questions)
+    _compiled_banks[key] = (version, bank)
+    return bank
+
+
+def invalidate_question_banks() -> None:
+    bump_cache_version(QUESTION_BANK_VERSION_KEY)
+
+
+def get_effective_question_bank(context: str, department_id: Optional[int]) -> List[AssessmentQuestionTemplate]:
+    """Templates of the effective bank for display, with ``department`` and ``created_by`` read fresh."""
+    ids = [question['id'] for question in get_question_bank(context, department_id).questions]
+    templates = AssessmentQuestionTemplate.objects.select_related('department', 'created_by__user').in_bulk(ids)
+    return [templates[pk] for pk in ids if pk in templates]
+
+
 def evaluate_answers(
     *,
     context: str,
     answers: Iterable[Dict[str, Any]],
     department_id: Optional[int],
 ) -> EvaluationResult:
-    answer_map = {str(item.get('question_id') or item.get('id')): item for item in answers if item}
-    question_bank = get_effective_question_bank(context, department_id)
-
-    evaluations: List[QuestionEvaluation] = []
-    total_score = 0.0
-    total_max = 0.0
-
-    for question in question_bank:
-        question_id = str(question.id)
-        raw_answer_payload = answer_map.get(question_id, {})
-        raw_answer = raw_answer_payload.get('answer') if isinstance(raw_answer_payload, dict) else raw_answer_payload
-        score = 0.0
-        max_score = float(question.max_score or 0) * question.weight
-        is_correct = False
-
-        if question.answer_type == 'scale':
-            numeric_answer = _parse_number(raw_answer)
-            if numeric_answer is not None:
-                clamped = max(0.0, min(float(question.max_score), numeric_answer))
-                score = clamped * question.weight
-                is_correct = clamped >= question.max_score * 0.7
-            answer_value = numeric_answer
-        elif question.answer_type == 'numeric':
-            numeric_answer = _parse_number(raw_answer)
-            answer_value = numeric_answer
-            expected = _parse_number(question.correct_answer)
-            tolerance = float(question.tolerance or 0)
-            if numeric_answer is not None and expected is not None:
-                delta = abs(numeric_answer - expected)
-                if delta <= tolerance:
-                    score = max_score
-                    is_correct = True
-        elif question.answer_type == 'single_choice':
-            answer_value = raw_answer
-            expected_value = question.correct_answer
-            if answer_value is not None and expected_value is not None:
-                if isinstance(expected_value, (list, tuple, set)):
-                    is_correct = answer_value in expected_value
-                else:
-                    is_correct = answer_value == expected_value
-                score = max_score if is_correct else 0.0
-        elif question.answer_type == 'boolean':
-            bool_answer = _parse_boolean(raw_answer)
-            answer_value = bool_answer
-            expected_bool = _parse_boolean(question.correct_answer)
-            if bool_answer is not None and expected_bool is not None:
-                is_correct = bool_answer is expected_bool
-                score = max_score if is_correct else 0.0
-        else:
-            answer_value = raw_answer
-
-        total_score += score
-        total_max += max_score
-        evaluations.append(
-            QuestionEvaluation(
-                question_id=question_id,
-                title=question.title,
-                category=question.category or '',
-                answer_type=question.answer_type,
-                answer=answer_value,
-                score=score,
-                max_score=max_score,
-                weight=question.weight,
-                is_correct=is_correct,
-            )
-        )
-
-    accuracy = (total_score / total_max * 100) if total_max else 0.0
-    categories = _build_category_breakdown(evaluations)
-
-    return EvaluationResult(
-        answers=evaluations,
-        total_score=total_score,
-        total_max_score=total_max,
-        accuracy=accuracy,
-        categories=categories,
-    )
\ No newline at end of file
+    return get_question_bank(context, department_id).evaluate(answers)
@@ -0,0 +1,54 @@
+"""Version counters for cached data that is invalidated as a whole.
+
+The current version is part of every cache key of a family; bumping it makes
+all older entries unreachable and lets them expire on their own. Counters live
+in the shared cache, so a bump in one process is seen by all of them.
+
+Each process keeps the versions it read for ``LOCAL_VERSION_TTL`` seconds, so
+hot paths do not ask the shared cache (a table with the default backend) on
+every call. A bump in another process is therefore picked up within that
+window; a bump in this process is seen immediately.
+"""
+from __future__ import annotations
+
+import time
+from typing import Dict, Tuple
+
+from django.core.cache import cache
+
+LOCAL_VERSION_TTL = 5.0
+
+# key -> (monotonic time of the read, version)
+_local_versions: Dict[str, Tuple[float, int]] = {}
+
+
+def _shared_version(key: str, initial: int) -> int:
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, initial, None)
+        version = cache.get(key)
+    return version
+
+
+def _clock_version() -> int:
+    # Start from the clock rather than 1: entries of an evicted counter must not become valid again.
+    return int(time.time() * 1000)
+
+
+def cache_version(key: str) -> int:
+    now = time.monotonic()
+    local = _local_versions.get(key)
+    if local is not None and now - local[0] < LOCAL_VERSION_TTL:
+        return local[1]
+    version = _shared_version(key, _clock_version())
+    _local_versions[key] = (now, version)
+    return version
+
+
+def bump_cache_version(key: str) -> None:
+    try:
+        version = cache.incr(key)
+    except ValueError:
+        known = _local_versions.get(key, (0.0, 0))[1]
+        version = _shared_version(key, max(_clock_version(), known + 1))
+    _local_versions[key] = (time.monotonic(), version)
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Q
+
+from .cache_versions import bump_cache_version, cache_version
+from ..models import Employee, Feedback360, FinalReview, ManagerReview, PotentialAssessment, SelfAssessment
+
+SCORE_FIELDS = (
+    'self_assessment_score',
+    'feedback_360_score',
+    'manager_review_score',
+    'potential_score',
+    'total_score',
+    'salary_recommendation',
+)
+
+STATISTICS_CACHE_TTL = 300
+STATISTICS_VERSION_KEY = 'final_review_stats:version'
+
+
+def salary_recommendation_for(total_score: float) -> str:
+    if total_score <= 12:
+        return 'exclude'
+    if total_score <= 15:
+        return 'conditional'
+    return 'include'
+
+
+def _grouped_average(queryset, field: str) -> Dict[int, float]:
+    return {
+        row['employee']: row['avg']
+        for row in queryset.values('employee').annotate(avg=Avg(field))
+    }
+
+
+def compute_final_review_scores(employee_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """Component scores, total and salary recommendation per employee, four grouped queries in total."""
+    employee_ids = list(employee_ids)
+    if not employee_ids:
+        return {}
+
+    self_scores = _grouped_average(SelfAssessment.objects.filter(employee_id__in=employee_ids), 'calculated_score')
+    feedback_scores = _grouped_average(Feedback360.objects.filter(employee_id__in=employee_ids), 'calculated_score')
+    manager_scores = _grouped_average(ManagerReview.objects.filter(employee_id__in=employee_ids), 'calculated_score')
+    potential_scores = _grouped_average(PotentialAssessment.objects.filter(employee_id__in=employee_ids), 'potential_score')
+
+    scores = {}
+    for employee_id in employee_ids:
+        self_score = self_scores.get(employee_id) or 0
+        feedback_score = feedback_scores.get(employee_id) or 0
+        manager_score = manager_scores.get(employee_id) or 0
+        potential_score = potential_scores.get(employee_id) or 0
+        total_score = self_score + feedback_score + manager_score + potential_score
+        scores[employee_id] = {
+            'self_assessment_score': round(self_score, 2),
+            'feedback_360_score': round(feedback_score, 2),
+            'manager_review_score': round(manager_score, 2),
+            'potential_score': round(potential_score, 2),
+            'total_score': round(total_score, 2),
+            'salary_recommendation': salary_recommendation_for(total_score),
+        }
+    return scores
+
+
+def recompute_final_review(final_review: FinalReview) -> FinalReview:
+    """Refresh the component scores, total and salary recommendation of a final review."""
+    scores = compute_final_review_scores([final_review.employee_id])[final_review.employee_id]
+    for field, value in scores.items():
+        setattr(final_review, field, value)
+    final_review.save()
+    return final_review
+
+
+def batch_final_reviews(review_period: str, employee_ids: Iterable[int]) -> Dict[str, Any]:
+    """Create or refresh the final reviews of ``review_period`` for all given employees.
+
+    Existing reviews of the period are updated in place (every one of them if
+    an employee has several), employees without one get a new review with an
+    empty plan and summary. Bulk writes skip ``post_save``, so the nine-box
+    metrics of the employees are marked stale explicitly.
+    """
+    from ..signals import mark_nine_box_inputs_changed
+
+    employee_ids = sorted(set(employee_ids))
+    scores = compute_final_review_scores(employee_ids)
+
+    with transaction.atomic():
+        existing = list(
+            FinalReview.objects.select_for_update().filter(review_period=review_period, employee_id__in=employee_ids)
+        )
+        for final_review in existing:
+            for field, value in scores[final_review.employee_id].items():
+                setattr(final_review, field, value)
+        FinalReview.objects.bulk_update(existing, SCORE_FIELDS, batch_size=500)
+
+        reviewed = {final_review.employee_id for final_review in existing}
+        created = FinalReview.objects.bulk_create(
+            [
+                FinalReview(
+                    employee_id=employee_id,
+                    review_period=review_period,
+                    development_plan='',
+                    manager_summary='',
+                    **scores[employee_id],
+                )
+                for employee_id in employee_ids
+                if employee_id not in reviewed
+            ],
+            batch_size=500,
+        )
+        mark_nine_box_inputs_changed(employee_ids)
+        transaction.on_commit(invalidate_final_review_statistics)
+
+    recommendations = {choice: 0 for choice, _ in FinalReview.SALARY_RECOMMENDATION_CHOICES}
+    for employee_id in employee_ids:
+        recommendations[scores[employee_id]['salary_recommendation']] += 1
+    totals = [scores[employee_id]['total_score'] for employee_id in employee_ids]
+    return {
+        'review_period': review_period,
+        'employees': len(employee_ids),
+        'created': len(created),
+        'updated': len(existing),
+        'average_total_score': round(sum(totals) / len(totals), 2) if totals else 0,
+        'salary_recommendations': recommendations,
+    }
+
+
+def invalidate_final_review_statistics() -> None:
+    bump_cache_version(STATISTICS_VERSION_KEY)
+
+
+def _compute_statistics(employees, department_id: Optional[int]) -> Dict[str, Any]:
+    if department_id is not None:
+        employees = (employees if employees is not None else Employee.objects.all()).in_department_subtree(department_id)
+
+    reviews = FinalReview.objects.all()
+    if employees is not None:
+        reviews = reviews.filter(employee_id__in=employees.values('pk'))
+
+    aggregates = reviews.aggregate(
+        total=Count('id'),
+        average=Avg('total_score'),
+        unique_employees=Count('employee', distinct=True),
+        last_created=Max('created_at'),
+        include=Count('id', filter=Q(salary_recommendation='include')),
+        conditional=Count('id', filter=Q(salary_recommendation='conditional')),
+        exclude=Count('id', filter=Q(salary_recommendation='exclude')),
+    )
+
+    period_breakdown = list(
+        reviews
+        .values('review_period')
+        .annotate(total=Count('id'))
+        .order_by('-total', '-review_period')[:5]
+    )
+
+    department_breakdown = list(
+        reviews
+        .values('employee__department_id', 'employee__department__name')
+        .annotate(
+            total=Count('id'),
+            employees=Count('employee', distinct=True),
+        )
+        .order_by('-total')[:5]
+    )
+
+    for item in department_breakdown:
+        item['employee__department__name'] = item['employee__department__name'] or 'Без отдела'
+
+    return {
+        'total_reviews': aggregates['total'] or 0,
+        'average_score': aggregates['average'] or 0,
+        'unique_employees': aggregates['unique_employees'] or 0,
+        'last_submitted_at': aggregates['last_created'],
+        'salary_recommendations': {
+            'include': aggregates['include'],
+            'conditional': aggregates['conditional'],
+            'exclude': aggregates['exclude'],
+        },
+        'top_periods': period_breakdown,
+        'top_departments': department_breakdown,
+    }
+
+
+def final_review_statistics(employees, *, scope: str, department_id: Optional[int] = None) -> Dict[str, Any]:
+    """Dashboard statistics over the final reviews of ``employees`` (``None`` for everyone).
+
+    Results are cached per visibility ``scope`` and department filter. Every
+    change of a final review bumps the version that is part of the key, the
+    TTL bounds staleness from changes of the scope itself (role assignments,
+    transfers between departments).
+    """
+    key = f'final_review_stats:{cache_version(STATISTICS_VERSION_KEY)}:{scope}:{department_id or "all"}'
+    stats = cache.get(key)
+    if stats is None:
+        stats = _compute_statistics(employees, department_id)
+        cache.set(key, stats, STATISTICS_CACHE_TTL)
+    return stats
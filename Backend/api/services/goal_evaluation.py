@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from ..models import Employee, Goal, GoalEvaluationNotification, GoalParticipant
+
+FAN_OUT_BATCH_SIZE = 1000
+
+
+def evaluation_recipients(goal: Goal):
+    """Colleagues from the participants' departments who are not participants themselves."""
+    participants = GoalParticipant.objects.filter(goal_id=goal.pk)
+    return Employee.objects.filter(
+        department_id__in=participants.filter(employee__department__isnull=False).values('employee__department_id'),
+    ).exclude(
+        id__in=participants.values('employee_id'),
+    )
+
+
+def fan_out_goal_evaluation(goal: Goal, *, batch_size: int = FAN_OUT_BATCH_SIZE) -> int:
+    """Create missing evaluation notifications for a completed goal.
+
+    Recipients that already have a notification for the goal are skipped in the
+    same query that selects them; the rest are inserted in batches. Fan-outs of
+    one goal are serialised on the goal row, so the returned number is the
+    number of notifications this call actually created.
+    """
+    with transaction.atomic():
+        list(Goal.objects.select_for_update().filter(pk=goal.pk).values_list('pk', flat=True))
+        recipient_ids = list(
+            evaluation_recipients(goal)
+            .exclude(
+                Exists(GoalEvaluationNotification.objects.filter(goal_id=goal.pk, recipient_id=OuterRef('pk')))
+            )
+            .values_list('id', flat=True)
+        )
+        if not recipient_ids:
+            return 0
+
+        GoalEvaluationNotification.objects.bulk_create(
+            [GoalEvaluationNotification(recipient_id=recipient_id, goal_id=goal.pk) for recipient_id in recipient_ids],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+    return len(recipient_ids)
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import hashlib
+import json
+from collections import Counter
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.db.models import Avg, Count, Max, Q
 from django.utils import timezone
 
@@ -11,60 +19,57 @@ from ..models import (
     Employee,
     Feedback360,
     FinalReview,
-    Goal,
     ManagerReview,
+    NineBoxEmployeeMetrics,
+    NineBoxHistoryPoint,
     NineBoxSnapshot,
     PotentialAssessment,
     SelfAssessment,
-    Task,
 )
 
 
-@dataclass
-class EmployeeNineBoxMetrics:
-    employee: Employee
-    performance_score: float
-    potential_score: float
-    goal_completion_rate: float
-    task_completion_rate: float
-    feedback_score: float
-    manager_score: float
-    self_assessment_score: float
-    final_review_score: float
-    potential_signal: float
-    retention_risk: float
-    source_meta: Dict[str, Any]
-
-    def as_matrix_item(self) -> Dict[str, Any]:
-        data = {
-            'employee_id': self.employee.id,
-            'employee_name': self.employee.user.get_full_name() if self.employee.user_id else '',
-            'department': self.employee.department.name if self.employee.department else '',
-            'department_id': self.employee.department_id,
-            'position': self.employee.position_title or '',
-            'performance_score': round(self.performance_score, 2),
-            'potential_score': round(self.potential_score, 2),
-            'scores': {
-                'goal_completion_rate': round(self.goal_completion_rate, 2),
-                'task_completion_rate': round(self.task_completion_rate, 2),
-                'feedback_average': round(self.feedback_score, 2),
-                'manager_average': round(self.manager_score, 2),
-                'self_assessment_average': round(self.self_assessment_score, 2),
-                'final_review_score': round(self.final_review_score, 2),
-                'potential_signal': round(self.potential_signal, 2),
-                'retention_risk': round(self.retention_risk, 2),
-            },
-            'meta': _serialize_meta(self.source_meta),
-        }
-        data['nine_box_x'] = map_axis_position(data['performance_score'])
-        data['nine_box_y'] = map_axis_position(data['potential_score'])
-        data['ai_recommendations'] = build_ai_recommendations(data)
-        return data
-
-
 AXIS_HIGH_THRESHOLD = 70
 AXIS_MID_THRESHOLD = 40
 
+# Summation order of each axis follows the key order, keep it stable so that
+# scores stay bit-for-bit reproducible between releases.
+DEFAULT_NINE_BOX_WEIGHTS: Dict[str, Dict[str, float]] = {
+    'performance': {
+        'manager': 0.35,
+        'feedback': 0.2,
+        'goals': 0.2,
+        'tasks': 0.1,
+        'final': 0.15,
+    },
+    'potential': {
+        'self': 0.3,
+        'feedback': 0.2,
+        'potential': 0.3,
+        'retention': 0.2,
+    },
+}
+
+
+def nine_box_weights() -> Dict[str, Dict[str, float]]:
+    """Axis weights with the overrides from ``settings.NINE_BOX_WEIGHTS`` applied."""
+    configured = getattr(settings, 'NINE_BOX_WEIGHTS', None) or {}
+    unknown_axes = set(configured) - set(DEFAULT_NINE_BOX_WEIGHTS)
+    if unknown_axes:
+        raise ImproperlyConfigured(f"Unknown NINE_BOX_WEIGHTS axes: {', '.join(sorted(unknown_axes))}")
+
+    weights: Dict[str, Dict[str, float]] = {}
+    for axis, defaults in DEFAULT_NINE_BOX_WEIGHTS.items():
+        overrides = configured.get(axis) or {}
+        unknown = set(overrides) - set(defaults)
+        if unknown:
+            raise ImproperlyConfigured(f"Unknown NINE_BOX_WEIGHTS['{axis}'] inputs: {', '.join(sorted(unknown))}")
+        weights[axis] = {key: float(overrides.get(key, default)) for key, default in defaults.items()}
+    return weights
+
+
+def weights_fingerprint(weights: Dict[str, Dict[str, float]]) -> str:
+    return hashlib.sha1(json.dumps(weights, sort_keys=True).encode()).hexdigest()[:16]
+
 
 def map_axis_position(score: float) -> int:
     if score >= AXIS_HIGH_THRESHOLD:
@@ -101,82 +106,6 @@ def _latest_timestamp(*timestamps: Optional[Any]) -> Optional[Any]:
     return max(values)
 
 
-def build_ai_recommendations(entry: Dict[str, Any]) -> List[ Dict[str, Any] ]:
-    recommendations: List[Dict[str, Any]] = []
-    performance = entry['performance_score']
-    potential = entry['potential_score']
-    scores = entry['scores']
-    retention_risk = scores.get('retention_risk', 50)
-    goal_rate = scores.get('goal_completion_rate', 0)
-    task_rate = scores.get('task_completion_rate', 0)
-    manager_score = scores.get('manager_average', 0)
-
-    if potential >= 70 and performance < 45:
-        recommendations.append({
-            'priority': 'high',
-            'title': 'Развить скрытый потенциал',
-            'description': 'Назначьте сотруднику бадди или наставника для ускорения выхода на новый уровень результативности.',
-            'actions': [
-                'Назначить бадди с опытом в ключевых задачах',
-                'Запланировать еженедельные встречи обратной связи',
-            ],
-        })
-
-    if retention_risk >= 60:
-        recommendations.append({
-            'priority': 'high',
-            'title': 'Удержание ключевого специалиста',
-            'description': 'Проведите индивидуальную встречу для обсуждения мотивации и факторов риска ухода.',
-            'actions': [
-                'Запланировать разговор с HR и руководителем',
-                'Проработать персональный план развития и компенсации',
-            ],
-        })
-
-    if performance >= 80 and potential >= 80:
-        recommendations.append({
-            'priority': 'medium',
-            'title': 'Подготовка к продвижению',
-            'description': 'Сотрудник стабильно превышает ожидания. Подготовьте план ускоренного развития и удержания.',
-            'actions': [
-                'Подобрать программу лидерского развития',
-                'Оценить возможность карьерного продвижения в ближайшие 6-12 месяцев',
-            ],
-        })
-
-    if goal_rate < 50 or task_rate < 50:
-        recommendations.append({
-            'priority': 'medium',
-            'title': 'Фокус на достижении целей',
-            'description': 'Снизить количество параллельных задач, усилить контроль промежуточных результатов и внедрить чекпоинты.',
-            'actions': [
-                'Сформировать 3-недельный план исправления',
-                'Назначить ответственного наставника из команды',
-            ],
-        })
-
-    if manager_score < 45 and performance < 45:
-        recommendations.append({
-            'priority': 'high',
-            'title': 'План повышения эффективности',
-            'description': 'Сформируйте совместный с командой план корректирующих действий и определите метрики контроля.',
-            'actions': [
-                'Назначить еженедельные one-on-one встречи',
-                'Пересмотреть KPI и постановку задач на квартал',
-            ],
-        })
-
-    if not recommendations:
-        recommendations.append({
-            'priority': 'low',
-            'title': 'Поддерживать текущую динамику',
-            'description': 'Сотрудник демонстрирует стабильность. Обеспечьте регулярную обратную связь и актуальные вызовы.',
-            'actions': ['Раз в квартал сверять цели развития', 'Отслеживать вовлеченность и мотивацию'],
-        })
-
-    return recommendations
-
-
 def _serialize_meta(value: Any) -> Any:
     if isinstance(value, datetime):
         return value.isoformat()
@@ -187,46 +116,148 @@ def _serialize_meta(value: Any) -> Any:
     return value
 
 
-def _compute_performance_score(*, manager_avg: float, feedback_avg: float, goal_rate: float, task_rate: float, final_review_score: float) -> float:
-    weights = {
-        'manager': 0.35,
-        'feedback': 0.2,
-        'goals': 0.2,
-        'tasks': 0.1,
-        'final': 0.15,
-    }
-    return (
-        manager_avg * weights['manager'] +
-        feedback_avg * weights['feedback'] +
-        goal_rate * weights['goals'] +
-        task_rate * weights['tasks'] +
-        final_review_score * weights['final']
-    )
+RECOMMENDATION_RULES: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    ('hidden_potential', {
+        'priority': 'high',
+        'title': 'Развить скрытый потенциал',
+        'description': 'Назначьте сотруднику бадди или наставника для ускорения выхода на новый уровень результативности.',
+        'actions': [
+            'Назначить бадди с опытом в ключевых задачах',
+            'Запланировать еженедельные встречи обратной связи',
+        ],
+    }),
+    ('retention', {
+        'priority': 'high',
+        'title': 'Удержание ключевого специалиста',
+        'description': 'Проведите индивидуальную встречу для обсуждения мотивации и факторов риска ухода.',
+        'actions': [
+            'Запланировать разговор с HR и руководителем',
+            'Проработать персональный план развития и компенсации',
+        ],
+    }),
+    ('promotion', {
+        'priority': 'medium',
+        'title': 'Подготовка к продвижению',
+        'description': 'Сотрудник стабильно превышает ожидания. Подготовьте план ускоренного развития и удержания.',
+        'actions': [
+            'Подобрать программу лидерского развития',
+            'Оценить возможность карьерного продвижения в ближайшие 6-12 месяцев',
+        ],
+    }),
+    ('goal_focus', {
+        'priority': 'medium',
+        'title': 'Фокус на достижении целей',
+        'description': 'Снизить количество параллельных задач, усилить контроль промежуточных результатов и внедрить чекпоинты.',
+        'actions': [
+            'Сформировать 3-недельный план исправления',
+            'Назначить ответственного наставника из команды',
+        ],
+    }),
+    ('performance_plan', {
+        'priority': 'high',
+        'title': 'План повышения эффективности',
+        'description': 'Сформируйте совместный с командой план корректирующих действий и определите метрики контроля.',
+        'actions': [
+            'Назначить еженедельные one-on-one встречи',
+            'Пересмотреть KPI и постановку задач на квартал',
+        ],
+    }),
+)
 
+DEFAULT_RECOMMENDATION: Dict[str, Any] = {
+    'priority': 'low',
+    'title': 'Поддерживать текущую динамику',
+    'description': 'Сотрудник демонстрирует стабильность. Обеспечьте регулярную обратную связь и актуальные вызовы.',
+    'actions': ['Раз в квартал сверять цели развития', 'Отслеживать вовлеченность и мотивацию'],
+}
 
-def _compute_potential_score(*, self_avg: float, feedback_avg: float, potential_signal: float, retention_inverse: float) -> float:
-    weights = {
-        'self': 0.3,
-        'feedback': 0.2,
-        'potential': 0.3,
-        'retention': 0.2,
+
+def _copy_recommendation(template: Dict[str, Any]) -> Dict[str, Any]:
+    return {**template, 'actions': list(template['actions'])}
+
+
+def _score_column(raw: np.ndarray, *, base: float = 10.0) -> np.ndarray:
+    """``_normalize_score`` over a column, missing scores being ``nan``."""
+    scaled = np.where(raw <= base, np.clip(raw, 0.0, base) / base * 100, np.clip(raw, 0.0, 100.0))
+    return np.nan_to_num(scaled, nan=0.0)
+
+
+def _ratio_column(completed: np.ndarray, total: np.ndarray) -> np.ndarray:
+    """``_normalize_ratio`` over two columns."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.clip(completed / total * 100.0, 0.0, 100.0)
+    return np.where(total > 0, ratio, 0.0)
+
+
+def _retention_column(risk: np.ndarray) -> np.ndarray:
+    """``_normalize_retention`` over a column, employees never assessed being ``nan``."""
+    return np.where(np.isnan(risk), 50.0, np.clip(risk / 10.0 * 100.0, 0.0, 100.0))
+
+
+def _potential_signal_column(score: np.ndarray, is_successor: np.ndarray) -> np.ndarray:
+    """``_potential_signal`` over a column, employees never assessed being ``nan``."""
+    signal = np.minimum(score * 10.0, 100.0)
+    signal = np.where(is_successor, np.minimum(100.0, signal + 10), signal)
+    return np.nan_to_num(signal, nan=0.0)
+
+
+def _weighted_sum(columns: Dict[str, np.ndarray], weights: Dict[str, float]) -> np.ndarray:
+    """``sum(column * weight)`` over the inputs of one axis, accumulated in weight order."""
+    total: Optional[np.ndarray] = None
+    for key, weight in weights.items():
+        term = columns[key] * weight
+        total = term if total is None else total + term
+    return total
+
+
+def _round_column(column: np.ndarray) -> np.ndarray:
+    # ``np.round`` scales by 100 and can land on the other side of a half;
+    # Python's ``round`` is correctly rounded and is what the API always returned.
+    return np.array([round(value, 2) for value in column.tolist()])
+
+
+def _axis_positions(column: np.ndarray) -> np.ndarray:
+    """``map_axis_position`` over a column."""
+    return np.digitize(column, [AXIS_MID_THRESHOLD, AXIS_HIGH_THRESHOLD])
+
+
+def _recommendation_columns(
+    *,
+    performance: np.ndarray,
+    potential: np.ndarray,
+    retention: np.ndarray,
+    goal_rate: np.ndarray,
+    task_rate: np.ndarray,
+    manager: np.ndarray,
+) -> List[List[Dict[str, Any]]]:
+    """Evaluate every rule as a boolean column, then pick the templates per rule combination."""
+    flags = {
+        'hidden_potential': (potential >= 70) & (performance < 45),
+        'retention': retention >= 60,
+        'promotion': (performance >= 80) & (potential >= 80),
+        'goal_focus': (goal_rate < 50) | (task_rate < 50),
+        'performance_plan': (manager < 45) & (performance < 45),
     }
-    return (
-        self_avg * weights['self'] +
-        feedback_avg * weights['feedback'] +
-        potential_signal * weights['potential'] +
-        retention_inverse * weights['retention']
-    )
+    rule_flags = np.column_stack([flags[name] for name, _ in RECOMMENDATION_RULES])
+    codes = rule_flags @ (1 << np.arange(len(RECOMMENDATION_RULES)))
+    templates = [template for _, template in RECOMMENDATION_RULES]
+    picks = {
+        code: [template for bit, template in enumerate(templates) if code >> bit & 1] or [DEFAULT_RECOMMENDATION]
+        for code in np.unique(codes).tolist()
+    }
+    return [[_copy_recommendation(template) for template in picks[code]] for code in codes.tolist()]
 
 
-def collect_employee_metrics(employees: Iterable[Employee]) -> List[EmployeeNineBoxMetrics]:
-    employees = list(employees)
-    if not employees:
-        return []
+def _load_inputs(employee_ids: List[int]) -> Dict[str, Dict[int, Any]]:
+    """Grouped score inputs of the employees, keyed by input name and employee id.
 
-    employee_ids = [emp.id for emp in employees]
+    Goal/task completion and the latest potential assessment come from the
+    counters kept on ``NineBoxEmployeeMetrics``; employees without a row have
+    never taken part in a goal nor been assessed.
+    """
+    inputs: Dict[str, Dict[int, Any]] = {}
 
-    feedback_data = {
+    inputs['feedback'] = {
         row['employee']: row
         for row in Feedback360.objects.filter(employee_id__in=employee_ids).values('employee').annotate(
             avg_score=Avg('calculated_score'),
@@ -235,7 +266,7 @@ def collect_employee_metrics(employees: Iterable[Employee]) -> List[EmployeeNine
         )
     }
 
-    self_data = {
+    inputs['self'] = {
         row['employee']: row
         for row in SelfAssessment.objects.filter(employee_id__in=employee_ids).values('employee').annotate(
             avg_score=Avg('calculated_score'),
@@ -243,7 +274,7 @@ def collect_employee_metrics(employees: Iterable[Employee]) -> List[EmployeeNine
         )
     }
 
-    manager_data = {
+    inputs['manager'] = {
         row['employee']: row
         for row in ManagerReview.objects.filter(employee_id__in=employee_ids).values('employee').annotate(
             avg_score=Avg('calculated_score'),
@@ -251,7 +282,7 @@ def collect_employee_metrics(employees: Iterable[Employee]) -> List[EmployeeNine
         )
     }
 
-    final_review_data = {
+    inputs['final'] = {
         row['employee']: row
         for row in FinalReview.objects.filter(employee_id__in=employee_ids).values('employee').annotate(
             last_total=Max('total_score'),
@@ -259,148 +290,179 @@ def collect_employee_metrics(employees: Iterable[Employee]) -> List[EmployeeNine
         )
     }
 
-    potential_assessments = (
-        PotentialAssessment.objects.filter(employee_id__in=employee_ids)
-        .order_by('employee_id', '-created_at')
+    progress = NineBoxEmployeeMetrics.objects.filter(employee_id__in=employee_ids).select_related('latest_potential')
+    inputs['goals'] = {}
+    inputs['tasks'] = {}
+    inputs['potential'] = {}
+    for row in progress:
+        inputs['goals'][row.employee_id] = {'total': row.goals_total, 'completed': row.goals_completed}
+        inputs['tasks'][row.employee_id] = {'total': row.tasks_total, 'completed': row.tasks_completed}
+        if row.latest_potential is not None:
+            inputs['potential'][row.employee_id] = row.latest_potential
+    return inputs
+
+
+def compute_matrix_items(
+    employees: Iterable[Employee],
+    *,
+    weights: Optional[Dict[str, Dict[str, float]]] = None,
+) -> List[Dict[str, Any]]:
+    """Matrix items of ``employees`` in their order.
+
+    The grouped inputs are laid out as one numpy column per metric (missing
+    values as ``nan``) and normalisation, the weighted axis scores, box
+    positions and recommendation triggers are array operations over those
+    columns. Only building the item dicts and the source meta walks the rows.
+    """
+    employees = list(employees)
+    if not employees:
+        return []
+
+    weights = weights or nine_box_weights()
+    ids = [emp.id for emp in employees]
+    inputs = _load_inputs(ids)
+
+    feedback_rows = [inputs['feedback'].get(pk, {}) for pk in ids]
+    self_rows = [inputs['self'].get(pk, {}) for pk in ids]
+    manager_rows = [inputs['manager'].get(pk, {}) for pk in ids]
+    final_rows = [inputs['final'].get(pk, {}) for pk in ids]
+    goal_rows = [inputs['goals'].get(pk, {}) for pk in ids]
+    task_rows = [inputs['tasks'].get(pk, {}) for pk in ids]
+    potentials = [inputs['potential'].get(pk) for pk in ids]
+
+    def column(values) -> np.ndarray:
+        return np.array(list(values), dtype=float)
+
+    feedback = _score_column(column(row.get('avg_score') for row in feedback_rows))
+    self_scores = _score_column(column(row.get('avg_score') for row in self_rows))
+    manager = _score_column(column(row.get('avg_score') for row in manager_rows))
+    final = _score_column(column(row.get('last_total') for row in final_rows), base=100.0)
+    goal_rate = _ratio_column(
+        column(row.get('completed', 0) for row in goal_rows), column(row.get('total', 0) for row in goal_rows),
     )
-    potential_map: Dict[int, PotentialAssessment] = {}
-    for assessment in potential_assessments:
-        if assessment.employee_id not in potential_map:
-            potential_map[assessment.employee_id] = assessment
-
-    goals = Goal.objects.filter(goal_participants__employee_id__in=employee_ids).values('goal_participants__employee_id').annotate(
-        total=Count('id', distinct=True),
-        completed=Count('id', filter=Q(is_completed=True), distinct=True),
+    task_rate = _ratio_column(
+        column(row.get('completed', 0) for row in task_rows), column(row.get('total', 0) for row in task_rows),
     )
-    goal_map = {row['goal_participants__employee_id']: row for row in goals}
-
-    tasks = Task.objects.filter(goal__goal_participants__employee_id__in=employee_ids).values('goal__goal_participants__employee_id').annotate(
-        total=Count('id', distinct=True),
-        completed=Count('id', filter=Q(is_completed=True), distinct=True),
+    potential_signal = _potential_signal_column(
+        column((assessment.potential_score or 0) if assessment else None for assessment in potentials),
+        np.array([bool(assessment and assessment.is_successor) for assessment in potentials]),
+    )
+    retention = _retention_column(
+        column((assessment.retention_risk or 0) if assessment else None for assessment in potentials),
     )
-    task_map = {row['goal__goal_participants__employee_id']: row for row in tasks}
-
-    metrics: List[EmployeeNineBoxMetrics] = []
-    for employee in employees:
-        feedback_row = feedback_data.get(employee.id, {})
-        self_row = self_data.get(employee.id, {})
-        manager_row = manager_data.get(employee.id, {})
-        final_row = final_review_data.get(employee.id, {})
-        goal_row = goal_map.get(employee.id, {})
-        task_row = task_map.get(employee.id, {})
-        potential = potential_map.get(employee.id)
-
-        feedback_avg = _normalize_score(feedback_row.get('avg_score'))
-        self_avg = _normalize_score(self_row.get('avg_score'))
-        manager_avg = _normalize_score(manager_row.get('avg_score'))
-        final_score = _normalize_score(final_row.get('last_total'), base=100.0)
-
-        goal_rate = _normalize_ratio(goal_row.get('completed', 0), goal_row.get('total', 0))
-        task_rate = _normalize_ratio(task_row.get('completed', 0), task_row.get('total', 0))
-
-        potential_signal = 0.0
-        retention_risk = None
-        potential_meta: Dict[str, Any] = {}
-        if potential:
-            potential_signal = min(float(potential.potential_score or 0) * 10.0, 100.0)
-            retention_risk = potential.retention_risk
-            potential_meta = {
-                'assessment_id': potential.id,
-                'development_desire': potential.development_desire,
-                'is_successor': potential.is_successor,
-                'successor_readiness': potential.successor_readiness,
-                'created_at': potential.created_at,
-            }
-            if potential.is_successor:
-                potential_signal = min(100.0, potential_signal + 10)
-
-        retention_pct = _normalize_retention(retention_risk)
-        retention_inverse = 100.0 - retention_pct
-
-        performance_score = _compute_performance_score(
-            manager_avg=manager_avg,
-            feedback_avg=feedback_avg,
-            goal_rate=goal_rate,
-            task_rate=task_rate,
-            final_review_score=final_score,
-        )
-        potential_score = _compute_potential_score(
-            self_avg=self_avg,
-            feedback_avg=feedback_avg,
-            potential_signal=potential_signal,
-            retention_inverse=retention_inverse,
-        )
 
-        meta = {
-            'feedback_last_at': feedback_row.get('last_score'),
-            'self_last_at': self_row.get('last_score'),
-            'manager_last_at': manager_row.get('last_score'),
-            'final_last_at': final_row.get('last_date'),
-            'potential': potential_meta,
-            'last_updated_at': _latest_timestamp(
-                feedback_row.get('last_score'),
-                self_row.get('last_score'),
-                manager_row.get('last_score'),
-                final_row.get('last_date'),
-                potential_meta.get('created_at'),
-            ),
+    performance = _round_column(_weighted_sum(
+        {'manager': manager, 'feedback': feedback, 'goals': goal_rate, 'tasks': task_rate, 'final': final},
+        weights['performance'],
+    ))
+    potential = _round_column(_weighted_sum(
+        {'self': self_scores, 'feedback': feedback, 'potential': potential_signal, 'retention': 100.0 - retention},
+        weights['potential'],
+    ))
+    scores = {
+        'goal_completion_rate': _round_column(goal_rate),
+        'task_completion_rate': _round_column(task_rate),
+        'feedback_average': _round_column(feedback),
+        'manager_average': _round_column(manager),
+        'self_assessment_average': _round_column(self_scores),
+        'final_review_score': _round_column(final),
+        'potential_signal': _round_column(potential_signal),
+        'retention_risk': _round_column(retention),
+    }
+    box_x = _axis_positions(performance).tolist()
+    box_y = _axis_positions(potential).tolist()
+    recommendations = _recommendation_columns(
+        performance=performance,
+        potential=potential,
+        retention=scores['retention_risk'],
+        goal_rate=scores['goal_completion_rate'],
+        task_rate=scores['task_completion_rate'],
+        manager=scores['manager_average'],
+    )
+    score_rows = [dict(zip(scores, values)) for values in zip(*(values.tolist() for values in scores.values()))]
+    performance = performance.tolist()
+    potential = potential.tolist()
+
+    items: List[Dict[str, Any]] = []
+    for index, employee in enumerate(employees):
+        items.append({
+            'employee_id': employee.id,
+            **_employee_fields(employee),
+            'performance_score': performance[index],
+            'potential_score': potential[index],
+            'scores': score_rows[index],
+            'meta': _serialize_meta(_source_meta(
+                feedback_rows[index],
+                self_rows[index],
+                manager_rows[index],
+                final_rows[index],
+                potentials[index],
+            )),
+            'nine_box_x': box_x[index],
+            'nine_box_y': box_y[index],
+            'ai_recommendations': recommendations[index],
+        })
+    return items
+
+
+def _source_meta(feedback_row, self_row, manager_row, final_row, potential: Optional[PotentialAssessment]) -> Dict[str, Any]:
+    potential_meta: Dict[str, Any] = {}
+    if potential:
+        potential_meta = {
+            'assessment_id': potential.id,
+            'development_desire': potential.development_desire,
+            'is_successor': potential.is_successor,
+            'successor_readiness': potential.successor_readiness,
+            'created_at': potential.created_at,
         }
+    return {
+        'feedback_last_at': feedback_row.get('last_score'),
+        'self_last_at': self_row.get('last_score'),
+        'manager_last_at': manager_row.get('last_score'),
+        'final_last_at': final_row.get('last_date'),
+        'potential': potential_meta,
+        'last_updated_at': _latest_timestamp(
+            feedback_row.get('last_score'),
+            self_row.get('last_score'),
+            manager_row.get('last_score'),
+            final_row.get('last_date'),
+            potential_meta.get('created_at'),
+        ),
+    }
 
-        metrics.append(
-            EmployeeNineBoxMetrics(
-                employee=employee,
-                performance_score=performance_score,
-                potential_score=potential_score,
-                goal_completion_rate=goal_rate,
-                task_completion_rate=task_rate,
-                feedback_score=feedback_avg,
-                manager_score=manager_avg,
-                self_assessment_score=self_avg,
-                final_review_score=final_score,
-                potential_signal=potential_signal,
-                retention_risk=retention_pct,
-                source_meta=meta,
-            )
-        )
 
-    return metrics
-
-
-def build_matrix_payload(employees: Iterable[Employee]) -> Dict[str, Any]:
-    metrics = collect_employee_metrics(employees)
-    matrix = [item.as_matrix_item() for item in metrics]
-    distribution: Dict[str, int] = {
-        'low-low': 0,
-        'mid-low': 0,
-        'high-low': 0,
-        'low-mid': 0,
-        'mid-mid': 0,
-        'high-mid': 0,
-        'low-high': 0,
-        'mid-high': 0,
-        'high-high': 0,
+DISTRIBUTION_CODES = {
+    (0, 0): 'low-low',
+    (1, 0): 'mid-low',
+    (2, 0): 'high-low',
+    (0, 1): 'low-mid',
+    (1, 1): 'mid-mid',
+    (2, 1): 'high-mid',
+    (0, 2): 'low-high',
+    (1, 2): 'mid-high',
+    (2, 2): 'high-high',
+}
+
+def _employee_fields(employee: Employee) -> Dict[str, Any]:
+    return {
+        'employee_name': employee.user.get_full_name() if employee.user_id else '',
+        'department': employee.department.name if employee.department else '',
+        'department_id': employee.department_id,
+        'position': employee.position_title or '',
     }
 
+
+def summarize_matrix(matrix: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Stats and the top recommendations of an already built matrix."""
+    distribution: Dict[str, int] = {code: 0 for code in DISTRIBUTION_CODES.values()}
+
     total_perf = 0.0
     total_potential = 0.0
 
     for entry in matrix:
         total_perf += entry['performance_score']
         total_potential += entry['potential_score']
-        x = entry['nine_box_x']
-        y = entry['nine_box_y']
-        code_map = {
-            (0, 0): 'low-low',
-            (1, 0): 'mid-low',
-            (2, 0): 'high-low',
-            (0, 1): 'low-mid',
-            (1, 1): 'mid-mid',
-            (2, 1): 'high-mid',
-            (0, 2): 'low-high',
-            (1, 2): 'mid-high',
-            (2, 2): 'high-high',
-        }
-        code = code_map.get((x, y))
+        code = DISTRIBUTION_CODES.get((entry['nine_box_x'], entry['nine_box_y']))
         if code:
             distribution[code] += 1
 
@@ -441,6 +503,98 @@ def build_matrix_payload(employees: Iterable[Employee]) -> Dict[str, Any]:
     }
 
 
+def refresh_employee_metrics(employees: Iterable[Employee]) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """Matrix items for ``employees`` backed by ``NineBoxEmployeeMetrics``.
+
+    Only employees without a row, with inputs changed since the row was
+    computed or with a row computed under other weights go through
+    ``compute_matrix_items``; everyone else is served from the stored item. Name, department and position are always taken from
+    the current employee, they are not score inputs. Returns the items in the
+    order of ``employees`` and the ids that were recomputed.
+    """
+    employees = list(employees)
+    if not employees:
+        return [], []
+
+    started_at = timezone.now()
+    weights = nine_box_weights()
+    weights_key = weights_fingerprint(weights)
+    rows = {
+        row.employee_id: row
+        for row in NineBoxEmployeeMetrics.objects.filter(employee_id__in=[emp.id for emp in employees])
+    }
+    current = {
+        employee_id: row.item
+        for employee_id, row in rows.items()
+        if not row.is_stale and row.weights_key == weights_key
+    }
+    stale = [emp for emp in employees if emp.id not in current]
+
+    items: Dict[int, Dict[str, Any]] = current
+    if stale:
+        fresh = {item['employee_id']: item for item in compute_matrix_items(stale, weights=weights)}
+        # ``computed_at`` is taken before the inputs are read: a change committed
+        # while we were computing stays newer than it and keeps the row stale.
+        NineBoxEmployeeMetrics.objects.bulk_create(
+            [
+                NineBoxEmployeeMetrics(
+                    employee_id=employee_id,
+                    item=item,
+                    weights_key=weights_key,
+                    computed_at=started_at,
+                    last_input_change=started_at,
+                )
+                for employee_id, item in fresh.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['employee'],
+            update_fields=['item', 'weights_key', 'computed_at'],
+        )
+        items.update(fresh)
+
+    matrix = []
+    for employee in employees:
+        entry = dict(items[employee.id])
+        entry.update(_employee_fields(employee))
+        matrix.append(entry)
+    return matrix, [emp.id for emp in stale]
+
+
+def build_matrix_payload(employees: Iterable[Employee], *, incremental: bool = False) -> Dict[str, Any]:
+    if incremental:
+        matrix, _ = refresh_employee_metrics(employees)
+    else:
+        matrix = compute_matrix_items(employees)
+    return summarize_matrix(matrix)
+
+
+ORGANIZATION_SCOPE = 'global'
+
+
+def resolve_matrix_scope(user) -> Tuple[Optional[Employee], Optional[Any], str]:
+    """Return the requester's profile, the employees they may see in the matrix and their visibility scope.
+
+    The employee queryset is ``None`` when the user has no access to the matrix and
+    empty when a regular user has no employee profile. The scope is ``global`` for
+    users who see everyone and ``managed:<employee_id>`` for leaders; it labels the
+    projection of the organisation snapshot, snapshots themselves are only stored
+    for the whole organisation.
+    """
+    employee = Employee.objects.filter(user=user).select_related('department').first()
+
+    base_queryset = Employee.objects.select_related('user', 'department')
+    if user.is_superuser:
+        return employee, base_queryset.all(), ORGANIZATION_SCOPE
+    if not employee:
+        return employee, base_queryset.none(), ORGANIZATION_SCOPE
+    if employee.has_global_visibility():
+        return employee, base_queryset.all(), ORGANIZATION_SCOPE
+    if employee.has_leadership_scope:
+        employees = base_queryset.filter(Q(id__in=employee.managed_employees().values('pk')) | Q(id=employee.id))
+        return employee, employees, f'managed:{employee.id}'
+    return employee, None, ORGANIZATION_SCOPE
+
+
 def get_active_snapshot(*, scope: str, freshness_minutes: int) -> Optional[NineBoxSnapshot]:
     now = timezone.now()
     snapshot = (
@@ -464,19 +618,399 @@ def generate_snapshot(
     ttl_minutes: int,
     source: NineBoxSnapshot.Source = NineBoxSnapshot.Source.ON_DEMAND,
     generated_by: Optional[Employee] = None,
+    incremental: bool = False,
 ) -> Tuple[NineBoxSnapshot, Dict[str, Any]]:
-    dataset = build_matrix_payload(employees)
+    """Build the scope's matrix and store it as a snapshot.
+
+    With ``incremental`` only stale employees are recomputed. An on-demand
+    refresh then patches the scope's latest on-demand snapshot in place;
+    scheduled snapshots are never rewritten, they are the trend history that
+    ``prune_snapshots`` thins out.
+    """
+    if incremental and source == NineBoxSnapshot.Source.ON_DEMAND:
+        previous = NineBoxSnapshot.objects.filter(scope=scope).order_by('-generated_at').first()
+        if previous is not None and previous.source == NineBoxSnapshot.Source.ON_DEMAND:
+            return patch_snapshot(
+                previous,
+                employees=employees,
+                ttl_minutes=ttl_minutes,
+                source=source,
+                generated_by=generated_by,
+            )
+
+    dataset = build_matrix_payload(employees, incremental=incremental)
     now = timezone.now()
-    snapshot = NineBoxSnapshot.objects.create(
+    snapshot = NineBoxSnapshot(
         scope=scope,
         source=source,
         generated_by=generated_by,
         valid_until=now + timedelta(minutes=ttl_minutes),
-        payload={'matrix': dataset['matrix']},
         stats=dataset['stats'],
         ai_recommendations=dataset['ai_recommendations'],
     )
+    snapshot.set_matrix(dataset['matrix'])
+    snapshot.save()
+    if scope == ORGANIZATION_SCOPE:
+        record_history(dataset['matrix'])
+    return snapshot, _with_snapshot_meta(dataset, snapshot)
+
+
+def patch_snapshot(
+    snapshot: NineBoxSnapshot,
+    *,
+    employees: Iterable[Employee],
+    ttl_minutes: int,
+    source: NineBoxSnapshot.Source = NineBoxSnapshot.Source.ON_DEMAND,
+    generated_by: Optional[Employee] = None,
+) -> Tuple[NineBoxSnapshot, Dict[str, Any]]:
+    """Bring an existing snapshot up to date by recomputing only stale employees.
+
+    Entries of unchanged employees are reused from the stored items, so the
+    aggregate queries only cover employees whose inputs changed; stats,
+    distribution and recommendations are then recomputed from the patched matrix.
+    """
+    matrix, _ = refresh_employee_metrics(employees)
+    dataset = summarize_matrix(matrix)
+    now = timezone.now()
+    snapshot.generated_at = now
+    snapshot.valid_until = now + timedelta(minutes=ttl_minutes)
+    snapshot.source = source
+    snapshot.generated_by = generated_by
+    snapshot.set_matrix(dataset['matrix'])
+    snapshot.stats = dataset['stats']
+    snapshot.ai_recommendations = dataset['ai_recommendations']
+    # ``generated_at`` is ``auto_now_add``; ``update()`` is the only way to move it forward.
+    NineBoxSnapshot.objects.filter(pk=snapshot.pk).update(
+        generated_at=snapshot.generated_at,
+        valid_until=snapshot.valid_until,
+        source=snapshot.source,
+        generated_by=snapshot.generated_by,
+        payload=snapshot.payload,
+        matrix_blob=snapshot.matrix_blob,
+        stats=snapshot.stats,
+        ai_recommendations=snapshot.ai_recommendations,
+    )
+    if snapshot.scope == ORGANIZATION_SCOPE:
+        record_history(dataset['matrix'])
+    return snapshot, _with_snapshot_meta(dataset, snapshot)
+
+
+def _with_snapshot_meta(dataset: Dict[str, Any], snapshot: NineBoxSnapshot) -> Dict[str, Any]:
     dataset['generated_at'] = snapshot.generated_at
     dataset['valid_until'] = snapshot.valid_until
+    source = snapshot.source
     dataset['source'] = source.value if hasattr(source, 'value') else str(source)
-    return snapshot, dataset
+    return dataset
+
+
+def organization_snapshot(
+    *,
+    freshness_minutes: int = 30,
+    ttl_minutes: int = 60,
+    source: NineBoxSnapshot.Source = NineBoxSnapshot.Source.ON_DEMAND,
+    generated_by: Optional[Employee] = None,
+    force: bool = False,
+) -> NineBoxSnapshot:
+    """The shared snapshot of every employee, refreshed incrementally once it is older than ``freshness_minutes``."""
+    snapshot = None if force else get_active_snapshot(scope=ORGANIZATION_SCOPE, freshness_minutes=freshness_minutes)
+    if snapshot is None:
+        snapshot, _ = generate_snapshot(
+            employees=Employee.objects.select_related('user', 'department').order_by('pk'),
+            scope=ORGANIZATION_SCOPE,
+            ttl_minutes=ttl_minutes,
+            source=source,
+            generated_by=generated_by,
+            incremental=True,
+        )
+    return snapshot
+
+
+def project_snapshot(snapshot: NineBoxSnapshot, employee_ids: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+    """The part of a snapshot visible to a caller, with stats recomputed on that subset.
+
+    ``employee_ids=None`` means the caller sees the whole snapshot, which is
+    returned as stored.
+    """
+    matrix = snapshot.matrix
+    if employee_ids is None:
+        dataset = {
+            'matrix': matrix,
+            'stats': snapshot.stats,
+            'ai_recommendations': snapshot.ai_recommendations,
+        }
+    else:
+        visible = set(employee_ids)
+        dataset = summarize_matrix([entry for entry in matrix if entry['employee_id'] in visible])
+    return _with_snapshot_meta(dataset, snapshot)
+
+
+def matrix_for_scope(
+    employees,
+    scope: str,
+    *,
+    generated_by: Optional[Employee] = None,
+    force: bool = False,
+) -> Tuple[NineBoxSnapshot, Dict[str, Any]]:
+    """Serve a caller's matrix from the shared organisation snapshot."""
+    snapshot = organization_snapshot(generated_by=generated_by, force=force)
+    employee_ids = None if scope == ORGANIZATION_SCOPE else employees.values_list('pk', flat=True)
+    return snapshot, project_snapshot(snapshot, employee_ids)
+
+
+def generate_scheduled_snapshot(*, ttl_minutes: int = 60) -> NineBoxSnapshot:
+    """Refresh the organisation-wide (``global``) snapshot outside of a request."""
+    return organization_snapshot(
+        ttl_minutes=ttl_minutes,
+        source=NineBoxSnapshot.Source.SCHEDULED,
+        force=True,
+    )
+
+
+MATRIX_ORDERINGS = ('employee_id', 'employee_name', 'performance_score', 'potential_score')
+MATRIX_PAGE_SIZE = 50
+MATRIX_MAX_PAGE_SIZE = 500
+
+
+@dataclass
+class MatrixQuery:
+    """Filters, ordering and keyset position for a page of matrix entries."""
+
+    x: Optional[int] = None
+    y: Optional[int] = None
+    department_ids: Optional[set] = None
+    performance_min: Optional[float] = None
+    performance_max: Optional[float] = None
+    potential_min: Optional[float] = None
+    potential_max: Optional[float] = None
+    ordering: str = 'employee_id'
+    cursor: Optional[str] = None
+    limit: int = MATRIX_PAGE_SIZE
+
+    @property
+    def sort_field(self) -> str:
+        return self.ordering.lstrip('-')
+
+    @property
+    def descending(self) -> bool:
+        return self.ordering.startswith('-')
+
+    def matches(self, entry: Dict[str, Any]) -> bool:
+        if self.x is not None and entry['nine_box_x'] != self.x:
+            return False
+        if self.y is not None and entry['nine_box_y'] != self.y:
+            return False
+        if self.department_ids is not None and entry.get('department_id') not in self.department_ids:
+            return False
+        for field, low, high in (
+            ('performance_score', self.performance_min, self.performance_max),
+            ('potential_score', self.potential_min, self.potential_max),
+        ):
+            if low is not None and entry[field] < low:
+                return False
+            if high is not None and entry[field] > high:
+                return False
+        return True
+
+    def sort_key(self, entry: Dict[str, Any]) -> Tuple[Any, int]:
+        value = entry.get(self.sort_field)
+        if self.sort_field == 'employee_name':
+            value = (value or '').lower()
+        return value, entry['employee_id']
+
+
+def encode_matrix_cursor(key: Tuple[Any, int]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key), ensure_ascii=False).encode('utf-8')).decode('ascii')
+
+
+def decode_matrix_cursor(cursor: str, sort_field: str = 'employee_id') -> Tuple[Any, int]:
+    """Raises ``ValueError`` for anything that is not a cursor issued by ``query_matrix`` for ``sort_field``."""
+    try:
+        value, employee_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (TypeError, ValueError, UnicodeError, binascii.Error) as exc:
+        raise ValueError('invalid cursor') from exc
+    if not isinstance(employee_id, int) or isinstance(employee_id, bool):
+        raise ValueError('invalid cursor')
+    expected = str if sort_field == 'employee_name' else (int, float)
+    if not isinstance(value, expected) or isinstance(value, bool):
+        raise ValueError('cursor does not match the ordering')
+    return value, employee_id
+
+
+def query_matrix(matrix: List[Dict[str, Any]], query: MatrixQuery) -> Dict[str, Any]:
+    """A keyset-paginated page of the matrix entries that match ``query``.
+
+    Entries are ordered by the sort field with ``employee_id`` as tie-breaker,
+    so the cursor (the key of the last returned entry) stays valid while the
+    snapshot is refreshed between pages.
+    """
+    matching = sorted(
+        (entry for entry in matrix if query.matches(entry)),
+        key=query.sort_key,
+        reverse=query.descending,
+    )
+    count = len(matching)
+    if query.cursor:
+        after = decode_matrix_cursor(query.cursor, query.sort_field)
+        if query.descending:
+            matching = [entry for entry in matching if query.sort_key(entry) < after]
+        else:
+            matching = [entry for entry in matching if query.sort_key(entry) > after]
+
+    page = matching[:query.limit]
+    has_more = len(matching) > query.limit
+    return {
+        'matrix': page,
+        'count': count,
+        'next_cursor': encode_matrix_cursor(query.sort_key(page[-1])) if has_more and page else None,
+    }
+
+
+SNAPSHOT_KEEP_LATEST = 12
+SNAPSHOT_DAILY_DAYS = 35
+SNAPSHOT_WEEKLY_WEEKS = 52
+
+
+def prune_snapshots(
+    *,
+    keep_latest: int = SNAPSHOT_KEEP_LATEST,
+    daily_days: int = SNAPSHOT_DAILY_DAYS,
+    weekly_weeks: int = SNAPSHOT_WEEKLY_WEEKS,
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """Apply the retention policy to every scope.
+
+    Per scope the ``keep_latest`` newest snapshots survive, plus the last
+    snapshot of each day for ``daily_days`` days and of each ISO week for
+    ``weekly_weeks`` weeks; those are tagged as daily/weekly rollups. Everything
+    else is deleted. Only ids and timestamps are read, never the matrices.
+    """
+    now = now or timezone.now()
+    daily_since = now - timedelta(days=daily_days)
+    weekly_since = now - timedelta(weeks=weekly_weeks)
+    summary = {'scopes': 0, 'daily': 0, 'weekly': 0, 'deleted': 0}
+
+    scopes = NineBoxSnapshot.objects.order_by().values_list('scope', flat=True).distinct()
+    for scope in list(scopes):
+        rows = NineBoxSnapshot.objects.filter(scope=scope).order_by('-generated_at').values_list('pk', 'generated_at')
+        latest: List[Any] = []
+        daily: Dict[Any, Any] = {}
+        weekly: Dict[Any, Any] = {}
+        # Newest first: the first row seen for a day or week is its last snapshot.
+        for pk, generated_at in rows:
+            if len(latest) < keep_latest:
+                latest.append(pk)
+            day = timezone.localdate(generated_at)
+            if generated_at >= weekly_since:
+                weekly.setdefault(day.isocalendar()[:2], pk)
+            if generated_at >= daily_since:
+                daily.setdefault(day, pk)
+
+        weekly_ids = set(weekly.values())
+        daily_ids = set(daily.values()) - weekly_ids
+        scoped = NineBoxSnapshot.objects.filter(scope=scope)
+        scoped.filter(pk__in=weekly_ids).exclude(rollup=NineBoxSnapshot.Rollup.WEEKLY).update(
+            rollup=NineBoxSnapshot.Rollup.WEEKLY
+        )
+        scoped.filter(pk__in=daily_ids).exclude(rollup=NineBoxSnapshot.Rollup.DAILY).update(
+            rollup=NineBoxSnapshot.Rollup.DAILY
+        )
+        scoped.filter(pk__in=latest).exclude(pk__in=weekly_ids | daily_ids).exclude(
+            rollup=NineBoxSnapshot.Rollup.NONE
+        ).update(rollup=NineBoxSnapshot.Rollup.NONE)
+        deleted, _ = scoped.exclude(pk__in=set(latest) | weekly_ids | daily_ids).delete()
+
+        summary['scopes'] += 1
+        summary['daily'] += len(daily_ids)
+        summary['weekly'] += len(weekly_ids)
+        summary['deleted'] += deleted
+    return summary
+
+
+NINE_BOX_HISTORY_DEFAULT_DAYS = 90
+
+
+def record_history(matrix: List[Dict[str, Any]], *, day: Optional[date] = None) -> int:
+    """Write the day's history point of every employee whose scores moved since the day's last write."""
+    day = day or timezone.localdate()
+    written = {
+        employee_id: (performance, potential)
+        for employee_id, performance, potential in NineBoxHistoryPoint.objects.filter(date=day).values_list(
+            'employee_id', 'performance_score', 'potential_score'
+        )
+    }
+    points = [
+        NineBoxHistoryPoint(
+            employee_id=entry['employee_id'],
+            date=day,
+            performance_score=entry['performance_score'],
+            potential_score=entry['potential_score'],
+            nine_box_x=entry['nine_box_x'],
+            nine_box_y=entry['nine_box_y'],
+        )
+        for entry in matrix
+        if written.get(entry['employee_id']) != (entry['performance_score'], entry['potential_score'])
+    ]
+    NineBoxHistoryPoint.objects.bulk_create(
+        points,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['employee', 'date'],
+        update_fields=['performance_score', 'potential_score', 'nine_box_x', 'nine_box_y'],
+    )
+    return len(points)
+
+
+def nine_box_history(employees, *, scope: str, date_from: date, date_to: date) -> Dict[str, Any]:
+    """Trajectories of the visible employees and the box transitions between their consecutive points."""
+    points = NineBoxHistoryPoint.objects.filter(date__gte=date_from, date__lte=date_to)
+    if scope != ORGANIZATION_SCOPE:
+        points = points.filter(employee_id__in=employees.values('pk'))
+    rows = points.order_by('employee_id', 'date').values_list(
+        'employee_id', 'date', 'performance_score', 'potential_score', 'nine_box_x', 'nine_box_y'
+    )
+
+    series: Dict[int, List[Dict[str, Any]]] = {}
+    transitions: Counter = Counter()
+    moved = set()
+    for employee_id, day, performance, potential, x, y in rows:
+        trajectory = series.setdefault(employee_id, [])
+        if trajectory and (trajectory[-1]['nine_box_x'], trajectory[-1]['nine_box_y']) != (x, y):
+            previous = trajectory[-1]
+            transitions[(
+                DISTRIBUTION_CODES[(previous['nine_box_x'], previous['nine_box_y'])],
+                DISTRIBUTION_CODES[(x, y)],
+            )] += 1
+            moved.add(employee_id)
+        trajectory.append({
+            'date': day,
+            'performance_score': performance,
+            'potential_score': potential,
+            'nine_box_x': x,
+            'nine_box_y': y,
+        })
+
+    profiles = {
+        employee.id: employee
+        for employee in Employee.objects.filter(pk__in=list(series)).select_related('user', 'department')
+    }
+    trajectories = []
+    for employee_id, trajectory in series.items():
+        employee = profiles.get(employee_id)
+        trajectories.append({
+            'employee_id': employee_id,
+            **(_employee_fields(employee) if employee else {}),
+            'points': trajectory,
+            'moved': employee_id in moved,
+        })
+
+    return {
+        'scope': scope,
+        'date_from': date_from,
+        'date_to': date_to,
+        'trajectories': trajectories,
+        'transitions': [
+            {'from': source, 'to': target, 'count': count}
+            for (source, target), count in transitions.most_common()
+        ],
+        'moved_employees': len(moved),
+    }
@@ -0,0 +1,97 @@
+"""Keep ``NineBoxEmployeeMetrics`` in step with the score inputs.
+
+Every write bumps ``last_input_change`` of the affected employees; goal, task
+and membership changes also recount their completion counters, potential
+assessments re-point ``latest_potential``. Receivers are used instead of
+``save()`` overrides so that queryset deletes and cascades (e.g. deleting a
+goal with its participants and tasks) are covered too. The updates run after
+commit: a snapshot refresh that started before the commit then sees a change
+newer than its own ``computed_at`` and recomputes the row.
+
+Final review writes also invalidate the cached dashboard statistics, question
+template writes the compiled assessment question banks.
+"""
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import (
+    AssessmentQuestionTemplate,
+    Feedback360,
+    FinalReview,
+    Goal,
+    GoalParticipant,
+    ManagerReview,
+    NineBoxEmployeeMetrics,
+    PotentialAssessment,
+    SelfAssessment,
+    Task,
+)
+from .services.assessment_scoring import invalidate_question_banks
+from .services.final_review import invalidate_final_review_statistics
+
+EMPLOYEE_INPUT_MODELS = (
+    Feedback360,
+    SelfAssessment,
+    ManagerReview,
+    FinalReview,
+)
+
+
+def _on_commit(update: Callable[[Iterable[int]], None], employee_ids: Iterable[int]) -> None:
+    employee_ids = [pk for pk in employee_ids if pk]
+    if employee_ids:
+        transaction.on_commit(lambda: update(employee_ids))
+
+
+def mark_nine_box_inputs_changed(employee_ids: Iterable[int]) -> None:
+    _on_commit(NineBoxEmployeeMetrics.objects.mark_dirty, employee_ids)
+
+
+def _goal_participant_ids(goal_id) -> list:
+    if not goal_id:
+        return []
+    return list(GoalParticipant.objects.filter(goal_id=goal_id).values_list('employee_id', flat=True))
+
+
+def _employee_input_changed(sender, instance, **kwargs) -> None:
+    mark_nine_box_inputs_changed([instance.employee_id])
+
+
+for _model in EMPLOYEE_INPUT_MODELS:
+    post_save.connect(_employee_input_changed, sender=_model, dispatch_uid=f'nine_box_input_save_{_model.__name__}')
+    post_delete.connect(_employee_input_changed, sender=_model, dispatch_uid=f'nine_box_input_delete_{_model.__name__}')
+
+
+@receiver([post_save, post_delete], sender=PotentialAssessment, dispatch_uid='nine_box_input_potential')
+def _potential_changed(sender, instance, **kwargs) -> None:
+    _on_commit(NineBoxEmployeeMetrics.objects.refresh_latest_potential, [instance.employee_id])
+
+
+@receiver([post_save, post_delete], sender=GoalParticipant, dispatch_uid='nine_box_input_participant')
+def _participant_changed(sender, instance, **kwargs) -> None:
+    _on_commit(NineBoxEmployeeMetrics.objects.refresh_goal_progress, [instance.employee_id])
+
+
+@receiver([post_save, post_delete], sender=Goal, dispatch_uid='nine_box_input_goal')
+def _goal_changed(sender, instance, **kwargs) -> None:
+    _on_commit(NineBoxEmployeeMetrics.objects.refresh_goal_progress, _goal_participant_ids(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Task, dispatch_uid='nine_box_input_task')
+def _task_changed(sender, instance, **kwargs) -> None:
+    _on_commit(NineBoxEmployeeMetrics.objects.refresh_goal_progress, _goal_participant_ids(instance.goal_id))
+
+
+@receiver([post_save, post_delete], sender=FinalReview, dispatch_uid='final_review_statistics')
+def _final_review_changed(sender, instance, **kwargs) -> None:
+    transaction.on_commit(invalidate_final_review_statistics)
+
+
+@receiver([post_save, post_delete], sender=AssessmentQuestionTemplate, dispatch_uid='assessment_question_banks')
+def _question_template_changed(sender, instance, **kwargs) -> None:
+    transaction.on_commit(invalidate_question_banks)
@@ -0,0 +1,233 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.models import AssessmentQuestionTemplate, Department, Employee
+from api.services import assessment_scoring, cache_versions
+from api.services.assessment_scoring import (
+    QUESTION_BANK_FIELDS,
+    QUESTION_BANK_VERSION_KEY,
+    QuestionEvaluation,
+    _build_category_breakdown,
+    _parse_boolean,
+    _parse_number,
+    evaluate_answers,
+    get_question_bank,
+)
+from api.services.cache_versions import cache_version
+
+CONTEXT = AssessmentQuestionTemplate.Context.SELF
+
+
+def reference_evaluate(*, context, answers, department_id):
+    """Scoring as it was done per question over freshly loaded templates, kept as an oracle."""
+    base = AssessmentQuestionTemplate.objects.filter(context=context, is_active=True).order_by('order', 'created_at')
+    questions = {question.order: question for question in base.filter(department__isnull=True)}
+    if department_id:
+        questions.update({question.order: question for question in base.filter(department_id=department_id)})
+        questions = [questions[key] for key in sorted(questions)]
+    else:
+        questions = list(base.filter(department__isnull=True))
+
+    answer_map = {str(item.get('question_id') or item.get('id')): item for item in answers if item}
+    evaluations = []
+    for question in questions:
+        payload = answer_map.get(str(question.id), {})
+        raw_answer = payload.get('answer') if isinstance(payload, dict) else payload
+        score, is_correct = 0.0, False
+        max_score = float(question.max_score or 0) * question.weight
+        if question.answer_type == 'scale':
+            answer_value = _parse_number(raw_answer)
+            if answer_value is not None:
+                clamped = max(0.0, min(float(question.max_score), answer_value))
+                score = clamped * question.weight
+                is_correct = clamped >= question.max_score * 0.7
+        elif question.answer_type == 'numeric':
+            answer_value = _parse_number(raw_answer)
+            expected = _parse_number(question.correct_answer)
+            if answer_value is not None and expected is not None and abs(answer_value - expected) <= float(question.tolerance or 0):
+                score, is_correct = max_score, True
+        elif question.answer_type == 'single_choice':
+            answer_value = raw_answer
+            expected = question.correct_answer
+            if answer_value is not None and expected is not None:
+                is_correct = answer_value in expected if isinstance(expected, (list, tuple, set)) else answer_value == expected
+                score = max_score if is_correct else 0.0
+        elif question.answer_type == 'boolean':
+            answer_value = _parse_boolean(raw_answer)
+            expected = _parse_boolean(question.correct_answer)
+            if answer_value is not None and expected is not None:
+                is_correct = answer_value is expected
+                score = max_score if is_correct else 0.0
+        else:
+            answer_value = raw_answer
+        evaluations.append(QuestionEvaluation(
+            question_id=str(question.id),
+            title=question.title,
+            category=question.category or '',
+            answer_type=question.answer_type,
+            answer=answer_value,
+            score=score,
+            max_score=max_score,
+            weight=question.weight,
+            is_correct=is_correct,
+        ))
+
+    total_score = sum(evaluation.score for evaluation in evaluations)
+    total_max = sum(evaluation.max_score for evaluation in evaluations)
+    return {
+        'answers': [evaluation.as_json() for evaluation in evaluations],
+        'score': total_score,
+        'max_score': total_max,
+        'accuracy': (total_score / total_max * 100) if total_max else 0.0,
+        'categories': _build_category_breakdown(evaluations),
+    }
+
+
+def _as_dict(result):
+    return {
+        'answers': result.answers_json(),
+        'score': result.total_score,
+        'max_score': result.total_max_score,
+        'accuracy': result.accuracy,
+        'categories': result.categories,
+    }
+
+
+class QuestionBankTests(TestCase):
+
+    def setUp(self):
+        assessment_scoring._compiled_banks.clear()
+        cache_versions._local_versions.clear()
+        self.department = Department.objects.create(name='Dev')
+        user = User.objects.create_user(username='author', password='x', first_name='Anna', last_name='Old')
+        self.author = Employee.objects.create(user=user, hire_date=datetime.date(2025, 1, 1))
+
+        def question(order, answer_type, department=None, **fields):
+            return AssessmentQuestionTemplate.objects.create(
+                context=CONTEXT,
+                department=department,
+                title=f'Q{order} {answer_type}',
+                category=fields.pop('category', f'C{order % 2}'),
+                answer_type=answer_type,
+                order=order,
+                created_by=self.author,
+                **fields,
+            )
+
+        self.questions = [
+            question(1, 'scale', max_score=10, weight=2),
+            question(2, 'numeric', correct_answer=3.5, tolerance=0.1, weight=3),
+            question(3, 'numeric', correct_answer='12'),
+            question(4, 'single_choice', correct_answer='b', answer_options=['a', 'b']),
+            question(5, 'single_choice', correct_answer=['a', 'c'], answer_options=['a', 'b', 'c']),
+            question(6, 'boolean', correct_answer='да'),
+            question(7, 'boolean', correct_answer=False, category=''),
+            question(8, 'free_text'),
+            question(4, 'boolean', department=self.department, correct_answer=True),
+            question(9, 'scale', department=self.department, max_score=5),
+        ]
+        question(10, 'scale', is_active=False)
+
+    def _answer_sets(self):
+        ids = {question.order: str(question.id) for question in self.questions if question.department_id is None}
+        department_ids = {question.order: str(question.id) for question in self.questions if question.department_id}
+        return [
+            [],
+            [
+                {'question_id': ids[1], 'answer': '8'},
+                {'question_id': ids[2], 'answer': '3,55'},
+                {'question_id': ids[3], 'answer': 12},
+                {'question_id': ids[4], 'answer': 'b'},
+                {'question_id': ids[5], 'answer': 'c'},
+                {'question_id': ids[6], 'answer': 'yes'},
+                {'question_id': ids[7], 'answer': 'нет'},
+                {'question_id': ids[8], 'answer': 'anything'},
+                {'question_id': department_ids[4], 'answer': 1},
+                {'question_id': department_ids[9], 'answer': 7},
+            ],
+            [
+                {'id': ids[1], 'answer': 'x'},
+                {'question_id': ids[2], 'answer': 4},
+                {'question_id': ids[3], 'answer': None},
+                {'question_id': ids[4], 'answer': 'a'},
+                {'question_id': ids[5], 'answer': 'b'},
+                {'question_id': ids[6], 'answer': 'maybe'},
+                {'question_id': ids[7], 'answer': True},
+                {'question_id': department_ids[4], 'answer': 'false'},
+                {'question_id': department_ids[9], 'answer': -3},
+                None,
+            ],
+        ]
+
+    def test_matches_reference_for_every_answer_type(self):
+        answer_types = {question.answer_type for question in self.questions}
+        self.assertTrue({choice for choice, _ in AssessmentQuestionTemplate.ANSWER_TYPES} <= answer_types)
+
+        for department_id in (None, self.department.pk):
+            for answers in self._answer_sets():
+                with self.subTest(department_id=department_id, answers=answers):
+                    expected = reference_evaluate(context=CONTEXT, answers=answers, department_id=department_id)
+                    result = evaluate_answers(context=CONTEXT, answers=answers, department_id=department_id)
+                    self.assertEqual(_as_dict(result), expected)
+
+    def test_warm_bank_issues_no_question_queries(self):
+        template_table = AssessmentQuestionTemplate._meta.db_table
+        evaluate_answers(context=CONTEXT, answers=[], department_id=self.department.pk)
+
+        for shared_only in (False, True):
+            if shared_only:
+                # Another process: only the shared cache is warm.
+                assessment_scoring._compiled_banks.clear()
+            with CaptureQueriesContext(connection) as queries:
+                evaluate_answers(context=CONTEXT, answers=self._answer_sets()[1], department_id=self.department.pk)
+            self.assertEqual([query['sql'] for query in queries if template_table in query['sql']], [])
+
+    def test_warm_bank_issues_no_queries(self):
+        answers = self._answer_sets()[1]
+        evaluate_answers(context=CONTEXT, answers=answers, department_id=self.department.pk)
+
+        with self.assertNumQueries(0):
+            evaluate_answers(context=CONTEXT, answers=answers, department_id=self.department.pk)
+
+    def test_shared_cache_holds_plain_rows(self):
+        get_question_bank(CONTEXT, self.department.pk)
+
+        version = cache_version(QUESTION_BANK_VERSION_KEY)
+        rows = cache.get(f'assessment_question_bank:{version}:{CONTEXT}:{self.department.pk}')
+        self.assertEqual(len(rows), 9)
+        for row in rows:
+            self.assertIsInstance(row, dict)
+            self.assertEqual(set(row), set(QUESTION_BANK_FIELDS))
+
+    def test_template_change_rebuilds_the_bank(self):
+        before = get_question_bank(CONTEXT, None)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.questions[0].delete()
+
+        self.assertEqual(len(get_question_bank(CONTEXT, None)), len(before) - 1)
+
+    def test_active_endpoint_shows_current_author_and_department(self):
+        client = APIClient()
+        client.force_authenticate(self.author.user)
+        url = reverse('assessment-question-active')
+        client.get(url, {'context': CONTEXT, 'department': self.department.pk})
+
+        # Neither rename touches the templates, so the cached bank stays warm.
+        User.objects.filter(pk=self.author.user_id).update(last_name='New')
+        Department.objects.filter(pk=self.department.pk).update(name='Platform')
+        response = client.get(url, {'context': CONTEXT, 'department': self.department.pk})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 9)
+        self.assertEqual({item['created_by_name'] for item in response.data}, {'Anna New'})
+        self.assertEqual(
+            [item['department_name'] for item in response.data if item['department']],
+            ['Platform', 'Platform'],
+        )
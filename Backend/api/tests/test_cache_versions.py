@@ -0,0 +1,45 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from api.services import cache_versions
+from api.services.cache_versions import LOCAL_VERSION_TTL, bump_cache_version, cache_version
+
+KEY = 'test_cache_versions:version'
+
+
+class CacheVersionTests(TestCase):
+
+    def setUp(self):
+        cache_versions._local_versions.clear()
+
+    def test_reads_stay_in_process_until_the_window_ends(self):
+        with mock.patch.object(cache_versions.time, 'monotonic', return_value=100.0):
+            version = cache_version(KEY)
+            with self.assertNumQueries(0):
+                self.assertEqual(cache_version(KEY), version)
+
+            # Another process bumps the shared counter.
+            cache.incr(KEY)
+            self.assertEqual(cache_version(KEY), version)
+
+        with mock.patch.object(cache_versions.time, 'monotonic', return_value=100.0 + LOCAL_VERSION_TTL):
+            self.assertEqual(cache_version(KEY), version + 1)
+
+    def test_bump_is_seen_at_once_in_this_process(self):
+        version = cache_version(KEY)
+
+        bump_cache_version(KEY)
+
+        self.assertEqual(cache_version(KEY), version + 1)
+        self.assertEqual(cache.get(KEY), version + 1)
+
+    def test_bump_of_an_evicted_counter_moves_forward(self):
+        version = cache_version(KEY)
+        cache.delete(KEY)
+
+        with mock.patch.object(cache_versions, '_clock_version', return_value=version - 10):
+            bump_cache_version(KEY)
+
+        self.assertGreater(cache_version(KEY), version)
@@ -0,0 +1,155 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.db.models import Avg
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.models import Department, Employee, EmployeeRoleAssignment, FinalReview, Goal, ManagerReview, SelfAssessment
+from api.services.cache_versions import cache_version
+from api.services.final_review import (
+    STATISTICS_VERSION_KEY,
+    batch_final_reviews,
+    compute_final_review_scores,
+    final_review_statistics,
+)
+
+
+def make_employee(username, **fields):
+    user = User.objects.create_user(username=username, password='x')
+    return Employee.objects.create(user=user, hire_date=datetime.date(2025, 1, 1), **fields)
+
+
+def make_final_review(employee, review_period, **fields):
+    defaults = {'salary_recommendation': 'exclude', 'development_plan': 'plan', 'manager_summary': 'summary'}
+    return FinalReview.objects.create(employee=employee, review_period=review_period, **{**defaults, **fields})
+
+
+class BatchFinalReviewsTests(TestCase):
+
+    def setUp(self):
+        self.twice = make_employee('twice')
+        self.once = make_employee('once')
+        self.new = make_employee('new')
+        manager = make_employee('manager')
+        goal = Goal.objects.create(
+            employee=self.twice,
+            title='Goal',
+            description='',
+            goal_type='strategic',
+            start_date=datetime.date(2025, 1, 1),
+            end_date=datetime.date(2025, 6, 1),
+            expected_results='',
+        )
+        SelfAssessment.objects.create(employee=self.twice, goal=goal, calculated_score=20)
+        ManagerReview.objects.create(
+            manager=manager, employee=self.once, goal=goal,
+            results_achievement=8, personal_qualities_feedback='', personal_contribution_feedback='',
+            collaboration_quality=7, improvements_recommended='', overall_rating=8,
+            calculated_score=14, feedback_summary='',
+        )
+
+        self.duplicates = [make_final_review(self.twice, 'H1'), make_final_review(self.twice, 'H1')]
+        self.existing = make_final_review(self.once, 'H1', development_plan='keep me')
+        self.other_period = make_final_review(self.twice, 'H2', total_score=1)
+
+    def test_mixed_batch_updates_existing_and_creates_missing(self):
+        employee_ids = [self.twice.pk, self.once.pk, self.new.pk, self.new.pk]
+
+        summary = batch_final_reviews('H1', employee_ids)
+
+        scores = compute_final_review_scores([self.twice.pk, self.once.pk, self.new.pk])
+        period = FinalReview.objects.filter(review_period='H1')
+        self.assertEqual(period.count(), 4)
+        for final_review in period:
+            for field, value in scores[final_review.employee_id].items():
+                self.assertEqual(getattr(final_review, field), value, (final_review.employee_id, field))
+        self.assertEqual(
+            set(period.filter(employee=self.twice).values_list('pk', flat=True)),
+            {final_review.pk for final_review in self.duplicates},
+        )
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.development_plan, 'keep me')
+        self.assertEqual(self.existing.salary_recommendation, 'conditional')
+        created = period.get(employee=self.new)
+        self.assertEqual((created.development_plan, created.total_score, created.salary_recommendation), ('', 0, 'exclude'))
+        self.other_period.refresh_from_db()
+        self.assertEqual(self.other_period.total_score, 1)
+
+        self.assertEqual(summary['employees'], 3)
+        self.assertEqual(summary['created'], 1)
+        self.assertEqual(summary['updated'], 3)
+        self.assertEqual(summary['created'] + summary['updated'], period.count())
+        self.assertEqual(summary['salary_recommendations'], {'include': 1, 'conditional': 1, 'exclude': 1})
+        per_employee = period.values('employee').annotate(total=Avg('total_score'))
+        self.assertEqual(
+            summary['average_total_score'],
+            round(sum(row['total'] for row in per_employee) / len(per_employee), 2),
+        )
+
+    def test_rerun_only_updates(self):
+        batch_final_reviews('H1', [self.twice.pk, self.new.pk])
+
+        summary = batch_final_reviews('H1', [self.twice.pk, self.new.pk])
+
+        self.assertEqual((summary['created'], summary['updated']), (0, 3))
+        self.assertEqual(FinalReview.objects.filter(review_period='H1', employee=self.new).count(), 1)
+
+
+class FinalReviewStatisticsCacheTests(TestCase):
+
+    def setUp(self):
+        self.department = Department.objects.create(name='Dev')
+        self.head = make_employee('head', department=self.department)
+        EmployeeRoleAssignment.objects.create(
+            employee=self.head,
+            role=EmployeeRoleAssignment.Role.DEPARTMENT_HEAD,
+            department=self.department,
+        )
+        self.member = make_employee('member', department=self.department)
+        self.outsider = make_employee('outsider')
+        with self.captureOnCommitCallbacks(execute=True):
+            make_final_review(self.member, 'H1', total_score=20, salary_recommendation='include')
+            make_final_review(self.outsider, 'H1', total_score=10)
+        self.admin = User.objects.create_superuser(username='admin', password='x')
+        self.url = reverse('final-review-statistics')
+
+    def _statistics(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_save_and_delete_bump_the_version(self):
+        before = cache_version(STATISTICS_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            final_review = make_final_review(self.member, 'H2')
+        after_save = cache_version(STATISTICS_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            final_review.delete()
+
+        self.assertGreater(after_save, before)
+        self.assertGreater(cache_version(STATISTICS_VERSION_KEY), after_save)
+
+    def test_cached_until_a_final_review_changes(self):
+        self.assertEqual(final_review_statistics(None, scope='global')['salary_recommendations']['include'], 1)
+        # Queryset updates bypass the signals, so the cached entry is still served.
+        FinalReview.objects.filter(employee=self.outsider).update(salary_recommendation='include')
+        self.assertEqual(final_review_statistics(None, scope='global')['salary_recommendations']['include'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_final_review(self.member, 'H2')
+        stats = final_review_statistics(None, scope='global')
+        self.assertEqual(stats['total_reviews'], 3)
+        self.assertEqual(stats['salary_recommendations']['include'], 2)
+
+    def test_scoped_and_global_viewers_get_separate_entries(self):
+        global_stats = self._statistics(self.admin)
+        scoped_stats = self._statistics(self.head.user)
+
+        self.assertEqual(global_stats['total_reviews'], 2)
+        self.assertEqual(scoped_stats['total_reviews'], 1)
+        self.assertEqual(scoped_stats['salary_recommendations'], {'include': 1, 'conditional': 0, 'exclude': 0})
+        self.assertEqual(self._statistics(self.admin)['total_reviews'], 2)
@@ -0,0 +1,66 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.models import Department, Employee, Goal, GoalEvaluationNotification, GoalParticipant
+from api.services.goal_evaluation import fan_out_goal_evaluation
+
+
+def make_employee(username, department=None):
+    user = User.objects.create_user(username=username, password='x')
+    return Employee.objects.create(user=user, department=department, hire_date=datetime.date(2025, 1, 1))
+
+
+class GoalEvaluationFanOutTests(TestCase):
+
+    def setUp(self):
+        dev = Department.objects.create(name='Dev')
+        ops = Department.objects.create(name='Ops')
+        self.owner = make_employee('owner', dev)
+        self.helper = make_employee('helper', ops)
+        self.dev_colleagues = [make_employee(f'dev{index}', dev) for index in range(3)]
+        self.ops_colleague = make_employee('ops', ops)
+        make_employee('other', Department.objects.create(name='Other'))
+        make_employee('nobody')
+
+        self.goal = Goal.objects.create(
+            employee=self.owner,
+            title='Goal',
+            description='',
+            goal_type='strategic',
+            start_date=datetime.date(2025, 1, 1),
+            end_date=datetime.date(2025, 6, 1),
+            expected_results='',
+        )
+        GoalParticipant.objects.create(goal=self.goal, employee=self.owner, is_owner=True)
+        GoalParticipant.objects.create(goal=self.goal, employee=self.helper)
+
+    def _recipients(self):
+        return set(GoalEvaluationNotification.objects.filter(goal=self.goal).values_list('recipient_id', flat=True))
+
+    def test_notifies_department_colleagues_once(self):
+        GoalEvaluationNotification.objects.create(goal=self.goal, recipient=self.dev_colleagues[0])
+
+        created = fan_out_goal_evaluation(self.goal)
+
+        expected = {employee.pk for employee in self.dev_colleagues} | {self.ops_colleague.pk}
+        self.assertEqual(self._recipients(), expected)
+        self.assertEqual(created, len(expected) - 1)
+        self.assertEqual(fan_out_goal_evaluation(self.goal, batch_size=1), 0)
+        self.assertEqual(GoalEvaluationNotification.objects.filter(goal=self.goal).count(), len(expected))
+
+    def test_complete_reports_created_notifications(self):
+        client = APIClient()
+        client.force_authenticate(self.owner.user)
+        url = reverse('goal-complete', kwargs={'pk': self.goal.pk})
+
+        first = client.post(url, {'launch_evaluation': True}, format='json')
+        second = client.post(url, {'launch_evaluation': True}, format='json')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data['notifications_created'], 4)
+        self.assertEqual(second.data['notifications_created'], 0)
+        self.assertEqual(len(self._recipients()), 4)
@@ -0,0 +1,115 @@
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.test import TestCase
+
+from api.models import Department, DepartmentClosure, Organization, Team, TeamClosure
+
+
+def expected_closure(model):
+    """Closure rows derived by walking ``parent`` from every node up to its root."""
+    parents = dict(model.objects.values_list('pk', 'parent_id'))
+    rows = set()
+    for node_id in parents:
+        ancestor_id, depth = node_id, 0
+        while ancestor_id is not None:
+            rows.add((ancestor_id, node_id, depth))
+            ancestor_id, depth = parents[ancestor_id], depth + 1
+    return rows
+
+
+def stored_closure(closure_model):
+    return set(closure_model.objects.values_list('ancestor_id', 'descendant_id', 'depth'))
+
+
+class DepartmentClosureTests(TestCase):
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Org')
+        self.root = self._department('Root')
+        self.a = self._department('A', self.root)
+        self.a1 = self._department('A1', self.a)
+        self.a2 = self._department('A2', self.a)
+        self.a11 = self._department('A11', self.a1)
+        self.b = self._department('B', self.root)
+        self.other = self._department('Other')
+
+    def _department(self, name, parent=None):
+        return Department.objects.create(name=name, organization=self.organization, parent=parent)
+
+    def assertClosureConsistent(self):
+        self.assertEqual(stored_closure(DepartmentClosure), expected_closure(Department))
+
+    def test_create(self):
+        self.assertClosureConsistent()
+        self.assertEqual(
+            set(self.a.subtree().values_list('name', flat=True)),
+            {'A', 'A1', 'A2', 'A11'},
+        )
+
+    def test_move_subtree(self):
+        self.a1.parent = self.b
+        self.a1.save()
+
+        self.assertClosureConsistent()
+        self.assertEqual(set(self.b.subtree().values_list('name', flat=True)), {'B', 'A1', 'A11'})
+        self.assertEqual(set(self.a11.ancestors().values_list('name', flat=True)), {'A1', 'B', 'Root'})
+
+    def test_reparent_to_root_and_back(self):
+        self.a.parent = None
+        self.a.save()
+        self.assertClosureConsistent()
+
+        self.a.parent = self.other
+        self.a.save()
+        self.assertClosureConsistent()
+        self.assertFalse(self.root.subtree().filter(pk=self.a11.pk).exists())
+        self.assertTrue(self.other.subtree().filter(pk=self.a11.pk).exists())
+
+    def test_delete_detaches_children(self):
+        self.a.delete()
+
+        self.assertClosureConsistent()
+        self.a1.refresh_from_db()
+        self.assertIsNone(self.a1.parent_id)
+        self.assertFalse(self.root.subtree().filter(pk=self.a11.pk).exists())
+
+    def test_failed_delete_keeps_closure(self):
+        before = stored_closure(DepartmentClosure)
+        with mock.patch.object(models.Model, 'delete', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.a.delete()
+        self.assertEqual(stored_closure(DepartmentClosure), before)
+
+    def test_cycle_is_rejected_without_touching_closure(self):
+        before = stored_closure(DepartmentClosure)
+        self.a.parent = self.a11
+        with self.assertRaises(ValidationError):
+            self.a.save()
+        self.assertEqual(stored_closure(DepartmentClosure), before)
+
+
+class TeamClosureTests(TestCase):
+
+    def setUp(self):
+        self.department = Department.objects.create(name='D')
+        self.lead = Team.objects.create(department=self.department, name='Lead')
+        self.backend = Team.objects.create(department=self.department, name='Backend', parent=self.lead)
+        self.api = Team.objects.create(department=self.department, name='API', parent=self.backend)
+        self.frontend = Team.objects.create(department=self.department, name='Frontend', parent=self.lead)
+
+    def assertClosureConsistent(self):
+        self.assertEqual(stored_closure(TeamClosure), expected_closure(Team))
+
+    def test_move_and_delete(self):
+        self.assertClosureConsistent()
+
+        self.backend.parent = self.frontend
+        self.backend.save()
+        self.assertClosureConsistent()
+        self.assertTrue(self.frontend.subtree().filter(pk=self.api.pk).exists())
+
+        self.frontend.delete()
+        self.assertClosureConsistent()
+        self.assertFalse(self.lead.subtree().filter(pk=self.api.pk).exists())
@@ -0,0 +1,659 @@
+import base64
+import datetime
+import json
+import random
+import time
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db.models import Avg, Count, Max, Q
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import (
+    Department,
+    Employee,
+    EmployeeRoleAssignment,
+    Feedback360,
+    FinalReview,
+    Goal,
+    GoalParticipant,
+    ManagerReview,
+    NineBoxEmployeeMetrics,
+    NineBoxHistoryPoint,
+    NineBoxSnapshot,
+    PotentialAssessment,
+    SelfAssessment,
+    Task,
+)
+from api.services.nine_box import (
+    DEFAULT_RECOMMENDATION,
+    RECOMMENDATION_RULES,
+    MatrixQuery,
+    _employee_fields,
+    _latest_timestamp,
+    _normalize_ratio,
+    _normalize_retention,
+    _normalize_score,
+    _serialize_meta,
+    compute_matrix_items,
+    decode_matrix_cursor,
+    encode_matrix_cursor,
+    map_axis_position,
+    nine_box_history,
+    prune_snapshots,
+    query_matrix,
+    record_history,
+)
+
+
+def _grouped(queryset, key, **aggregates):
+    return {row[key]: row for row in queryset.values(key).annotate(**aggregates)}
+
+
+def reference_matrix_items(employees):
+    """The per-employee computation that ``compute_matrix_items`` replaced, kept as an oracle."""
+    ids = [employee.id for employee in employees]
+    feedback_data = _grouped(
+        Feedback360.objects.filter(employee_id__in=ids), 'employee',
+        avg_score=Avg('calculated_score'), last_score=Max('created_at'),
+    )
+    self_data = _grouped(
+        SelfAssessment.objects.filter(employee_id__in=ids), 'employee',
+        avg_score=Avg('calculated_score'), last_score=Max('created_at'),
+    )
+    manager_data = _grouped(
+        ManagerReview.objects.filter(employee_id__in=ids), 'employee',
+        avg_score=Avg('calculated_score'), last_score=Max('created_at'),
+    )
+    final_data = _grouped(
+        FinalReview.objects.filter(employee_id__in=ids), 'employee',
+        last_total=Max('total_score'), last_date=Max('created_at'),
+    )
+    goal_map = _grouped(
+        Goal.objects.filter(goal_participants__employee_id__in=ids), 'goal_participants__employee_id',
+        total=Count('id', distinct=True), completed=Count('id', filter=Q(is_completed=True), distinct=True),
+    )
+    task_map = _grouped(
+        Task.objects.filter(goal__goal_participants__employee_id__in=ids), 'goal__goal_participants__employee_id',
+        total=Count('id', distinct=True), completed=Count('id', filter=Q(is_completed=True), distinct=True),
+    )
+    potential_map = {}
+    for assessment in PotentialAssessment.objects.filter(employee_id__in=ids).order_by('employee_id', '-created_at'):
+        potential_map.setdefault(assessment.employee_id, assessment)
+
+    items = []
+    for employee in employees:
+        feedback_row = feedback_data.get(employee.id, {})
+        self_row = self_data.get(employee.id, {})
+        manager_row = manager_data.get(employee.id, {})
+        final_row = final_data.get(employee.id, {})
+        goal_row = goal_map.get(employee.id, {})
+        task_row = task_map.get(employee.id, {})
+        potential = potential_map.get(employee.id)
+
+        feedback_avg = _normalize_score(feedback_row.get('avg_score'))
+        self_avg = _normalize_score(self_row.get('avg_score'))
+        manager_avg = _normalize_score(manager_row.get('avg_score'))
+        final_score = _normalize_score(final_row.get('last_total'), base=100.0)
+        goal_rate = _normalize_ratio(goal_row.get('completed', 0), goal_row.get('total', 0))
+        task_rate = _normalize_ratio(task_row.get('completed', 0), task_row.get('total', 0))
+
+        potential_signal = 0.0
+        retention_risk = None
+        potential_meta = {}
+        if potential:
+            potential_signal = min(float(potential.potential_score or 0) * 10.0, 100.0)
+            retention_risk = potential.retention_risk
+            potential_meta = {
+                'assessment_id': potential.id,
+                'development_desire': potential.development_desire,
+                'is_successor': potential.is_successor,
+                'successor_readiness': potential.successor_readiness,
+                'created_at': potential.created_at,
+            }
+            if potential.is_successor:
+                potential_signal = min(100.0, potential_signal + 10)
+        retention_pct = _normalize_retention(retention_risk)
+
+        performance = (
+            manager_avg * 0.35 + feedback_avg * 0.2 + goal_rate * 0.2 + task_rate * 0.1 + final_score * 0.15
+        )
+        potential_score = (
+            self_avg * 0.3 + feedback_avg * 0.2 + potential_signal * 0.3 + (100.0 - retention_pct) * 0.2
+        )
+        meta = {
+            'feedback_last_at': feedback_row.get('last_score'),
+            'self_last_at': self_row.get('last_score'),
+            'manager_last_at': manager_row.get('last_score'),
+            'final_last_at': final_row.get('last_date'),
+            'potential': potential_meta,
+            'last_updated_at': _latest_timestamp(
+                feedback_row.get('last_score'),
+                self_row.get('last_score'),
+                manager_row.get('last_score'),
+                final_row.get('last_date'),
+                potential_meta.get('created_at'),
+            ),
+        }
+        item = {
+            'employee_id': employee.id,
+            **_employee_fields(employee),
+            'performance_score': round(performance, 2),
+            'potential_score': round(potential_score, 2),
+            'scores': {
+                'goal_completion_rate': round(goal_rate, 2),
+                'task_completion_rate': round(task_rate, 2),
+                'feedback_average': round(feedback_avg, 2),
+                'manager_average': round(manager_avg, 2),
+                'self_assessment_average': round(self_avg, 2),
+                'final_review_score': round(final_score, 2),
+                'potential_signal': round(potential_signal, 2),
+                'retention_risk': round(retention_pct, 2),
+            },
+            'meta': _serialize_meta(meta),
+        }
+        item['nine_box_x'] = map_axis_position(item['performance_score'])
+        item['nine_box_y'] = map_axis_position(item['potential_score'])
+        item['ai_recommendations'] = reference_recommendations(item)
+        items.append(item)
+    return items
+
+
+def reference_recommendations(item):
+    templates = dict(RECOMMENDATION_RULES)
+    performance, potential, scores = item['performance_score'], item['potential_score'], item['scores']
+    hits = []
+    if potential >= 70 and performance < 45:
+        hits.append(templates['hidden_potential'])
+    if scores['retention_risk'] >= 60:
+        hits.append(templates['retention'])
+    if performance >= 80 and potential >= 80:
+        hits.append(templates['promotion'])
+    if scores['goal_completion_rate'] < 50 or scores['task_completion_rate'] < 50:
+        hits.append(templates['goal_focus'])
+    if scores['manager_average'] < 45 and performance < 45:
+        hits.append(templates['performance_plan'])
+    return hits or [DEFAULT_RECOMMENDATION]
+
+
+class ComputeMatrixItemsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        # The nine-box counters are maintained by on-commit receivers.
+        with cls.captureOnCommitCallbacks(execute=True):
+            rnd = random.Random(43)
+            department = Department.objects.create(name='Dev')
+            cls.employees = []
+            for index in range(40):
+                user = User.objects.create_user(username=f'u{index}', password='x', first_name=f'F{index}', last_name=f'L{index}')
+                cls.employees.append(Employee.objects.create(
+                    user=user,
+                    department=department if index % 3 else None,
+                    hire_date=datetime.date(2025, 1, 1),
+                ))
+            manager = cls.employees[0]
+
+            for index in range(60):
+                participants = rnd.sample(cls.employees, rnd.randint(1, 3))
+                goal = Goal.objects.create(
+                    employee=participants[0],
+                    created_by=manager,
+                    title=f'G{index}',
+                    description='',
+                    goal_type='strategic',
+                    start_date=datetime.date(2025, 1, 1),
+                    end_date=datetime.date(2025, 6, 1),
+                    expected_results='',
+                    is_completed=rnd.random() < 0.5,
+                )
+                for position, participant in enumerate(participants):
+                    GoalParticipant.objects.create(goal=goal, employee=participant, is_owner=position == 0)
+                for task_index in range(rnd.randint(0, 4)):
+                    Task.objects.create(goal=goal, title=f't{task_index}', description='', is_completed=rnd.random() < 0.5)
+                if rnd.random() < 0.6:
+                    SelfAssessment.objects.create(employee=participants[0], goal=goal, calculated_score=rnd.randint(0, 10))
+                if participants[0] != manager:
+                    Feedback360.objects.create(
+                        assessor=manager, employee=participants[0], goal=goal,
+                        results_achievement=7, collaboration_quality=6, calculated_score=rnd.randint(0, 10),
+                    )
+                    ManagerReview.objects.create(
+                        manager=manager, employee=participants[0], goal=goal,
+                        results_achievement=8, personal_qualities_feedback='', personal_contribution_feedback='',
+                        collaboration_quality=7, improvements_recommended='', overall_rating=8,
+                        calculated_score=rnd.randint(0, 10), feedback_summary='',
+                    )
+            for employee in cls.employees[:30]:
+                PotentialAssessment.objects.create(
+                    manager=manager, employee=employee, development_desire='proactive',
+                    retention_risk=rnd.randint(0, 10), potential_score=rnd.randint(0, 10),
+                    performance_score=rnd.randint(0, 6), is_successor=rnd.random() < 0.3,
+                )
+                FinalReview.objects.create(
+                    employee=employee, review_period='H1', total_score=rnd.randint(0, 100),
+                    salary_recommendation='include', development_plan='', manager_summary='',
+                )
+
+    def test_matches_per_employee_computation(self):
+        employees = list(Employee.objects.select_related('user', 'department').order_by('pk'))
+
+        items = compute_matrix_items(employees)
+
+        self.assertEqual(items, reference_matrix_items(employees))
+        titles = {rec['title'] for item in items for rec in item['ai_recommendations']}
+        self.assertGreaterEqual(len(titles), 3)
+
+
+
+class ComputeMatrixItemsScaleTests(TestCase):
+    EMPLOYEES = 1500
+
+    @classmethod
+    def setUpTestData(cls):
+        # Bulk inserts skip the receivers, so the counters are written directly.
+        rnd = random.Random(7)
+        department = Department.objects.create(name='Dev')
+        users = User.objects.bulk_create(
+            User(username=f'u{index}', first_name=f'F{index}', last_name=f'L{index}') for index in range(cls.EMPLOYEES)
+        )
+        employees = Employee.objects.bulk_create(
+            Employee(user=user, department=department, hire_date=datetime.date(2025, 1, 1)) for user in users
+        )
+        manager = employees[0]
+        goal = Goal.objects.create(
+            employee=manager,
+            title='Goal',
+            description='',
+            goal_type='strategic',
+            start_date=datetime.date(2025, 1, 1),
+            end_date=datetime.date(2025, 6, 1),
+            expected_results='',
+        )
+        SelfAssessment.objects.bulk_create(
+            SelfAssessment(employee=employee, goal=goal, calculated_score=rnd.randint(0, 10)) for employee in employees[::2]
+        )
+        ManagerReview.objects.bulk_create(
+            ManagerReview(
+                manager=manager, employee=employee, goal=goal,
+                results_achievement=8, personal_qualities_feedback='', personal_contribution_feedback='',
+                collaboration_quality=7, improvements_recommended='', overall_rating=8,
+                calculated_score=rnd.randint(0, 10), feedback_summary='',
+            )
+            for employee in employees[1::3]
+        )
+        FinalReview.objects.bulk_create(
+            FinalReview(
+                employee=employee, review_period='H1', total_score=rnd.randint(0, 100),
+                salary_recommendation='include', development_plan='', manager_summary='',
+            )
+            for employee in employees[::4]
+        )
+        assessments = PotentialAssessment.objects.bulk_create(
+            PotentialAssessment(
+                manager=manager, employee=employee, development_desire='proactive',
+                retention_risk=rnd.randint(0, 10), potential_score=rnd.randint(0, 10), is_successor=rnd.random() < 0.3,
+            )
+            for employee in employees[::3]
+        )
+        latest = {assessment.employee_id: assessment for assessment in assessments}
+        metrics = []
+        for employee in employees:
+            goals_total, tasks_total = rnd.randint(0, 6), rnd.randint(0, 12)
+            metrics.append(NineBoxEmployeeMetrics(
+                employee=employee,
+                goals_total=goals_total,
+                goals_completed=rnd.randint(0, goals_total),
+                tasks_total=tasks_total,
+                tasks_completed=rnd.randint(0, tasks_total),
+                latest_potential=latest.get(employee.pk),
+            ))
+        NineBoxEmployeeMetrics.objects.bulk_create(metrics)
+
+    def setUp(self):
+        self.employees = list(Employee.objects.select_related('user', 'department').order_by('pk'))
+
+    def test_query_count_does_not_grow_with_employees(self):
+        with self.assertNumQueries(5):
+            compute_matrix_items(self.employees[:10])
+
+        started = time.perf_counter()
+        with self.assertNumQueries(5):
+            items = compute_matrix_items(self.employees)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(items), self.EMPLOYEES)
+        self.assertLess(elapsed, 2.0)
+
+
+
+class NineBoxCountersTests(TestCase):
+    """The counters kept by ``api.signals`` must equal a fresh count after every commit."""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.alice = Employee.objects.create(
+                user=User.objects.create_user(username='alice', password='x'), hire_date=datetime.date(2025, 1, 1),
+            )
+            self.bob = Employee.objects.create(
+                user=User.objects.create_user(username='bob', password='x'), hire_date=datetime.date(2025, 1, 1),
+            )
+            self.goal = self._goal(self.alice, 'Shared')
+            GoalParticipant.objects.create(goal=self.goal, employee=self.bob)
+            self.other_goal = self._goal(self.alice, 'Own', is_completed=True)
+            self.tasks = [
+                Task.objects.create(goal=self.goal, title=f't{index}', description='') for index in range(3)
+            ]
+            Task.objects.create(goal=self.other_goal, title='done', description='', is_completed=True)
+
+    def _goal(self, owner, title, **fields):
+        goal = Goal.objects.create(
+            employee=owner,
+            title=title,
+            description='',
+            goal_type='strategic',
+            start_date=datetime.date(2025, 1, 1),
+            end_date=datetime.date(2025, 6, 1),
+            expected_results='',
+            **fields,
+        )
+        GoalParticipant.objects.create(goal=goal, employee=owner, is_owner=True)
+        return goal
+
+    def _assessment(self, employee, potential_score):
+        return PotentialAssessment.objects.create(
+            manager=self.bob, employee=employee, development_desire='proactive',
+            retention_risk=3, potential_score=potential_score,
+        )
+
+    def assertCountersFresh(self):
+        for employee in (self.alice, self.bob):
+            goals = Goal.objects.filter(goal_participants__employee=employee).distinct()
+            tasks = Task.objects.filter(goal__goal_participants__employee=employee).distinct()
+            latest = PotentialAssessment.objects.filter(employee=employee).order_by('-created_at', '-pk').first()
+            metrics = NineBoxEmployeeMetrics.objects.get(employee=employee)
+            self.assertEqual(
+                (metrics.goals_total, metrics.goals_completed, metrics.tasks_total, metrics.tasks_completed),
+                (goals.count(), goals.filter(is_completed=True).count(), tasks.count(), tasks.filter(is_completed=True).count()),
+                employee.user.username,
+            )
+            self.assertEqual(metrics.latest_potential_id, latest.pk if latest else None, employee.user.username)
+
+    def test_initial_counters(self):
+        self.assertCountersFresh()
+        self.assertEqual(NineBoxEmployeeMetrics.objects.get(employee=self.alice).goals_total, 2)
+
+    def test_completing_a_task_and_a_goal(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tasks[0].is_completed = True
+            self.tasks[0].save()
+        self.assertCountersFresh()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.goal.is_completed = True
+            self.goal.save()
+        self.assertCountersFresh()
+        self.assertEqual(NineBoxEmployeeMetrics.objects.get(employee=self.bob).goals_completed, 1)
+
+    def test_adding_and_removing_a_participant(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            participant = GoalParticipant.objects.create(goal=self.other_goal, employee=self.bob)
+        self.assertCountersFresh()
+        self.assertEqual(NineBoxEmployeeMetrics.objects.get(employee=self.bob).tasks_completed, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            participant.delete()
+        self.assertCountersFresh()
+        self.assertEqual(NineBoxEmployeeMetrics.objects.get(employee=self.bob).tasks_total, 3)
+
+    def test_deleting_a_goal_cascades_to_its_participants(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.goal.delete()
+
+        self.assertCountersFresh()
+        self.assertEqual(NineBoxEmployeeMetrics.objects.get(employee=self.bob).goals_total, 0)
+
+    def test_deleting_the_newest_potential_assessment(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            older = self._assessment(self.alice, 4)
+            newest = self._assessment(self.alice, 9)
+        self.assertCountersFresh()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            newest.delete()
+        self.assertCountersFresh()
+        self.assertEqual(NineBoxEmployeeMetrics.objects.get(employee=self.alice).latest_potential_id, older.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            older.delete()
+        self.assertCountersFresh()
+
+
+
+def _at(day, hour):
+    return datetime.datetime(2026, 3, day, hour, tzinfo=datetime.timezone.utc)
+
+
+class PruneSnapshotsTests(TestCase):
+    # Wednesday of ISO week 10; the daily window starts on Mar 1 12:00, the weekly one on Feb 18 12:00.
+    NOW = _at(4, 12)
+
+    def _snapshot(self, name, generated_at, scope='global', rollup=NineBoxSnapshot.Rollup.NONE):
+        snapshot = NineBoxSnapshot.objects.create(scope=scope, valid_until=generated_at, rollup=rollup, stats={'name': name})
+        NineBoxSnapshot.objects.filter(pk=snapshot.pk).update(generated_at=generated_at)
+        return snapshot
+
+    def _rollups(self, scope):
+        return dict(NineBoxSnapshot.objects.filter(scope=scope).values_list('stats__name', 'rollup'))
+
+    def test_keeps_latest_and_rollups_per_scope(self):
+        self._snapshot('a', _at(4, 11))
+        self._snapshot('b', _at(4, 10), rollup=NineBoxSnapshot.Rollup.DAILY)
+        self._snapshot('c', _at(4, 9))
+        self._snapshot('d', _at(3, 20))
+        self._snapshot('e', _at(3, 8))
+        self._snapshot('f', _at(1, 20))
+        self._snapshot('g', _at(1, 13))
+        self._snapshot('h', datetime.datetime(2026, 2, 26, 12, tzinfo=datetime.timezone.utc))
+        self._snapshot('i', datetime.datetime(2026, 2, 20, 12, tzinfo=datetime.timezone.utc))
+        self._snapshot(
+            'j', datetime.datetime(2026, 2, 10, 12, tzinfo=datetime.timezone.utc), rollup=NineBoxSnapshot.Rollup.WEEKLY,
+        )
+        for name in ('k', 'l'):
+            self._snapshot(name, datetime.datetime(2025, 1, 10, 12, tzinfo=datetime.timezone.utc), scope='department:1')
+        for day, name in enumerate('mno', start=1):
+            self._snapshot(name, datetime.datetime(2025, 1, day, 12, tzinfo=datetime.timezone.utc), scope='department:2')
+
+        summary = prune_snapshots(keep_latest=2, daily_days=3, weekly_weeks=2, now=self.NOW)
+
+        self.assertEqual(summary, {'scopes': 3, 'daily': 1, 'weekly': 3, 'deleted': 6})
+        Rollup = NineBoxSnapshot.Rollup
+        # a and f are the last of their day and week, d the last of Mar 3, i the last of week 8.
+        self.assertEqual(
+            self._rollups('global'),
+            {'a': Rollup.WEEKLY, 'b': Rollup.NONE, 'd': Rollup.DAILY, 'f': Rollup.WEEKLY, 'i': Rollup.WEEKLY},
+        )
+        self.assertEqual(self._rollups('department:1'), {'k': Rollup.NONE, 'l': Rollup.NONE})
+        self.assertEqual(self._rollups('department:2'), {'n': Rollup.NONE, 'o': Rollup.NONE})
+
+        self.assertEqual(
+            prune_snapshots(keep_latest=2, daily_days=3, weekly_weeks=2, now=self.NOW)['deleted'], 0,
+        )
+
+
+class CompressSnapshotMatricesMigrationTests(TestCase):
+
+    def test_compressed_blob_reads_back_as_the_legacy_payload(self):
+        matrix = [
+            {'employee_id': 1, 'employee_name': 'Анна Иванова', 'performance_score': 72.35, 'meta': {'potential': {}}},
+            {'employee_id': 2, 'employee_name': 'Bob', 'performance_score': 10.0, 'meta': {}},
+        ]
+        legacy = NineBoxSnapshot.objects.create(
+            valid_until=timezone.now(), payload={'matrix': matrix, 'summary': {'total': 2}},
+        )
+        untouched = NineBoxSnapshot.objects.create(valid_until=timezone.now(), payload={'summary': {'total': 0}})
+        legacy_matrix = NineBoxSnapshot.objects.get(pk=legacy.pk).matrix
+        self.assertEqual(legacy_matrix, matrix)
+
+        migration = import_module('api.migrations.0015_nine_box_snapshot_retention')
+        migration.compress_snapshot_matrices(apps, None)
+
+        compressed = NineBoxSnapshot.objects.get(pk=legacy.pk)
+        self.assertIsNotNone(compressed.matrix_blob)
+        self.assertEqual(compressed.payload, {'summary': {'total': 2}})
+        self.assertEqual(compressed.matrix, legacy_matrix)
+        untouched.refresh_from_db()
+        self.assertIsNone(untouched.matrix_blob)
+        self.assertEqual(untouched.payload, {'summary': {'total': 0}})
+
+
+
+def _history_entry(employee, x, y, performance=None, potential=None):
+    return {
+        'employee_id': employee.pk,
+        'performance_score': x * 30.0 if performance is None else performance,
+        'potential_score': y * 30.0 if potential is None else potential,
+        'nine_box_x': x,
+        'nine_box_y': y,
+    }
+
+
+class NineBoxHistoryTests(TestCase):
+    DAY = datetime.date(2026, 3, 2)
+
+    def setUp(self):
+        self.department = Department.objects.create(name='Dev')
+        self.head, self.member, self.outsider = [
+            Employee.objects.create(
+                user=User.objects.create_user(username=name, password='x'),
+                department=self.department if name != 'outsider' else None,
+                hire_date=datetime.date(2025, 1, 1),
+            )
+            for name in ('head', 'member', 'outsider')
+        ]
+
+    def _record(self, day_offset, *entries):
+        return record_history(list(entries), day=self.DAY + datetime.timedelta(days=day_offset))
+
+    def test_same_day_rewrite_updates_the_point(self):
+        self.assertEqual(self._record(0, _history_entry(self.head, 0, 0), _history_entry(self.member, 1, 1)), 2)
+        self.assertEqual(self._record(0, _history_entry(self.head, 0, 0), _history_entry(self.member, 1, 1)), 0)
+
+        written = self._record(0, _history_entry(self.head, 0, 0), _history_entry(self.member, 2, 1, performance=75.5))
+
+        self.assertEqual(written, 1)
+        self.assertEqual(NineBoxHistoryPoint.objects.filter(date=self.DAY).count(), 2)
+        point = NineBoxHistoryPoint.objects.get(employee=self.member, date=self.DAY)
+        self.assertEqual((point.performance_score, point.nine_box_x, point.nine_box_y), (75.5, 2, 1))
+
+    def test_transitions_come_from_consecutive_points(self):
+        self._record(0, _history_entry(self.head, 0, 0), _history_entry(self.member, 2, 2))
+        self._record(1, _history_entry(self.head, 0, 0, performance=5.0))
+        self._record(2, _history_entry(self.head, 1, 1), _history_entry(self.member, 2, 2))
+        self._record(3, _history_entry(self.head, 0, 0), _history_entry(self.outsider, 1, 1))
+        self._record(10, _history_entry(self.member, 0, 0))
+
+        history = nine_box_history(
+            Employee.objects.all(), scope='global', date_from=self.DAY, date_to=self.DAY + datetime.timedelta(days=3),
+        )
+
+        self.assertEqual(
+            sorted((entry['from'], entry['to'], entry['count']) for entry in history['transitions']),
+            [('low-low', 'mid-mid', 1), ('mid-mid', 'low-low', 1)],
+        )
+        self.assertEqual(history['moved_employees'], 1)
+        trajectories = {entry['employee_id']: entry for entry in history['trajectories']}
+        self.assertEqual(len(trajectories[self.head.pk]['points']), 4)
+        self.assertTrue(trajectories[self.head.pk]['moved'])
+        self.assertFalse(trajectories[self.member.pk]['moved'])
+        self.assertFalse(trajectories[self.outsider.pk]['moved'])
+
+    def test_manager_only_sees_managed_employees(self):
+        EmployeeRoleAssignment.objects.create(
+            employee=self.head,
+            role=EmployeeRoleAssignment.Role.DEPARTMENT_HEAD,
+            department=self.department,
+        )
+        for offset, x in enumerate((0, 1)):
+            self._record(offset, *(_history_entry(employee, x, 0) for employee in (self.head, self.member, self.outsider)))
+        url = reverse('potential-assessment-nine-box-history')
+        params = {'date_from': self.DAY.isoformat(), 'date_to': (self.DAY + datetime.timedelta(days=1)).isoformat()}
+
+        client = APIClient()
+        client.force_authenticate(self.head.user)
+        response = client.get(url, params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['scope'], f'managed:{self.head.pk}')
+        self.assertEqual({entry['employee_id'] for entry in response.data['trajectories']}, {self.head.pk, self.member.pk})
+        self.assertEqual(response.data['transitions'], [{'from': 'low-low', 'to': 'mid-low', 'count': 2}])
+
+        client.force_authenticate(self.outsider.user)
+        self.assertEqual(client.get(url, params).status_code, 403)
+
+
+def _raw_cursor(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+class QueryMatrixTests(SimpleTestCase):
+
+    def setUp(self):
+        # Many ties on both scores so that pages have to split inside a run of equal values.
+        self.matrix = [
+            {
+                'employee_id': pk,
+                'employee_name': f'Name {pk % 4}',
+                'department_id': None,
+                'performance_score': float(pk % 3 * 10),
+                'potential_score': 50.0,
+                'nine_box_x': 0,
+                'nine_box_y': 1,
+            }
+            for pk in range(1, 24)
+        ]
+
+    def _pages(self, ordering, limit):
+        ids, cursor = [], None
+        while True:
+            page = query_matrix(self.matrix, MatrixQuery(ordering=ordering, cursor=cursor, limit=limit))
+            ids.extend(entry['employee_id'] for entry in page['matrix'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                return ids
+
+    def test_pages_continue_across_ties(self):
+        for ordering in ('employee_id', 'performance_score', '-performance_score', 'potential_score', 'employee_name', '-employee_name'):
+            query = MatrixQuery(ordering=ordering)
+            expected = [entry['employee_id'] for entry in sorted(self.matrix, key=query.sort_key, reverse=query.descending)]
+            for limit in (1, 2, 5):
+                self.assertEqual(self._pages(ordering, limit), expected, (ordering, limit))
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_matrix_cursor(encode_matrix_cursor((12.5, 3)), 'performance_score'), (12.5, 3))
+        self.assertEqual(decode_matrix_cursor(encode_matrix_cursor(('имя', 3)), 'employee_name'), ('имя', 3))
+
+    def test_malformed_cursor_is_rejected(self):
+        for cursor in ('not base64!', _raw_cursor({'a': 1}), _raw_cursor([1]), _raw_cursor([1, 2, 3]), base64.b64encode(b'\xff').decode()):
+            with self.assertRaises(ValueError, msg=cursor):
+                decode_matrix_cursor(cursor, 'employee_id')
+
+    def test_tampered_cursor_is_rejected(self):
+        cases = [
+            ('performance_score', [[1, 2], 3]),
+            ('performance_score', [None, 3]),
+            ('performance_score', ['10', 3]),
+            ('performance_score', [True, 3]),
+            ('performance_score', [10.0, '3']),
+            ('performance_score', [10.0, None]),
+            ('employee_id', [{'a': 1}, 3]),
+            ('employee_name', [10, 3]),
+            ('employee_name', [['x'], 3]),
+        ]
+        for ordering, payload in cases:
+            with self.assertRaises(ValueError, msg=(ordering, payload)):
+                query_matrix(self.matrix, MatrixQuery(ordering=ordering, cursor=_raw_cursor(payload)))
@@ -0,0 +1,49 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from api.models import Department, Employee, EmployeeRoleAssignment, Organization
+
+
+class ActiveRoleAssignmentsTests(TestCase):
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Org')
+        self.department = Department.objects.create(name='D', organization=organization)
+        user = User.objects.create_user(username='head', password='x')
+        self.employee = Employee.objects.create(user=user, department=self.department, hire_date=datetime.date(2025, 1, 1))
+        self.head = EmployeeRoleAssignment.objects.create(
+            employee=self.employee,
+            role=EmployeeRoleAssignment.Role.DEPARTMENT_HEAD,
+            department=self.department,
+        )
+        revoked = EmployeeRoleAssignment.objects.create(
+            employee=self.employee,
+            role=EmployeeRoleAssignment.Role.ORGANIZATION_LEAD,
+            organization=organization,
+        )
+        revoked.is_active = False
+        revoked.save()
+
+    def test_same_list_with_and_without_prefetch(self):
+        plain = Employee.objects.get(pk=self.employee.pk)
+        prefetched = Employee.objects.with_active_assignments().get(pk=self.employee.pk)
+
+        for employee in (plain, prefetched):
+            assignments = employee.active_role_assignments()
+            self.assertIsInstance(assignments, list)
+            self.assertEqual([assignment.pk for assignment in assignments], [self.head.pk])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(prefetched.active_role_assignments()[0].department.name, 'D')
+
+    def test_has_active_role_matches_with_and_without_prefetch(self):
+        roles = (EmployeeRoleAssignment.Role.DEPARTMENT_HEAD,)
+        for employee in (
+            Employee.objects.get(pk=self.employee.pk),
+            Employee.objects.with_active_assignments().get(pk=self.employee.pk),
+        ):
+            self.assertTrue(employee.has_active_role(roles, department_id=self.department.pk))
+            self.assertFalse(employee.has_active_role(roles, department_id=self.department.pk + 1))
+            self.assertFalse(employee.has_active_role((EmployeeRoleAssignment.Role.ORGANIZATION_LEAD,)))
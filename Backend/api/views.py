@@ -1,18 +1,35 @@
+from datetime import timedelta
+
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, SAFE_METHODS
 from rest_framework.exceptions import ValidationError, PermissionDenied
 from django.db import IntegrityError, transaction
-from django.db.models import Q, Avg, Count, Max
+from django.db.models import Q, Exists, OuterRef, Prefetch
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from .models import *
 from .serializers import *
-from .services.assessment_scoring import evaluate_answers, get_effective_question_bank
-from .services.nine_box import build_matrix_payload, generate_snapshot, get_active_snapshot
+from .services.assessment_scoring import evaluate_answers, get_effective_question_bank, get_question_bank
+from .services.final_review import batch_final_reviews, final_review_statistics, recompute_final_review
+from .services.goal_evaluation import fan_out_goal_evaluation
+from .services.nine_box import (
+    MATRIX_MAX_PAGE_SIZE,
+    MATRIX_ORDERINGS,
+    NINE_BOX_HISTORY_DEFAULT_DAYS,
+    MatrixQuery,
+    matrix_for_scope,
+    nine_box_history,
+    organization_snapshot,
+    project_snapshot,
+    query_matrix,
+    resolve_matrix_scope,
+)
+from performance.jobs import accepted_job_response, enqueue
 
 
 class OrganizationViewSet(viewsets.ModelViewSet):
@@ -156,7 +173,11 @@ class EmployeeRoleAssignmentViewSet(viewsets.ModelViewSet):
     destroy=extend_schema(summary='Удалить сотрудника', tags=['Employees']),
 )
 class EmployeeViewSet(viewsets.ModelViewSet):
-    queryset = Employee.objects.select_related('user', 'department', 'position').all()
+    queryset = (
+        Employee.objects.select_related('user', 'department__organization', 'position', 'team')
+        .with_active_assignments()
+        .all()
+    )
     serializer_class = EmployeeSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -186,7 +207,11 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     def _current_employee(self):
         if not hasattr(self, '_cached_employee'):
             try:
-                self._cached_employee = Employee.objects.select_related('department').get(user=self.request.user)
+                self._cached_employee = (
+                    Employee.objects.select_related('user', 'department')
+                    .with_active_assignments()
+                    .get(user=self.request.user)
+                )
             except Employee.DoesNotExist:
                 self._cached_employee = None
         return self._cached_employee
@@ -202,10 +227,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         if employee.has_global_visibility():
             return self.queryset
 
-        visible_ids = employee.visible_employee_ids()
-        if not visible_ids:
-            return self.queryset.filter(pk=employee.pk)
-        return self.queryset.filter(pk__in=visible_ids)
+        return self.queryset.filter(pk__in=employee.visible_employees().values('pk'))
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -218,7 +240,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         manager_ids = EmployeeRoleAssignment.objects.active().filter(
             role__in=leadership_roles
         ).values_list('employee_id', flat=True)
-        managers = Employee.objects.filter(
+        managers = self.queryset.filter(
             Q(id__in=manager_ids) | Q(role__in=[Employee.Role.ADMIN, Employee.Role.BUSINESS_PARTNER])
         ).distinct()
         serializer = self.get_serializer(managers, many=True)
@@ -228,9 +250,9 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     def team(self, request, pk=None):
         employee = self.get_object()
         if employee.team_id:
-            teammates = Employee.objects.filter(team_id=employee.team_id).exclude(id=employee.id)
+            teammates = self.queryset.filter(team_id=employee.team_id).exclude(id=employee.id)
         else:
-            teammates = Employee.objects.filter(department=employee.department).exclude(id=employee.id)
+            teammates = self.queryset.filter(department=employee.department).exclude(id=employee.id)
         serializer = self.get_serializer(teammates, many=True)
         return Response(serializer.data)
 
@@ -240,7 +262,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         if not employee:
             return Response([], status=status.HTTP_200_OK)
 
-        base_queryset = Employee.objects.select_related('user', 'department', 'position', 'team')
+        base_queryset = self.queryset
         if employee.team_id:
             colleagues = base_queryset.filter(team_id=employee.team_id)
         else:
@@ -403,13 +425,22 @@ class GoalViewSet(viewsets.ModelViewSet):
                 ordered.append(participant)
         return ordered
     
+    @staticmethod
+    def _serialized_queryset():
+        return (
+            Goal.objects.with_progress()
+            .prefetch_related(
+                Prefetch('tasks', queryset=Task.objects.select_related('completed_by__user')),
+                'participants',
+                'goal_participants__employee__user',
+                'goal_participants__employee__department',
+            )
+            .select_related('employee__user', 'employee__department', 'created_by__user')
+        )
+
     def get_queryset(self):
         user = self.request.user
-        queryset = Goal.objects.all().prefetch_related(
-            'tasks',
-            'goal_participants__employee__user',
-            'goal_participants__employee__department'
-        ).select_related('employee__user', 'employee__department', 'created_by__user')
+        queryset = self._serialized_queryset()
 
         if user.is_superuser:
             return queryset
@@ -421,11 +452,15 @@ class GoalViewSet(viewsets.ModelViewSet):
         if employee.has_global_visibility():
             return queryset
 
-        visible_ids = employee.visible_employee_ids()
-        filters = Q(goal_participants__employee_id__in=visible_ids) | Q(evaluation_notifications__recipient=employee)
-        filters |= Q(created_by=employee)
+        visible_participants = GoalParticipant.objects.filter(
+            goal_id=OuterRef('pk'),
+            employee_id__in=employee.visible_employees().values('pk'),
+        )
+        notified = GoalEvaluationNotification.objects.filter(goal_id=OuterRef('pk'), recipient=employee)
 
-        return queryset.filter(filters).distinct()
+        return queryset.filter(
+            Exists(visible_participants) | Exists(notified) | Q(created_by=employee)
+        )
     
     def get_object(self):
         queryset = self.filter_queryset(self.get_queryset())
@@ -445,12 +480,7 @@ class GoalViewSet(viewsets.ModelViewSet):
             if not notification_exists:
                 raise
 
-            fallback_queryset = Goal.objects.prefetch_related(
-                'tasks',
-                'goal_participants__employee__user',
-                'goal_participants__employee__department'
-            ).select_related('employee__user', 'employee__department', 'created_by__user')
-            obj = get_object_or_404(fallback_queryset, **{self.lookup_field: lookup_value})
+            obj = get_object_or_404(self._serialized_queryset(), **{self.lookup_field: lookup_value})
 
         self.check_object_permissions(self.request, obj)
         return obj
@@ -477,10 +507,8 @@ class GoalViewSet(viewsets.ModelViewSet):
 
         invalid = []
         if creator and not user.is_superuser and not creator.has_global_visibility():
-            invalid = [
-                participant for participant in participants_ordered
-                if participant.pk != creator.pk and not creator.can_manage_employee(participant)
-            ]
+            allowed_ids = creator.manageable_employee_ids(participant.pk for participant in participants_ordered)
+            invalid = [participant for participant in participants_ordered if participant.pk not in allowed_ids]
         if invalid:
             raise ValidationError({'participants': 'Можно назначать цель только сотрудникам в вашей зоне ответственности.'})
 
@@ -530,10 +558,10 @@ class GoalViewSet(viewsets.ModelViewSet):
             participants_ordered = self._ordered_participants(participant_ids)
 
             if current_employee and not user.is_superuser and not current_employee.has_global_visibility():
-                invalid = [
-                    participant for participant in participants_ordered
-                    if participant.pk != current_employee.pk and not current_employee.can_manage_employee(participant)
-                ]
+                allowed_ids = current_employee.manageable_employee_ids(
+                    participant.pk for participant in participants_ordered
+                )
+                invalid = [participant for participant in participants_ordered if participant.pk not in allowed_ids]
                 if invalid:
                     raise ValidationError({'participants': 'Можно назначать цель только сотрудникам в вашей зоне ответственности.'})
 
@@ -565,6 +593,7 @@ class GoalViewSet(viewsets.ModelViewSet):
                     )
 
         goal.refresh_from_db()
+        serializer.instance = self._serialized_queryset().get(pk=goal.pk)
     
     @action(detail=True, methods=['post'])
     def complete(self, request, pk=None):
@@ -595,25 +624,25 @@ class GoalViewSet(viewsets.ModelViewSet):
         goal.evaluation_launched = bool(launch_evaluation)
         goal.save()
         
+        notifications_created = 0
+        evaluation_job = None
+        raw_async = request.data.get('async', False)
+        if isinstance(raw_async, str):
+            run_async = raw_async.strip().lower() in {'1', 'true', 'yes', 'on'}
+        else:
+            run_async = bool(raw_async)
         if launch_evaluation:
-            participant_departments = list(
-                goal.participants.values_list('department_id', flat=True)
-            )
-
-            colleagues = Employee.objects.filter(
-                department_id__in=[dept_id for dept_id in participant_departments if dept_id]
-            ).exclude(
-                id__in=goal.participants.values_list('id', flat=True)
-            ).distinct()
-
-            for colleague in colleagues:
-                GoalEvaluationNotification.objects.get_or_create(
-                    recipient=colleague,
-                    goal=goal
-                )
+            if run_async:
+                evaluation_job = enqueue('goal_evaluation_fan_out', {'goal_id': goal.pk}, requested_by=user)
+            else:
+                notifications_created = fan_out_goal_evaluation(goal)
         
-        serializer = self.get_serializer(goal)
-        return Response(serializer.data)
+        serializer = self.get_serializer(self._serialized_queryset().get(pk=goal.pk))
+        data = serializer.data
+        data['notifications_created'] = notifications_created
+        if evaluation_job is not None:
+            data['evaluation_job'] = accepted_job_response(request, evaluation_job).data
+        return Response(data)
 
 class TaskViewSet(viewsets.ModelViewSet):
     serializer_class = TaskSerializer
@@ -637,13 +666,14 @@ class TaskViewSet(viewsets.ModelViewSet):
         if employee.has_global_visibility():
             return base_queryset
 
-        visible_ids = employee.visible_employee_ids()
-        if not visible_ids:
-            return base_queryset.filter(goal__goal_participants__employee=employee).distinct()
-
         return base_queryset.filter(
-            goal__goal_participants__employee_id__in=visible_ids
-        ).distinct()
+            Exists(
+                GoalParticipant.objects.filter(
+                    goal_id=OuterRef('goal_id'),
+                    employee_id__in=employee.visible_employees().values('pk'),
+                )
+            )
+        )
     
     def perform_update(self, serializer):
         from django.utils import timezone
@@ -657,14 +687,11 @@ class TaskViewSet(viewsets.ModelViewSet):
                 raise ValidationError({'detail': 'Профиль сотрудника не найден.'})
 
             if not employee.has_global_visibility():
-                participants = list(task.goal.participants.select_related('department', 'team'))
-                participant_ids = {participant.pk for participant in participants}
-                if employee.pk not in participant_ids:
-                    can_manage = any(
-                        employee.can_manage_employee(participant) for participant in participants
-                    )
-                    if not can_manage:
-                        raise ValidationError({'detail': 'Недостаточно прав для изменения задачи.'})
+                participant_ids = set(
+                    GoalParticipant.objects.filter(goal_id=task.goal_id).values_list('employee_id', flat=True)
+                )
+                if employee.pk not in participant_ids and not employee.manageable_employee_ids(participant_ids):
+                    raise ValidationError({'detail': 'Недостаточно прав для изменения задачи.'})
 
         is_completed = serializer.validated_data.get('is_completed', task.is_completed)
         completed_by = serializer.validated_data.get('completed_by', None)
@@ -696,8 +723,7 @@ class ObjectiveAssessmentMixin:
         else:
             department_id = getattr(employee, 'department_id', None)
         if not objective_answers:
-            question_bank = get_effective_question_bank(context, department_id)
-            if not question_bank:
+            if not get_question_bank(context, department_id):
                 return {'answers': [], 'score': 0, 'max_score': 0, 'accuracy': 0, 'categories': []}
         result = evaluate_answers(
             context=context,
@@ -800,18 +826,18 @@ class SelfAssessmentViewSet(ObjectiveAssessmentMixin, viewsets.ModelViewSet):
         if employee.has_global_visibility():
             return base_queryset
 
-        visible_ids = employee.visible_employee_ids()
+        visible = employee.visible_employees().values('pk')
         return base_queryset.filter(
-            Q(employee_id__in=visible_ids) |
-            Q(goal__goal_participants__employee_id__in=visible_ids)
-        ).distinct()
+            Q(employee_id__in=visible) |
+            Exists(GoalParticipant.objects.filter(goal_id=OuterRef('goal_id'), employee_id__in=visible))
+        )
     
     @action(detail=False, methods=['get'])
     def pending(self, request):
         user = self.request.user
         try:
             employee = Employee.objects.get(user=user)
-            completed_goals = Goal.objects.filter(
+            completed_goals = GoalViewSet._serialized_queryset().filter(
                 goal_participants__employee=employee,
                 is_completed=True,
                 evaluation_launched=True
@@ -908,7 +934,7 @@ class Feedback360ViewSet(ObjectiveAssessmentMixin, viewsets.ModelViewSet):
             notifications = GoalEvaluationNotification.objects.filter(
                 recipient=employee,
                 is_completed=False
-            ).select_related('goal').prefetch_related('goal__goal_participants__employee__user')
+            ).for_feed()
             serializer = GoalEvaluationNotificationSerializer(notifications, many=True)
             return Response(serializer.data)
         except Employee.DoesNotExist:
@@ -975,11 +1001,10 @@ class ManagerReviewViewSet(viewsets.ModelViewSet):
         if employee.has_global_visibility():
             return queryset
 
-        visible_ids = employee.visible_employee_ids()
         return queryset.filter(
             Q(manager=employee) |
-            Q(employee_id__in=visible_ids)
-        ).distinct()
+            Q(employee_id__in=employee.visible_employees().values('pk'))
+        )
     
     @action(detail=False, methods=['get'])
     def my_team(self, request):
@@ -991,8 +1016,7 @@ class ManagerReviewViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        team_ids = employee.managed_employee_ids()
-        team = Employee.objects.filter(id__in=team_ids)
+        team = employee.managed_employees()
         serializer = EmployeeSerializer(team, many=True)
         return Response(serializer.data)
     
@@ -1043,77 +1067,134 @@ class PotentialAssessmentViewSet(viewsets.ModelViewSet):
         if employee.has_global_visibility():
             return queryset
 
-        managed_ids = employee.managed_employee_ids()
         return queryset.filter(
             Q(manager=employee) |
-            Q(employee_id__in=managed_ids) |
+            Q(employee_id__in=employee.managed_employees().values('pk')) |
             Q(employee=employee)
-        ).distinct()
+        )
     
     @action(detail=False, methods=['get'])
     def nine_box_matrix(self, request):
         user = self.request.user
-        employee = Employee.objects.filter(user=user).select_related('department').first()
+        employee, employees, scope = resolve_matrix_scope(user)
 
-        scope = 'global'
-        if employee and employee.department_id:
-            scope = f"department:{employee.department_id}"
-
-        cached = get_active_snapshot(scope=scope, freshness_minutes=30)
-        if cached:
-            dataset = {
-                'matrix': cached.payload.get('matrix', []),
-                'stats': cached.stats,
-                'ai_recommendations': cached.ai_recommendations,
-                'generated_at': cached.generated_at,
-                'valid_until': cached.valid_until,
-                'source': cached.source,
-            }
-            return Response(dataset)
-
-        if user.is_superuser:
-            employees = Employee.objects.select_related('user', 'department').all()
-        elif not employee:
+        if not user.is_superuser and not employee:
             return Response({'matrix': [], 'stats': {}, 'ai_recommendations': []}, status=status.HTTP_200_OK)
-        elif employee.has_global_visibility():
-            employees = Employee.objects.select_related('user', 'department').all()
-        elif employee.has_leadership_scope:
-            managed_ids = employee.managed_employee_ids()
-            employees = Employee.objects.filter(
-                Q(id__in=managed_ids) | Q(id=employee.id)
-            ).select_related('user', 'department')
-        else:
+        if employees is None:
             return Response(
                 {'error': 'Доступ к матрице открыт только руководителям и пользователям с расширенными правами.'},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        _, dataset = generate_snapshot(
-            employees=employees,
-            scope=scope,
-            ttl_minutes=60,
-            source=NineBoxSnapshot.Source.ON_DEMAND,
-            generated_by=employee if employee else None,
-        )
+        query = self._matrix_query(request)
+        _, dataset = matrix_for_scope(employees, scope, generated_by=employee)
+        if query is not None:
+            try:
+                dataset.update(query_matrix(dataset['matrix'], query))
+            except ValueError:
+                raise ValidationError({'cursor': 'Некорректный курсор.'})
         return Response(dataset)
 
+    def _matrix_query(self, request):
+        """Filters and pagination for ``nine_box_matrix``; ``None`` keeps the full-matrix response."""
+        params = request.query_params
+        query_params = (
+            'x', 'y', 'department', 'performance_min', 'performance_max',
+            'potential_min', 'potential_max', 'ordering', 'cursor', 'limit',
+        )
+        if not any(name in params for name in query_params):
+            return None
+
+        query = MatrixQuery()
+        for axis in ('x', 'y'):
+            raw = params.get(axis)
+            if raw:
+                if raw not in ('0', '1', '2'):
+                    raise ValidationError({axis: 'Допустимые значения: 0, 1, 2.'})
+                setattr(query, axis, int(raw))
+
+        department_id = params.get('department')
+        if department_id:
+            if not str(department_id).isdigit():
+                raise ValidationError({'department': 'Некорректный идентификатор отдела.'})
+            query.department_ids = set(
+                Department.objects.filter(ancestor_links__ancestor_id=int(department_id)).values_list('pk', flat=True)
+            )
+
+        for name in ('performance_min', 'performance_max', 'potential_min', 'potential_max'):
+            raw = params.get(name)
+            if raw:
+                try:
+                    setattr(query, name, float(raw))
+                except ValueError:
+                    raise ValidationError({name: 'Ожидается число.'})
+
+        ordering = params.get('ordering') or query.ordering
+        if ordering.lstrip('-') not in MATRIX_ORDERINGS:
+            raise ValidationError({'ordering': f"Допустимые значения: {', '.join(MATRIX_ORDERINGS)} (с '-' для убывания)."})
+        query.ordering = ordering
+
+        raw_limit = params.get('limit')
+        if raw_limit:
+            if not raw_limit.isdigit() or not 1 <= int(raw_limit) <= MATRIX_MAX_PAGE_SIZE:
+                raise ValidationError({'limit': f'Ожидается число от 1 до {MATRIX_MAX_PAGE_SIZE}.'})
+            query.limit = int(raw_limit)
+        query.cursor = params.get('cursor') or None
+        return query
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def nine_box_matrix_async(self, request):
+        employee, employees, _ = resolve_matrix_scope(request.user)
+        if employees is None or (not request.user.is_superuser and not employee):
+            return Response(
+                {'error': 'Доступ к матрице открыт только руководителям и пользователям с расширенными правами.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        job = enqueue('nine_box_snapshot', {'user_id': request.user.pk}, requested_by=request.user)
+        return accepted_job_response(request, job)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def nine_box_history(self, request):
+        employee, employees, scope = resolve_matrix_scope(request.user)
+        if employees is None or (not request.user.is_superuser and not employee):
+            return Response(
+                {'error': 'Доступ к матрице открыт только руководителям и пользователям с расширенными правами.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        dates = {}
+        for param in ('date_from', 'date_to'):
+            raw = request.query_params.get(param)
+            try:
+                dates[param] = parse_date(raw) if raw else None
+            except ValueError:
+                dates[param] = None
+            if raw and dates[param] is None:
+                raise ValidationError({param: 'Некорректная дата, ожидается формат ГГГГ-ММ-ДД.'})
+        date_to = dates['date_to'] or timezone.localdate()
+        date_from = dates['date_from'] or date_to - timedelta(days=NINE_BOX_HISTORY_DEFAULT_DAYS)
+        if date_from > date_to:
+            raise ValidationError({'detail': 'Начало периода не может быть позже его окончания.'})
+
+        return Response(nine_box_history(employees, scope=scope, date_from=date_from, date_to=date_to))
+
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def ai_recommendations(self, request):
         user = request.user
         employee = Employee.objects.filter(user=user).select_related('department').first()
 
         if user.is_superuser:
-            employees = Employee.objects.select_related('user', 'department').all()[:50]
+            employee_ids = None
         elif not employee or not employee.has_leadership_scope:
             return Response({'detail': 'Недостаточно прав для получения рекомендаций.'}, status=status.HTTP_403_FORBIDDEN)
         else:
-            managed_ids = employee.managed_employee_ids()
-            employees = Employee.objects.filter(id__in=managed_ids).select_related('user', 'department')[:50]
+            employee_ids = employee.managed_employees().values_list('pk', flat=True)
 
-        dataset = build_matrix_payload(employees)
+        snapshot = organization_snapshot(generated_by=employee)
+        dataset = project_snapshot(snapshot, employee_ids)
         return Response({
             'recommendations': dataset['ai_recommendations'],
-            'generated_at': timezone.now(),
+            'generated_at': dataset['generated_at'],
         })
 
 
@@ -1147,6 +1228,8 @@ class AssessmentQuestionTemplateViewSet(viewsets.ModelViewSet):
         department_id = request.query_params.get('department')
         if not context:
             return Response({'detail': 'context is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if department_id and not department_id.isdigit():
+            raise ValidationError({'department': 'Некорректный идентификатор отдела.'})
         question_bank = get_effective_question_bank(context, department_id)
         serializer = self.get_serializer(question_bank, many=True)
         return Response(serializer.data)
@@ -1217,7 +1300,7 @@ class GoalEvaluationNotificationViewSet(viewsets.ModelViewSet):
         if not employee:
             return GoalEvaluationNotification.objects.none()
 
-        return GoalEvaluationNotification.objects.filter(recipient=employee).select_related('goal').prefetch_related('goal__goal_participants__employee__user')
+        return GoalEvaluationNotification.objects.filter(recipient=employee).for_feed()
     
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
@@ -1261,110 +1344,87 @@ class FinalReviewViewSet(viewsets.ModelViewSet):
         if employee.has_global_visibility():
             return queryset
 
-        visible_ids = employee.visible_employee_ids()
-        return queryset.filter(employee_id__in=visible_ids)
+        return queryset.filter(employee_id__in=employee.visible_employees().values('pk'))
     
     @action(detail=True, methods=['post'])
     def calculate_final_score(self, request, pk=None):
-        final_review = self.get_object()
-        employee_target = final_review.employee
-        
-        self_assessments = SelfAssessment.objects.filter(employee=employee_target)
-        feedbacks = Feedback360.objects.filter(employee=employee_target)
-        manager_reviews = ManagerReview.objects.filter(employee=employee_target)
-        potential_assessments = PotentialAssessment.objects.filter(employee=employee_target)
-        
-        self_score = self_assessments.aggregate(Avg('calculated_score'))['calculated_score__avg'] or 0
-        feedback_score = feedbacks.aggregate(Avg('calculated_score'))['calculated_score__avg'] or 0
-        manager_score = manager_reviews.aggregate(Avg('calculated_score'))['calculated_score__avg'] or 0
-        potential_score = potential_assessments.aggregate(Avg('potential_score'))['potential_score__avg'] or 0
-        
-        total_score = self_score + feedback_score + manager_score + potential_score
-        
-        if total_score <= 12:
-            salary_recommendation = 'exclude'
-        elif total_score <= 15:
-            salary_recommendation = 'conditional'
-        else:
-            salary_recommendation = 'include'
-        
-        final_review.self_assessment_score = round(self_score, 2)
-        final_review.feedback_360_score = round(feedback_score, 2)
-        final_review.manager_review_score = round(manager_score, 2)
-        final_review.potential_score = round(potential_score, 2)
-        final_review.total_score = round(total_score, 2)
-        final_review.salary_recommendation = salary_recommendation
-        final_review.save()
-        
+        final_review = recompute_final_review(self.get_object())
         serializer = self.get_serializer(final_review)
         return Response(serializer.data)
-    
+
+    @action(detail=True, methods=['post'])
+    def calculate_final_score_async(self, request, pk=None):
+        final_review = self.get_object()
+        job = enqueue('final_review_score', {'final_review_id': final_review.pk}, requested_by=request.user)
+        return accepted_job_response(request, job)
+
+    @action(detail=False, methods=['post'])
+    def batch_calculate(self, request):
+        user = request.user
+        employee = Employee.objects.filter(user=user).select_related('department').first()
+
+        scoped_employees = Employee.objects.all()
+        if user.is_superuser or (employee and employee.has_global_visibility()):
+            pass
+        elif employee and employee.has_leadership_scope:
+            scoped_employees = scoped_employees.filter(id__in=employee.visible_employees().values('pk'))
+        else:
+            return Response(
+                {'error': 'Пакетный расчет доступен только руководителям и пользователям с расширенными правами.'},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        review_period = str(request.data.get('review_period') or '').strip()
+        if not review_period:
+            raise ValidationError({'review_period': 'Укажите период оценки.'})
+        if len(review_period) > FinalReview._meta.get_field('review_period').max_length:
+            raise ValidationError({'review_period': 'Слишком длинное название периода.'})
+
+        department_id = request.data.get('department')
+        if department_id not in (None, ''):
+            if not str(department_id).isdigit():
+                raise ValidationError({'department': 'Некорректный идентификатор отдела.'})
+            scoped_employees = scoped_employees.in_department_subtree(int(department_id))
+
+        employee_ids = request.data.get('employees')
+        if employee_ids is not None:
+            if not isinstance(employee_ids, list) or not all(str(pk).isdigit() for pk in employee_ids):
+                raise ValidationError({'employees': 'Ожидается список идентификаторов сотрудников.'})
+            employee_ids = {int(pk) for pk in employee_ids}
+            allowed_ids = set(scoped_employees.filter(id__in=employee_ids).values_list('pk', flat=True))
+            if allowed_ids != employee_ids:
+                raise ValidationError({'employees': 'Часть сотрудников недоступна или не входит в выбранный отдел.'})
+        else:
+            allowed_ids = scoped_employees.values_list('pk', flat=True)
+
+        summary = batch_final_reviews(review_period, allowed_ids)
+        return Response(summary)
+
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         user = request.user
         employee = Employee.objects.filter(user=user).select_related('department').first()
 
-        employee_queryset = Employee.objects.select_related('department').all()
-
         if user.is_superuser:
-            scoped_employees = employee_queryset
+            scoped_employees, scope = None, 'global'
         elif not employee:
             return Response({}, status=status.HTTP_200_OK)
         elif employee.has_global_visibility():
-            scoped_employees = employee_queryset
+            scoped_employees, scope = None, 'global'
         elif employee.has_leadership_scope:
-            visible_ids = employee.visible_employee_ids()
-            scoped_employees = employee_queryset.filter(id__in=visible_ids)
+            scoped_employees, scope = employee.visible_employees(), f'visible:{employee.pk}'
         else:
             return Response(
                 {'error': 'Статистика доступна только руководителям и пользователям с расширенными правами.'},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        employee_ids = scoped_employees.values_list('id', flat=True)
-        reviews = FinalReview.objects.filter(employee_id__in=employee_ids)
-
-        aggregates = reviews.aggregate(
-            total=Count('id'),
-            average=Avg('total_score'),
-            unique_employees=Count('employee', distinct=True),
-            last_created=Max('created_at'),
-        )
-
-        salary_breakdown = {
-            'include': reviews.filter(salary_recommendation='include').count(),
-            'conditional': reviews.filter(salary_recommendation='conditional').count(),
-            'exclude': reviews.filter(salary_recommendation='exclude').count(),
-        }
-
-        period_breakdown = list(
-            reviews
-            .values('review_period')
-            .annotate(total=Count('id'))
-            .order_by('-total', '-review_period')[:5]
-        )
-
-        department_breakdown = list(
-            reviews
-            .values('employee__department_id', 'employee__department__name')
-            .annotate(
-                total=Count('id'),
-                employees=Count('employee', distinct=True),
-            )
-            .order_by('-total')[:5]
-        )
-
-        for item in department_breakdown:
-            item['employee__department__name'] = item['employee__department__name'] or 'Без отдела'
-
-        stats = {
-            'total_reviews': aggregates['total'] or 0,
-            'average_score': aggregates['average'] or 0,
-            'unique_employees': aggregates['unique_employees'] or 0,
-            'last_submitted_at': aggregates['last_created'],
-            'salary_recommendations': salary_breakdown,
-            'top_periods': period_breakdown,
-            'top_departments': department_breakdown,
-        }
+        department_id = request.query_params.get('department')
+        if department_id:
+            if not str(department_id).isdigit():
+                raise ValidationError({'department': 'Некорректный идентификатор отдела.'})
+            department_id = int(department_id)
+        else:
+            department_id = None
 
-        return Response(stats)
\ No newline at end of file
+        return Response(final_review_statistics(scoped_employees, scope=scope, department_id=department_id))
@@ -12,6 +12,7 @@ echo "PostgreSQL started"
 # Применяем миграции
 echo "Applying database migrations..."
 python manage.py migrate
+python manage.py createcachetable
 
 # Опционально очищаем базу данных для свежего старта
 if [ "${RESET_DB:-0}" = "1" ]; then
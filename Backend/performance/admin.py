@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import SkillCategory, SkillQuestion, ReviewPeriod
+from .models import BackgroundJob, ReviewPeriod, ScheduledJobRun, ScheduledJobState, SkillCategory, SkillQuestion
 
 
 class SkillQuestionInline(admin.TabularInline):
@@ -34,3 +34,23 @@ class ReviewPeriodAdmin(admin.ModelAdmin):
 	list_display = ("name", "month_period", "is_active", "start_date", "end_date")
 	list_filter = ("is_active",)
 	search_fields = ("name",)
+
+
+@admin.register(ScheduledJobState)
+class ScheduledJobStateAdmin(admin.ModelAdmin):
+	list_display = ("name", "next_run_at", "last_status", "last_finished_at", "locked_by", "locked_until")
+	search_fields = ("name",)
+
+
+@admin.register(ScheduledJobRun)
+class ScheduledJobRunAdmin(admin.ModelAdmin):
+	list_display = ("job_name", "status", "started_at", "duration_ms", "worker")
+	list_filter = ("job_name", "status")
+	readonly_fields = ("job_name", "worker", "started_at", "finished_at", "duration_ms", "status", "result", "error")
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+	list_display = ("name", "status", "attempts", "max_attempts", "run_after", "finished_at", "requested_by")
+	list_filter = ("name", "status")
+	readonly_fields = ("payload", "result", "error", "locked_by", "locked_until", "started_at", "finished_at")
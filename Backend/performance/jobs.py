@@ -0,0 +1,244 @@
+"""Background job queue stored in PostgreSQL and executed by ``run_worker``.
+
+Request handlers call ``enqueue`` and answer immediately with the job id. A
+worker claims the oldest due job with ``SELECT ... FOR UPDATE SKIP LOCKED``,
+so several workers never pick the same row and never wait for each other.
+A failed attempt is retried with exponential backoff until ``max_attempts``
+is reached; the outcome (result or traceback) stays on the row so clients
+can poll the status endpoint. A job whose worker died is requeued once its
+lease expires. While a handler runs, ``LeaseHeartbeat`` keeps renewing the
+lease, so a long job is not requeued under a live worker.
+"""
+from __future__ import annotations
+
+import logging
+import traceback
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status as http_status
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+
+from .models import BackgroundJob
+from .scheduler import LeaseHeartbeat, worker_name
+
+JOB_LEASE = timedelta(minutes=30)
+JOB_RETRY_BASE_SECONDS = 30
+JOB_RETRY_MAX_SECONDS = 60 * 60
+JOB_HISTORY_DAYS = 14
+
+HANDLERS: Dict[str, Callable[[Dict], Dict]] = {}
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying the job cannot succeed."""
+
+
+def job_handler(name: str) -> Callable[[Callable[[Dict], Dict]], Callable[[Dict], Dict]]:
+    def register(func: Callable[[Dict], Dict]) -> Callable[[Dict], Dict]:
+        HANDLERS[name] = func
+        return func
+
+    return register
+
+
+def enqueue(name: str, payload: Optional[Dict] = None, *, requested_by=None, max_attempts: int = 3) -> BackgroundJob:
+    if name not in HANDLERS:
+        raise ValueError(f"Unknown background job: {name}")
+    return BackgroundJob.objects.create(
+        name=name,
+        payload=payload or {},
+        requested_by=requested_by,
+        max_attempts=max_attempts,
+    )
+
+
+def accepted_job_response(request, job: BackgroundJob) -> Response:
+    return Response(
+        {
+            "status": "accepted",
+            "job_id": str(job.id),
+            "job_status": job.status,
+            "status_url": reverse("background-job-detail", kwargs={"job_id": job.id}, request=request),
+        },
+        status=http_status.HTTP_202_ACCEPTED,
+    )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(JOB_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), JOB_RETRY_MAX_SECONDS))
+
+
+def claim_next_job(worker: Optional[str] = None) -> Optional[BackgroundJob]:
+    worker = worker or worker_name()
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            BackgroundJob.objects.select_for_update(skip_locked=True)
+            .filter(status=BackgroundJob.STATUS_QUEUED, run_after__lte=now)
+            .order_by("run_after", "created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = BackgroundJob.STATUS_RUNNING
+        job.attempts += 1
+        job.locked_by = worker
+        job.locked_until = now + JOB_LEASE
+        job.started_at = now
+        job.save(update_fields=["status", "attempts", "locked_by", "locked_until", "started_at", "updated_at"])
+    return job
+
+
+def _renew_lease(job: BackgroundJob) -> bool:
+    return bool(
+        BackgroundJob.objects.filter(pk=job.pk, locked_by=job.locked_by, status=BackgroundJob.STATUS_RUNNING).update(
+            locked_until=timezone.now() + JOB_LEASE
+        )
+    )
+
+
+def execute_job(job: BackgroundJob) -> BackgroundJob:
+    handler = HANDLERS.get(job.name)
+    retryable = True
+    with LeaseHeartbeat(lambda: _renew_lease(job), JOB_LEASE):
+        try:
+            if handler is None:
+                raise PermanentJobError(f"No handler registered for {job.name}")
+            result = handler(job.payload) or {}
+        except (PermanentJobError, ObjectDoesNotExist):
+            retryable = False
+            error = traceback.format_exc()
+        except Exception:  # noqa: BLE001 - the worker records the failure and keeps running
+            error = traceback.format_exc()
+        else:
+            error = None
+
+    if error is None:
+        return _finish(job, status=BackgroundJob.STATUS_SUCCEEDED, result=result)
+    if retryable and job.attempts < job.max_attempts:
+        now = timezone.now()
+        _release(
+            job,
+            status=BackgroundJob.STATUS_QUEUED,
+            run_after=now + retry_delay(job.attempts),
+            error=error,
+            updated_at=now,
+        )
+        return job
+    return _finish(job, status=BackgroundJob.STATUS_FAILED, error=error)
+
+
+def _finish(job: BackgroundJob, *, status: str, result: Optional[Dict] = None, error: str = "") -> BackgroundJob:
+    now = timezone.now()
+    _release(job, status=status, result=result or {}, error=error, finished_at=now, updated_at=now)
+    return job
+
+
+def _release(job: BackgroundJob, **fields) -> None:
+    """Store the outcome and drop the lock, but only while this worker still holds it."""
+    released = BackgroundJob.objects.filter(
+        pk=job.pk, locked_by=job.locked_by, status=BackgroundJob.STATUS_RUNNING
+    ).update(locked_by="", locked_until=None, **fields)
+    if not released:
+        logger.error(
+            "Background job %s (%s) lost its lock on %s; the outcome was discarded: %s",
+            job.pk,
+            job.name,
+            job.locked_by,
+            fields.get("status"),
+        )
+    job.refresh_from_db()
+
+
+def requeue_stale_jobs(now=None) -> int:
+    """Return jobs held by a vanished worker to the queue, or fail them when out of attempts."""
+    now = now or timezone.now()
+    stale = BackgroundJob.objects.filter(status=BackgroundJob.STATUS_RUNNING, locked_until__lt=now)
+    released = {"locked_by": "", "locked_until": None, "updated_at": now}
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=BackgroundJob.STATUS_FAILED,
+        error="Worker lease expired",
+        finished_at=now,
+        **released,
+    )
+    requeued = stale.update(status=BackgroundJob.STATUS_QUEUED, run_after=now, **released)
+    return failed + requeued
+
+
+def run_pending_jobs(*, worker: Optional[str] = None, limit: Optional[int] = None) -> List[BackgroundJob]:
+    """Claim and execute due jobs until the queue is empty or ``limit`` jobs ran."""
+    worker = worker or worker_name()
+    requeue_stale_jobs()
+    finished = []
+    while limit is None or len(finished) < limit:
+        job = claim_next_job(worker)
+        if job is None:
+            break
+        finished.append(execute_job(job))
+    return finished
+
+
+def prune_finished_jobs(days: int = JOB_HISTORY_DAYS) -> int:
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = BackgroundJob.objects.filter(
+        status__in=[BackgroundJob.STATUS_SUCCEEDED, BackgroundJob.STATUS_FAILED],
+        finished_at__lt=cutoff,
+    ).delete()
+    return deleted
+
+
+@job_handler("nine_box_snapshot")
+def _nine_box_snapshot(payload: Dict) -> Dict:
+    from django.contrib.auth import get_user_model
+
+    from api.services.nine_box import matrix_for_scope, resolve_matrix_scope
+
+    user = get_user_model().objects.get(pk=payload["user_id"])
+    employee, employees, scope = resolve_matrix_scope(user)
+    if employees is None:
+        raise PermanentJobError("The requester has no access to the nine-box matrix")
+    snapshot, dataset = matrix_for_scope(employees, scope, generated_by=employee, force=True)
+    return {
+        "snapshot_id": str(snapshot.id),
+        "scope": scope,
+        "employees": len(dataset["matrix"]),
+        "stats": dataset["stats"],
+        "valid_until": snapshot.valid_until.isoformat(),
+    }
+
+
+@job_handler("skill_review_cycles")
+def _skill_review_cycles(payload: Dict) -> Dict:
+    from .services import generate_skill_review_cycles
+
+    return generate_skill_review_cycles(date.fromisoformat(payload["current_date"]))
+
+
+@job_handler("final_review_score")
+def _final_review_score(payload: Dict) -> Dict:
+    from api.models import FinalReview
+    from api.services.final_review import recompute_final_review
+
+    final_review = recompute_final_review(FinalReview.objects.get(pk=payload["final_review_id"]))
+    return {
+        "final_review_id": final_review.pk,
+        "total_score": final_review.total_score,
+        "salary_recommendation": final_review.salary_recommendation,
+    }
+
+
+@job_handler("goal_evaluation_fan_out")
+def _goal_evaluation_fan_out(payload: Dict) -> Dict:
+    from api.models import Goal
+    from api.services.goal_evaluation import fan_out_goal_evaluation
+
+    goal = Goal.objects.get(pk=payload["goal_id"])
+    return {"goal_id": goal.pk, "notifications_created": fan_out_goal_evaluation(goal)}
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Employee
+from api.services.final_review import batch_final_reviews
+
+
+class Command(BaseCommand):
+    help = "Рассчитать итоговые оценки за период для всех сотрудников, отдела или выбранных сотрудников"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--period", required=True, help="Период оценки, например «1 полугодие 2025»")
+        parser.add_argument("--department", type=int, help="Ограничить отделом и его подотделами")
+        parser.add_argument("--employee", type=int, action="append", default=[], help="ID сотрудника (можно повторять)")
+
+    def handle(self, *args, **options):
+        employees = Employee.objects.all()
+        if options["department"]:
+            employees = employees.in_department_subtree(options["department"])
+        if options["employee"]:
+            employees = employees.filter(id__in=options["employee"])
+            missing = set(options["employee"]) - set(employees.values_list("pk", flat=True))
+            if missing:
+                raise CommandError(f"Сотрудники не найдены или вне отдела: {', '.join(map(str, sorted(missing)))}")
+
+        summary = batch_final_reviews(options["period"], employees.values_list("pk", flat=True))
+        recommendations = summary["salary_recommendations"]
+        self.stdout.write(self.style.SUCCESS(
+            f"Готово. Сотрудников: {summary['employees']}, создано: {summary['created']}, "
+            f"обновлено: {summary['updated']}, средний балл: {summary['average_total_score']}, "
+            f"include/conditional/exclude: {recommendations['include']}/{recommendations['conditional']}"
+            f"/{recommendations['exclude']}."
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from performance.services import REVIEW_LOG_EXPIRY_BATCH_SIZE, expire_stale_review_logs
+
+
+class Command(BaseCommand):
+    help = "Перевести просроченные ожидающие оценки в статус expired и убрать их непрочитанные уведомления"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=REVIEW_LOG_EXPIRY_BATCH_SIZE)
+        parser.add_argument("--max-batches", type=int, default=None)
+
+    def handle(self, *args, **options):
+        summary = expire_stale_review_logs(
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Готово. Просрочено: {summary['expired']}, удалено уведомлений: {summary['notifications_removed']}, "
+            f"завершено задач: {summary['tasks_completed']}, пакетов: {summary['batches']}."
+        ))
@@ -0,0 +1,32 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from performance.services import REVIEW_SCHEDULE_BATCH_SIZE, process_review_schedules
+
+
+class Command(BaseCommand):
+    help = "Обработать наступившие расписания оценок задач (можно запускать в нескольких процессах)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Дата обработки в формате YYYY-MM-DD (по умолчанию сегодня)")
+        parser.add_argument("--batch-size", type=int, default=REVIEW_SCHEDULE_BATCH_SIZE)
+        parser.add_argument("--max-batches", type=int, default=None)
+
+    def handle(self, *args, **options):
+        raw_date = options.get("date")
+        try:
+            current_date = date.fromisoformat(raw_date) if raw_date else timezone.now().date()
+        except ValueError as exc:
+            raise CommandError("Некорректная дата, ожидается YYYY-MM-DD") from exc
+
+        summary = process_review_schedules(
+            current_date,
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Готово. Запущено: {summary['started']}, закрыто: {summary['closed']}, "
+            f"пакетов: {summary['batches']}."
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from api.services.nine_box import (
+    SNAPSHOT_DAILY_DAYS,
+    SNAPSHOT_KEEP_LATEST,
+    SNAPSHOT_WEEKLY_WEEKS,
+    prune_snapshots,
+)
+
+
+class Command(BaseCommand):
+    help = "Удалить устаревшие снимки матрицы 9-box, оставив последние и итоговые за день и неделю"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-latest", type=int, default=SNAPSHOT_KEEP_LATEST)
+        parser.add_argument("--daily-days", type=int, default=SNAPSHOT_DAILY_DAYS)
+        parser.add_argument("--weekly-weeks", type=int, default=SNAPSHOT_WEEKLY_WEEKS)
+
+    def handle(self, *args, **options):
+        summary = prune_snapshots(
+            keep_latest=options["keep_latest"],
+            daily_days=options["daily_days"],
+            weekly_weeks=options["weekly_weeks"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Готово. Областей: {summary['scopes']}, удалено снимков: {summary['deleted']}, "
+            f"итогов дня: {summary['daily']}, итогов недели: {summary['weekly']}."
+        ))
@@ -0,0 +1,55 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from performance.scheduler import JOBS, run_due_jobs, worker_name
+
+
+class Command(BaseCommand):
+    help = "Запустить планировщик периодических задач (отдельный процесс рядом с gunicorn)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Выполнить наступившие задачи один раз и выйти")
+        parser.add_argument("--tick", type=int, default=30, help="Пауза между проверками, секунд")
+        parser.add_argument(
+            "--job",
+            action="append",
+            dest="jobs",
+            help="Ограничить запуск указанными задачами (можно повторять)",
+        )
+
+    def handle(self, *args, **options):
+        jobs = JOBS
+        if options.get("jobs"):
+            known = {job.name: job for job in JOBS}
+            unknown = [name for name in options["jobs"] if name not in known]
+            if unknown:
+                raise CommandError(f"Неизвестные задачи: {', '.join(unknown)}")
+            jobs = tuple(known[name] for name in options["jobs"])
+
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        worker = worker_name()
+        self.stdout.write(f"Планировщик {worker}: задач {len(jobs)}")
+        while not self._stopping:
+            close_old_connections()
+            for run in run_due_jobs(jobs, worker=worker):
+                style = self.style.SUCCESS if run.status == run.STATUS_SUCCESS else self.style.ERROR
+                self.stdout.write(style(f"{run.job_name}: {run.status} за {run.duration_ms} мс {run.result}"))
+                if run.error:
+                    self.stderr.write(run.error)
+            if options["once"]:
+                break
+            for _ in range(max(options["tick"], 1)):
+                if self._stopping:
+                    break
+                time.sleep(1)
+
+        self.stdout.write("Планировщик остановлен")
+
+    def _stop(self, *args):
+        self._stopping = True
@@ -0,0 +1,45 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from performance.jobs import run_pending_jobs
+from performance.scheduler import worker_name
+
+
+class Command(BaseCommand):
+    help = "Запустить обработчик фоновых задач из очереди в базе данных"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Обработать накопившиеся задачи и выйти")
+        parser.add_argument("--poll", type=int, default=2, help="Пауза при пустой очереди, секунд")
+        parser.add_argument("--batch", type=int, default=10, help="Сколько задач выполнить между проверками сигнала остановки")
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        worker = worker_name()
+        batch = max(options["batch"], 1)
+        self.stdout.write(f"Обработчик очереди {worker} запущен")
+        while not self._stopping:
+            close_old_connections()
+            jobs = run_pending_jobs(worker=worker, limit=batch)
+            for job in jobs:
+                style = self.style.SUCCESS if job.status == job.STATUS_SUCCEEDED else self.style.ERROR
+                self.stdout.write(style(f"{job.name} {job.id}: {job.status} (попытка {job.attempts})"))
+            if jobs and len(jobs) == batch:
+                continue
+            if options["once"]:
+                break
+            for _ in range(max(options["poll"], 1)):
+                if self._stopping:
+                    break
+                time.sleep(1)
+
+        self.stdout.write("Обработчик очереди остановлен")
+
+    def _stop(self, *args):
+        self._stopping = True
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("performance", "0009_skill_question_objective_fields"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reviewschedule",
+            index=models.Index(fields=["status", "review_start"], name="perf_sched_status_start_idx"),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+def backfill_outstanding_reviews(apps, schema_editor):
+    ReviewTask = apps.get_model("performance", "ReviewTask")
+    ReviewLog = apps.get_model("performance", "ReviewLog")
+
+    open_logs = ReviewLog.objects.filter(context="task", status__in=["pending", "pending_email"])
+    for task in ReviewTask.objects.filter(status="review").only("id"):
+        outstanding = open_logs.filter(metadata__task_id=str(task.id)).count()
+        ReviewTask.objects.filter(pk=task.pk).update(outstanding_reviews=outstanding)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("performance", "0010_review_schedule_status_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reviewtask",
+            name="outstanding_reviews",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Respondents who have not submitted the current task review yet",
+            ),
+        ),
+        migrations.RunPython(backfill_outstanding_reviews, migrations.RunPython.noop),
+    ]
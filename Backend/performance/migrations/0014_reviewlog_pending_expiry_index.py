@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("performance", "0013_background_jobs"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reviewlog",
+            index=models.Index(
+                condition=models.Q(("status__in", ["pending", "pending_email"])),
+                fields=["expires_at"],
+                name="perf_revlog_pending_exp_idx",
+            ),
+        ),
+    ]
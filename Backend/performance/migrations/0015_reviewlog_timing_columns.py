@@ -0,0 +1,110 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils import timezone
+
+
+def _parse_date(value):
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        return None
+
+
+def _parse_datetime(value):
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
+def backfill_timing_columns(apps, schema_editor):
+    ReviewLog = apps.get_model("performance", "ReviewLog")
+
+    logs = ReviewLog.objects.filter(
+        Q(metadata__has_key="due_at")
+        | Q(metadata__has_key="due_date")
+        | Q(metadata__has_key="available_since")
+        | Q(metadata__has_key="submitted_at")
+        | Q(metadata__has_key="awaiting_feedback_since")
+    ).only("id", "status", "metadata")
+
+    batch = []
+    for log in logs.iterator(chunk_size=1000):
+        metadata = log.metadata or {}
+        log.due_at = _parse_date(metadata.get("due_at") or metadata.get("due_date"))
+        log.available_since = _parse_date(metadata.get("available_since"))
+        log.submitted_at = _parse_datetime(metadata.get("submitted_at"))
+        if log.status == "awaiting_feedback":
+            log.awaiting_feedback_since = _parse_datetime(metadata.get("awaiting_feedback_since"))
+        batch.append(log)
+        if len(batch) >= 1000:
+            ReviewLog.objects.bulk_update(
+                batch, ["due_at", "available_since", "submitted_at", "awaiting_feedback_since"]
+            )
+            batch = []
+    if batch:
+        ReviewLog.objects.bulk_update(batch, ["due_at", "available_since", "submitted_at", "awaiting_feedback_since"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("performance", "0014_reviewlog_pending_expiry_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reviewlog",
+            name="due_at",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="reviewlog",
+            name="available_since",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="reviewlog",
+            name="submitted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="reviewlog",
+            name="awaiting_feedback_since",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_timing_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="reviewlog",
+            index=models.Index(fields=["status", "due_at"], name="perf_revlog_status_due_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="reviewlog",
+            index=models.Index(fields=["available_since"], name="perf_revlog_available_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="reviewlog",
+            index=models.Index(fields=["submitted_at"], name="perf_revlog_submitted_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="reviewlog",
+            index=models.Index(
+                condition=models.Q(("status", "awaiting_feedback")),
+                fields=["awaiting_feedback_since"],
+                name="perf_revlog_awaiting_idx",
+            ),
+        ),
+    ]
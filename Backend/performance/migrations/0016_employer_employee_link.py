@@ -0,0 +1,35 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def link_employers_to_employees(apps, schema_editor):
+    Employer = apps.get_model("performance", "Employer")
+    Employee = apps.get_model("api", "Employee")
+
+    Employer.objects.filter(user__isnull=False).update(
+        employee_id=Subquery(Employee.objects.filter(user_id=OuterRef("user_id")).values("id")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_department_team_closure"),
+        ("performance", "0015_reviewlog_timing_columns"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employer",
+            name="employee",
+            field=models.OneToOneField(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="employer",
+                to="api.employee",
+            ),
+        ),
+        migrations.RunPython(link_employers_to_employees, migrations.RunPython.noop),
+    ]
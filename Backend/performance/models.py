@@ -30,6 +30,13 @@ class Employer(TimeStampedModel):
         blank=True,
         related_name="employer_profile",
     )
+    employee = models.OneToOneField(
+        "api.Employee",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="employer",
+    )
     fio = models.CharField(max_length=255)
     birthday = models.DateField(null=True, blank=True)
     email = models.EmailField(unique=True)
@@ -183,11 +190,28 @@ class ReviewLog(TimeStampedModel):
     )
     email_sent = models.BooleanField(default=False)
     metadata = models.JSONField(default=dict, blank=True)
+    due_at = models.DateField(null=True, blank=True)
+    available_since = models.DateField(null=True, blank=True)
+    submitted_at = models.DateTimeField(null=True, blank=True)
+    awaiting_feedback_since = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         indexes = [
             models.Index(fields=["context", "status"], name="perf_revlog_ctx_status_idx"),
+            models.Index(fields=["status", "due_at"], name="perf_revlog_status_due_idx"),
+            models.Index(fields=["available_since"], name="perf_revlog_available_idx"),
+            models.Index(fields=["submitted_at"], name="perf_revlog_submitted_idx"),
+            models.Index(
+                fields=["awaiting_feedback_since"],
+                name="perf_revlog_awaiting_idx",
+                condition=models.Q(status="awaiting_feedback"),
+            ),
             models.Index(fields=["token"], name="perf_revlog_token_idx"),
+            models.Index(
+                fields=["expires_at"],
+                name="perf_revlog_pending_exp_idx",
+                condition=models.Q(status__in=["pending", "pending_email"]),
+            ),
         ]
 
     def mark_expired(self) -> None:
@@ -276,6 +300,10 @@ class ReviewTask(TimeStampedModel):
     end_date = models.DateField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="active")
     priority = models.PositiveIntegerField(default=0)
+    outstanding_reviews = models.PositiveIntegerField(
+        default=0,
+        help_text="Respondents who have not submitted the current task review yet",
+    )
 
     class Meta:
         ordering = ["-end_date", "title"]
@@ -311,6 +339,9 @@ class ReviewSchedule(TimeStampedModel):
 
     class Meta:
         ordering = ["review_start"]
+        indexes = [
+            models.Index(fields=["status", "review_start"], name="perf_sched_status_start_idx"),
+        ]
 
 
 class TaskReviewAnswer(TimeStampedModel):
@@ -403,3 +434,101 @@ class SkillReviewFeedback(TimeStampedModel):
     def mark_shared(self) -> None:
         self.shared_at = timezone.now()
         self.save(update_fields=["shared_at", "updated_at"])
+
+
+class ScheduledJobState(TimeStampedModel):
+
+    name = models.CharField(max_length=100, unique=True)
+    next_run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_started_at = models.DateTimeField(null=True, blank=True)
+    last_finished_at = models.DateTimeField(null=True, blank=True)
+    last_status = models.CharField(max_length=20, blank=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class ScheduledJobRun(TimeStampedModel):
+
+    STATUS_SUCCESS = "success"
+    STATUS_FAILED = "failed"
+
+    job_name = models.CharField(max_length=100)
+    worker = models.CharField(max_length=255, blank=True)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    duration_ms = models.PositiveIntegerField(default=0)
+    status = models.CharField(
+        max_length=20,
+        choices=((STATUS_SUCCESS, "Success"), (STATUS_FAILED, "Failed")),
+    )
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["job_name", "started_at"], name="perf_job_run_name_idx"),
+        ]
+
+
+class BackgroundJob(TimeStampedModel):
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="background_jobs",
+    )
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["run_after"],
+                name="perf_bg_job_queued_idx",
+                condition=models.Q(status="queued"),
+            ),
+            models.Index(
+                fields=["locked_until"],
+                name="perf_bg_job_running_idx",
+                condition=models.Q(status="running"),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} [{self.status}]"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in {self.STATUS_SUCCEEDED, self.STATUS_FAILED}
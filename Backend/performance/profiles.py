@@ -0,0 +1,118 @@
+"""Request-scoped identity map for ``Employer`` and ``Employee`` profiles.
+
+A single request touches the same people many times: the view resolves the
+caller's profiles, the services resolve departments, managers and teams for
+the target employer. ``ProfileMap`` loads each profile at most once (with the
+department and team already joined) and hands the same instance back on
+every later lookup. ``ProfileMapMiddleware`` opens a fresh map per request;
+outside a request ``current_profiles()`` returns a throwaway map, so nothing
+is cached between jobs or commands.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Dict, Iterator, Optional
+
+from .models import Employer
+
+if TYPE_CHECKING:
+    from api.models import Employee
+
+_current_map: ContextVar[Optional["ProfileMap"]] = ContextVar("performance_profile_map", default=None)
+
+_MISSING = object()
+
+
+class ProfileMap:
+
+    def __init__(self) -> None:
+        self._employers_by_user: Dict[int, Optional[Employer]] = {}
+        self._employees_by_user: Dict[int, Optional["Employee"]] = {}
+        self._employees_by_employer: Dict[int, Optional["Employee"]] = {}
+
+    @staticmethod
+    def _employee_queryset():
+        from api.models import Employee
+
+        return Employee.objects.select_related("user", "department", "team")
+
+    def employer_for_user(self, user) -> Optional[Employer]:
+        if user is None or not getattr(user, "is_authenticated", False):
+            return None
+        employer = self._employers_by_user.get(user.pk, _MISSING)
+        if employer is _MISSING:
+            employer = (
+                Employer.objects.select_related("employee__user", "employee__department", "employee__team")
+                .filter(user_id=user.pk)
+                .first()
+            )
+            self.remember(employer=employer, user_id=user.pk)
+        return employer
+
+    def employee_for_user(self, user) -> Optional["Employee"]:
+        if user is None or not getattr(user, "is_authenticated", False):
+            return None
+        employee = self._employees_by_user.get(user.pk, _MISSING)
+        if employee is _MISSING:
+            employer = self.employer_for_user(user)
+            if employer is not None and employer.employee_id:
+                employee = self.employee_for_employer(employer)
+            else:
+                employee = self._employee_queryset().filter(user_id=user.pk).first()
+            self._employees_by_user[user.pk] = employee
+        return employee
+
+    def employee_for_employer(self, employer: Employer) -> Optional["Employee"]:
+        employee = self._employees_by_employer.get(employer.pk, _MISSING)
+        if employee is not _MISSING:
+            return employee
+
+        if employer.employee_id and Employer.employee.is_cached(employer):
+            employee = employer.employee
+        elif employer.employee_id:
+            employee = self._employee_queryset().filter(pk=employer.employee_id).first()
+        elif employer.user_id:
+            # Rows that were never synced (e.g. admin placeholders) still match by user.
+            employee = self._employee_queryset().filter(user_id=employer.user_id).first()
+        else:
+            employee = None
+        self._employees_by_employer[employer.pk] = employee
+        return employee
+
+    def remember(self, *, employer: Optional[Employer] = None, employee: Optional["Employee"] = None, user_id=None) -> None:
+        """Register profiles loaded elsewhere so that later lookups reuse them."""
+        if employer is not None:
+            user_id = user_id or employer.user_id
+            if employee is None and employer.employee_id and Employer.employee.is_cached(employer):
+                employee = employer.employee
+            if employee is not None:
+                self._employees_by_employer[employer.pk] = employee
+        if employee is not None and employee.user_id:
+            self._employees_by_user[employee.user_id] = employee
+        if user_id is not None and (employer is not None or user_id not in self._employers_by_user):
+            self._employers_by_user[user_id] = employer
+
+
+def current_profiles() -> ProfileMap:
+    return _current_map.get() or ProfileMap()
+
+
+@contextmanager
+def profile_scope() -> Iterator[ProfileMap]:
+    profiles = ProfileMap()
+    token = _current_map.set(profiles)
+    try:
+        yield profiles
+    finally:
+        _current_map.reset(token)
+
+
+class ProfileMapMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with profile_scope():
+            return self.get_response(request)
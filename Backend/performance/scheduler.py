@@ -0,0 +1,211 @@
+"""Periodic jobs run by the ``run_scheduler`` management command.
+
+Every job has a row in ``ScheduledJobState``. A process acquires the job by
+atomically moving ``locked_until`` into the future, so several scheduler
+containers can run side by side and each due job still runs once. While the
+job runs, ``LeaseHeartbeat`` keeps pushing the lease forward, so a long run is
+not taken over by another process; a crashed run stops renewing and releases
+its lock when the lease expires. Every run is recorded in ``ScheduledJobRun``
+with its duration and result.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.db import IntegrityError, connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ScheduledJobRun, ScheduledJobState
+
+SCHEDULER_HISTORY_DAYS = 30
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ScheduledJob:
+    name: str
+    interval: timedelta
+    run: Callable[[], Dict]
+    lease: timedelta = timedelta(minutes=30)
+
+
+def _generate_skill_review_cycles() -> Dict:
+    from .services import generate_skill_review_cycles
+
+    return generate_skill_review_cycles(timezone.now().date())
+
+
+def _process_review_schedules() -> Dict:
+    from .services import process_review_schedules
+
+    summary = process_review_schedules(timezone.now().date())
+    return {
+        "started": summary["started"],
+        "closed": summary["closed"],
+        "batches": summary["batches"],
+        "tasks": len(summary["tasks"]),
+    }
+
+
+def _expire_review_logs() -> Dict:
+    from .services import expire_stale_review_logs
+
+    return expire_stale_review_logs()
+
+
+def _refresh_nine_box_snapshot() -> Dict:
+    from api.services.nine_box import generate_scheduled_snapshot
+
+    snapshot = generate_scheduled_snapshot(ttl_minutes=60)
+    return {"snapshot_id": str(snapshot.id), "employees": len(snapshot.matrix)}
+
+
+def _prune_nine_box_snapshots() -> Dict:
+    from api.services.nine_box import prune_snapshots
+
+    return prune_snapshots()
+
+
+def _prune_job_history() -> Dict:
+    from .jobs import prune_finished_jobs
+
+    cutoff = timezone.now() - timedelta(days=SCHEDULER_HISTORY_DAYS)
+    deleted, _ = ScheduledJobRun.objects.filter(started_at__lt=cutoff).delete()
+    return {"deleted": deleted, "background_jobs_deleted": prune_finished_jobs()}
+
+
+JOBS: tuple = (
+    ScheduledJob("generate_skill_review_cycles", timedelta(hours=24), _generate_skill_review_cycles, timedelta(hours=2)),
+    ScheduledJob("process_review_schedules", timedelta(minutes=15), _process_review_schedules),
+    ScheduledJob("expire_review_logs", timedelta(hours=1), _expire_review_logs),
+    ScheduledJob("refresh_nine_box_snapshot", timedelta(minutes=30), _refresh_nine_box_snapshot),
+    ScheduledJob("prune_nine_box_snapshots", timedelta(hours=24), _prune_nine_box_snapshots),
+    ScheduledJob("prune_job_history", timedelta(hours=24), _prune_job_history),
+)
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaseHeartbeat:
+    """Renew a lease from a background thread while the owner is working.
+
+    ``renew`` returns ``False`` when the lease no longer belongs to the owner;
+    the heartbeat then stops and ``lost`` is set.
+    """
+
+    def __init__(self, renew: Callable[[], bool], lease: timedelta) -> None:
+        self.lost = False
+        self._renew = renew
+        self._interval = max(lease.total_seconds() / 3, 0.05)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            while not self._stopped.wait(self._interval):
+                if not self._renew():
+                    self.lost = True
+                    return
+        except Exception:  # noqa: BLE001 - the owner finds out from ``lost``
+            logger.exception("Lease renewal failed")
+            self.lost = True
+        finally:
+            connection.close()
+
+
+def _ensure_states(jobs: Iterable[ScheduledJob]) -> None:
+    existing = set(ScheduledJobState.objects.values_list("name", flat=True))
+    missing = [ScheduledJobState(name=job.name) for job in jobs if job.name not in existing]
+    if missing:
+        ScheduledJobState.objects.bulk_create(missing, ignore_conflicts=True)
+
+
+def _acquire(job: ScheduledJob, worker: str, now) -> bool:
+    return bool(
+        ScheduledJobState.objects.filter(name=job.name, next_run_at__lte=now)
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lte=now))
+        .update(locked_by=worker, locked_until=now + job.lease, last_started_at=now, updated_at=now)
+    )
+
+
+def run_job(job: ScheduledJob, worker: str) -> ScheduledJobRun:
+    started_at = timezone.now()
+    monotonic_start = time.monotonic()
+    status = ScheduledJobRun.STATUS_SUCCESS
+    result: Dict = {}
+    error = ""
+
+    def renew() -> bool:
+        return bool(
+            ScheduledJobState.objects.filter(name=job.name, locked_by=worker).update(
+                locked_until=timezone.now() + job.lease
+            )
+        )
+
+    with LeaseHeartbeat(renew, job.lease):
+        try:
+            result = job.run() or {}
+        except Exception:  # noqa: BLE001 - a failing job must not stop the scheduler
+            status = ScheduledJobRun.STATUS_FAILED
+            error = traceback.format_exc()
+
+    finished_at = timezone.now()
+    released = ScheduledJobState.objects.filter(name=job.name, locked_by=worker).update(
+        next_run_at=started_at + job.interval,
+        locked_by="",
+        locked_until=None,
+        last_finished_at=finished_at,
+        last_status=status,
+        updated_at=finished_at,
+    )
+    if not released:
+        logger.error("Scheduled job %s lost its lock while running on %s", job.name, worker)
+        status = ScheduledJobRun.STATUS_FAILED
+        error = f"{error}\nLock was taken over by another scheduler; the job state was not updated.".strip()
+
+    return ScheduledJobRun.objects.create(
+        job_name=job.name,
+        worker=worker,
+        started_at=started_at,
+        finished_at=finished_at,
+        duration_ms=int((time.monotonic() - monotonic_start) * 1000),
+        status=status,
+        result=result,
+        error=error,
+    )
+
+
+def run_due_jobs(jobs: Iterable[ScheduledJob] = JOBS, *, worker: Optional[str] = None) -> List[ScheduledJobRun]:
+    """Run every job that is due and not held by another scheduler process."""
+    jobs = list(jobs)
+    worker = worker or worker_name()
+    try:
+        _ensure_states(jobs)
+    except IntegrityError:
+        pass
+
+    runs = []
+    for job in jobs:
+        if _acquire(job, worker, timezone.now()):
+            runs.append(run_job(job, worker))
+    return runs
@@ -3,7 +3,7 @@ from datetime import date
 
 from rest_framework import serializers
 
-from .models import Employer, ReviewGoal, ReviewTask, SiteNotification, SkillQuestion
+from .models import BackgroundJob, Employer, ReviewGoal, ReviewTask, SiteNotification, SkillQuestion
 
 
 class ReviewCycleTriggerSerializer(serializers.Serializer):
@@ -113,6 +113,32 @@ class NotificationSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class BackgroundJobSerializer(serializers.ModelSerializer):
+    error = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BackgroundJob
+        fields = [
+            "id",
+            "name",
+            "status",
+            "attempts",
+            "max_attempts",
+            "run_after",
+            "started_at",
+            "finished_at",
+            "result",
+            "error",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+    def get_error(self, obj):
+        # Only the exception line is returned; the traceback stays in the admin.
+        lines = [line for line in (obj.error or "").strip().splitlines() if line.strip()]
+        return lines[-1] if lines else ""
+
+
 class SkillReviewFeedbackSubmitSerializer(serializers.Serializer):
     log_id = serializers.IntegerField()
     message = serializers.CharField(min_length=3, max_length=5000)
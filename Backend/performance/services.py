@@ -6,9 +6,11 @@ from collections import defaultdict
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
+import uuid
 
 from django.db import transaction
-from django.db.models import Avg, Q
+from django.db.models import Avg, Case, F, Q, Value, When
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
 from .models import (
@@ -28,6 +30,7 @@ from .models import (
     TeamRelation,
     default_token_expiry,
 )
+from .profiles import current_profiles
 
 DEFAULT_SKILL_PERIODS: Tuple[Tuple[int, str], ...] = (
     (0, "Старт"),
@@ -40,6 +43,8 @@ DEFAULT_SKILL_PERIODS: Tuple[Tuple[int, str], ...] = (
 
 SKILL_REVIEW_MISS_GRACE_DAYS = 14
 
+REVIEW_SCHEDULE_BATCH_SIZE = 100
+
 if TYPE_CHECKING:
     from api.models import Employee
 
@@ -309,23 +314,12 @@ def _activation_start_date(employer: Employer) -> Optional[date]:
 def _period_due_date(
     employer: Employer,
     period: Optional[ReviewPeriod],
-    metadata: Optional[Dict],
+    due_at: Optional[date],
 ) -> date:
 
     today = timezone.now().date()
-    metadata = metadata or {}
-
-    due_at_value = metadata.get("due_at") or metadata.get("due_date")
-    if isinstance(due_at_value, date):
-        return due_at_value
-    if isinstance(due_at_value, str):
-        try:
-            return date.fromisoformat(due_at_value)
-        except ValueError:
-            try:
-                return datetime.fromisoformat(due_at_value).date()
-            except ValueError:
-                pass
+    if due_at is not None:
+        return due_at
 
     base_date = _activation_start_date(employer)
     if period is None or base_date is None:
@@ -399,6 +393,8 @@ def _create_review_log(
     period: ReviewPeriod,
     context: str,
     metadata: Optional[Dict] = None,
+    due_at: Optional[date] = None,
+    available_since: Optional[date] = None,
 ) -> Tuple[ReviewLog, bool]:
     existing_log = ReviewLog.objects.filter(
         employer=employer,
@@ -415,7 +411,14 @@ def _create_review_log(
             merged.update(metadata)
             existing_log.metadata = merged
         existing_log.status = ReviewLog.STATUS_PENDING
-        existing_log.save(update_fields=["expires_at", "metadata", "status", "updated_at"])
+        update_fields = ["expires_at", "metadata", "status", "updated_at"]
+        if due_at is not None:
+            existing_log.due_at = due_at
+            update_fields.append("due_at")
+        if available_since is not None:
+            existing_log.available_since = available_since
+            update_fields.append("available_since")
+        existing_log.save(update_fields=update_fields)
         created_notification = _ensure_notification_for_log(existing_log)
         return existing_log, created_notification
 
@@ -425,6 +428,8 @@ def _create_review_log(
         period=period,
         context=context,
         metadata=metadata or {},
+        due_at=due_at,
+        available_since=available_since,
         status=ReviewLog.STATUS_PENDING_EMAIL,
     )
     created_notification = _ensure_notification_for_log(new_log)
@@ -444,6 +449,8 @@ def _ensure_notification_for_log(log: ReviewLog) -> bool:
     base_metadata.setdefault("respondent_id", log.respondent_id)
     if log.period_id:
         base_metadata.setdefault("period_id", log.period_id)
+    if log.due_at:
+        base_metadata.setdefault("due_at", log.due_at.isoformat())
     base_metadata["token"] = str(log.token)
 
     notification, created = SiteNotification.objects.update_or_create(
@@ -592,21 +599,13 @@ def ensure_initial_self_review(employer: Employer) -> Optional[ReviewLog]:
     )
 
     if existing_log and existing_log.status in [ReviewLog.STATUS_PENDING, ReviewLog.STATUS_PENDING_EMAIL]:
-        try:
-            available_since = (existing_log.metadata or {}).get("available_since")
-            if available_since:
-                available_since_date = datetime.fromisoformat(available_since).date()
-            else:
-                available_since_date = base_date
-        except Exception:
-            available_since_date = base_date
+        available_since_date = existing_log.available_since or base_date
         extend_until = available_since_date + timedelta(days=SKILL_REVIEW_MISS_GRACE_DAYS + 1)
         desired_expiry = timezone.now() + timedelta(days=max((extend_until - timezone.now().date()).days, 1))
         if desired_expiry > existing_log.expires_at:
             existing_log.expires_at = desired_expiry
-        meta = {**(existing_log.metadata or {}), "available_since": available_since_date.isoformat()}
-        existing_log.metadata = meta
-        existing_log.save(update_fields=["expires_at", "metadata", "updated_at"])
+        existing_log.available_since = available_since_date
+        existing_log.save(update_fields=["expires_at", "available_since", "updated_at"])
         _ensure_notification_for_log(existing_log)
         return existing_log
 
@@ -634,9 +633,9 @@ def ensure_initial_self_review(employer: Employer) -> Optional[ReviewLog]:
         metadata={
             "review_type": "self",
             "trigger": "first_login",
-            "due_at": base_date.isoformat(),
-            "available_since": base_date.isoformat(),
         },
+        due_at=base_date,
+        available_since=base_date,
     )
     window_days = SKILL_REVIEW_MISS_GRACE_DAYS + 1
     review_log.expires_at = timezone.now() + timedelta(days=window_days)
@@ -686,8 +685,8 @@ def generate_skill_review_cycles(current_date: date) -> Dict[str, int]:
                     metadata={
                         "review_type": "self",
                         "trigger": "activation_day",
-                        "due_at": base_date.isoformat(),
                     },
+                    due_at=base_date,
                 )
                 if notification_created:
                     result.notifications_created += 1
@@ -721,8 +720,8 @@ def generate_skill_review_cycles(current_date: date) -> Dict[str, int]:
                         metadata={
                             "review_type": "peer",
                             "period": period.month_period,
-                            "due_at": due_at.isoformat(),
                         },
+                        due_at=due_at,
                     )
                     if notification_created:
                         result.notifications_created += 1
@@ -730,6 +729,104 @@ def generate_skill_review_cycles(current_date: date) -> Dict[str, int]:
     return result.as_dict()
 
 
+REVIEW_LOG_EXPIRY_BATCH_SIZE = 500
+
+
+def _expire_review_logs(log_ids: List[int], now: datetime) -> Dict[str, int]:
+    """Expire the given log rows that are still pending and clean up after them.
+
+    The pending rows are locked and re-read first, so a log that another
+    request or sweep already expired is skipped and counted only once. Unread
+    notifications pointing at the dead links are dropped, and task reviews stop
+    waiting for the expired respondents: ``outstanding_reviews`` is decreased
+    and tasks that reach zero are completed, as on submit.
+    """
+    summary = {"expired": 0, "notifications_removed": 0, "tasks_completed": 0}
+    if not log_ids:
+        return summary
+
+    with transaction.atomic():
+        logs = list(
+            ReviewLog.objects.select_for_update()
+            .filter(id__in=log_ids, status__in=[ReviewLog.STATUS_PENDING, ReviewLog.STATUS_PENDING_EMAIL])
+            .values_list("id", "context", "metadata")
+        )
+        if not logs:
+            return summary
+        expired_ids = [log_id for log_id, _, _ in logs]
+        summary["expired"] = ReviewLog.objects.filter(id__in=expired_ids).update(
+            status=ReviewLog.STATUS_EXPIRED,
+            updated_at=now,
+        )
+        summary["notifications_removed"], _ = SiteNotification.objects.filter(
+            related_log_id__in=expired_ids,
+            is_read=False,
+        ).delete()
+
+        expired_by_task: Dict[str, int] = defaultdict(int)
+        for _, context, metadata in logs:
+            task_id = (metadata or {}).get("task_id")
+            if context == ReviewLog.CONTEXT_TASK and task_id:
+                expired_by_task[str(task_id)] += 1
+        if expired_by_task:
+            output_field = ReviewTask._meta.get_field("outstanding_reviews")
+            ReviewTask.objects.filter(id__in=list(expired_by_task), status="review").update(
+                outstanding_reviews=Greatest(
+                    F("outstanding_reviews") - Case(
+                        *[When(id=task_id, then=Value(count)) for task_id, count in expired_by_task.items()],
+                        default=Value(0),
+                        output_field=output_field,
+                    ),
+                    Value(0),
+                    output_field=output_field,
+                ),
+                updated_at=now,
+            )
+            finished = ReviewTask.objects.filter(id__in=list(expired_by_task), status="review", outstanding_reviews=0)
+            finished_ids = list(finished.values_list("id", flat=True))
+            if finished_ids:
+                summary["tasks_completed"] = ReviewTask.objects.filter(id__in=finished_ids).update(
+                    status="completed",
+                    updated_at=now,
+                )
+                ReviewSchedule.objects.filter(related_task_id__in=finished_ids).update(status="completed", updated_at=now)
+    return summary
+
+
+def expire_stale_review_logs(
+    now: Optional[datetime] = None,
+    *,
+    batch_size: int = REVIEW_LOG_EXPIRY_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+) -> Dict[str, int]:
+    """Expire every pending review log whose link is past ``expires_at``.
+
+    Logs are claimed in chunks with ``SELECT ... FOR UPDATE SKIP LOCKED`` (served
+    by the partial ``expires_at`` index on pending rows), one transaction per
+    chunk, so the sweep never holds long locks and can run next to requests that
+    expire a single token lazily.
+    """
+    now = now or timezone.now()
+    summary = {"expired": 0, "notifications_removed": 0, "tasks_completed": 0, "batches": 0}
+    while max_batches is None or summary["batches"] < max_batches:
+        with transaction.atomic():
+            log_ids = list(
+                ReviewLog.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status__in=[ReviewLog.STATUS_PENDING, ReviewLog.STATUS_PENDING_EMAIL],
+                    expires_at__lte=now,
+                )
+                .order_by("expires_at")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not log_ids:
+                break
+            for key, value in _expire_review_logs(log_ids, now).items():
+                summary[key] += value
+            summary["batches"] += 1
+    return summary
+
+
 def _validate_log_token(token: str) -> ReviewLog:
     try:
         review_log = ReviewLog.objects.select_related("employer", "respondent", "period").get(token=token)
@@ -740,8 +837,8 @@ def _validate_log_token(token: str) -> ReviewLog:
         raise ServiceError("Review already submitted", code="already_submitted", status=409)
 
     if timezone.now() >= review_log.expires_at:
-        review_log.status = ReviewLog.STATUS_EXPIRED
-        review_log.save(update_fields=["status", "updated_at"])
+        if review_log.status != ReviewLog.STATUS_EXPIRED:
+            _expire_review_logs([review_log.id], timezone.now())
         raise ServiceError("Link expired", code="link_expired", status=410)
 
     return review_log
@@ -918,13 +1015,15 @@ def submit_skill_answers(token: str, answers: List[Dict], *, partial: bool = Fal
         answer.save(update_fields=["grade", "question_type", "answer_value", "is_correct", "updated_at"])
         updated += 1
 
-    now_iso = timezone.now().isoformat()
+    submitted_now = timezone.now()
+    now_iso = submitted_now.isoformat()
     metadata = {**(review_log.metadata or {})}
 
     if not partial:
-        metadata.update({"submitted_at": now_iso})
+        review_log.submitted_at = submitted_now
         if review_log.context == ReviewLog.CONTEXT_SKILL and review_log.employer_id == review_log.respondent_id:
-            metadata.setdefault("awaiting_feedback_since", now_iso)
+            if review_log.awaiting_feedback_since is None:
+                review_log.awaiting_feedback_since = submitted_now
             review_log.status = ReviewLog.STATUS_AWAITING_FEEDBACK
         else:
             review_log.status = ReviewLog.STATUS_COMPLETED
@@ -933,7 +1032,7 @@ def submit_skill_answers(token: str, answers: List[Dict], *, partial: bool = Fal
         review_log.status = ReviewLog.STATUS_PENDING
 
     review_log.metadata = metadata
-    review_log.save(update_fields=["status", "metadata", "updated_at"])
+    review_log.save(update_fields=["status", "metadata", "submitted_at", "awaiting_feedback_since", "updated_at"])
 
     if not partial:
         now = timezone.now()
@@ -1273,78 +1372,380 @@ def create_goal_with_tasks(
     }
 
 
-@transaction.atomic
 def trigger_task_reviews(current_date: date, task: Optional[ReviewTask] = None) -> List[Dict]:
-    if task:
-        tasks = [task]
-    else:
-        tasks = list(
-            ReviewTask.objects.filter(
-                end_date__lte=current_date,
-                status="active",
-            ).select_related("goal", "goal__employer")
-        )
+    if task is None:
+        return process_review_schedules(current_date)["tasks"]
 
-    if not tasks:
-        return []
+    with transaction.atomic():
+        results = _start_task_reviews([task], current_date)
+        if results:
+            ReviewSchedule.objects.filter(related_task=task, status="pending").update(
+                status="in_progress",
+                updated_at=timezone.now(),
+            )
+        return results
 
-    results = []
-    questions = list(
-        ReviewQuestion.objects.filter(context=ReviewLog.CONTEXT_TASK, is_active=True).order_by("category")
+
+def _task_review_question_ids() -> List:
+    return list(
+        ReviewQuestion.objects.filter(context=ReviewLog.CONTEXT_TASK, is_active=True)
+        .order_by("category")
+        .values_list("id", flat=True)
     )
 
-    if not questions:
+
+def process_review_schedules(
+    current_date: date,
+    *,
+    batch_size: int = REVIEW_SCHEDULE_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+) -> Dict:
+    """Drain due ``ReviewSchedule`` rows: pending -> in_progress -> completed.
+
+    Rows are claimed in batches with ``SELECT ... FOR UPDATE SKIP LOCKED``, each
+    batch in its own transaction, so several processes can run this at once
+    without picking up the same schedule twice. Pending task schedules whose
+    ``review_start`` has come start the task review; in-progress schedules whose
+    ``review_end`` has passed are closed. Starting and closing each get up to
+    ``max_batches`` batches, so a long start backlog does not hold up closing.
+    Reviews only start while there are active task questions; closing does not
+    depend on them.
+    """
+    summary: Dict = {"started": 0, "closed": 0, "batches": 0, "tasks": []}
+
+    def _claim(**filters) -> List[ReviewSchedule]:
+        return list(
+            ReviewSchedule.objects.select_for_update(skip_locked=True)
+            .filter(context=ReviewLog.CONTEXT_TASK, **filters)
+            .order_by("review_start")[:batch_size]
+        )
+
+    start_batches = 0
+    can_start = bool(_task_review_question_ids())
+    while can_start and (max_batches is None or start_batches < max_batches):
+        with transaction.atomic():
+            schedules = _claim(status="pending", review_start__lte=current_date)
+            if not schedules:
+                break
+            schedule_ids = [schedule.id for schedule in schedules]
+            tasks = list(
+                ReviewTask.objects.filter(
+                    id__in={schedule.related_task_id for schedule in schedules},
+                    status="active",
+                ).select_related("goal", "goal__employer")
+            )
+            started = _start_task_reviews(tasks, current_date) if tasks else []
+            summary["tasks"].extend(started)
+
+            # Only the claimed rows move; other schedules of the same tasks keep their status.
+            now = timezone.now()
+            claimed = ReviewSchedule.objects.filter(id__in=schedule_ids, status="pending")
+            summary["started"] += claimed.filter(
+                related_task_id__in=[item["task_id"] for item in started]
+            ).update(status="in_progress", updated_at=now)
+            claimed.filter(related_task__status="review").update(status="in_progress", updated_at=now)
+            claimed.update(status="completed", updated_at=now)
+            start_batches += 1
+
+    close_batches = 0
+    while max_batches is None or close_batches < max_batches:
+        with transaction.atomic():
+            schedules = _claim(status="in_progress", review_end__lt=current_date)
+            if not schedules:
+                break
+            summary["closed"] += ReviewSchedule.objects.filter(
+                id__in=[schedule.id for schedule in schedules]
+            ).update(status="completed", updated_at=timezone.now())
+            close_batches += 1
+
+    summary["batches"] = start_batches + close_batches
+
+    return summary
+
+
+def _start_task_reviews(tasks: List[ReviewTask], current_date: date) -> List[Dict]:
+    question_ids = _task_review_question_ids()
+
+    if not question_ids:
         return []
 
-    active_employers = list(_active_employers(current_date))
+    employers = {task_obj.goal.employer_id: task_obj.goal.employer for task_obj in tasks}
+    respondents_by_employer = _task_respondent_ids(list(employers.values()), current_date)
 
+    pairs: List[Tuple[ReviewTask, int]] = []
     for task_obj in tasks:
-        employer = task_obj.goal.employer
-        respondents = _task_respondents(employer, active_employers)
-        respondents.add(employer)
+        employer_id = task_obj.goal.employer_id
+        for respondent_id in sorted(respondents_by_employer[employer_id] | {employer_id}):
+            pairs.append((task_obj, respondent_id))
+
+    TaskReviewAnswer.objects.bulk_create(
+        [
+            TaskReviewAnswer(
+                task=task_obj,
+                employer_id=task_obj.goal.employer_id,
+                respondent_id=respondent_id,
+                question_id=question_id,
+                grade=0,
+            )
+            for task_obj, respondent_id in pairs
+            for question_id in question_ids
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
 
-        notifications_for_task = 0
+    notifications_by_task = _ensure_task_review_logs(pairs)
 
-        for respondent in respondents:
-            for question in questions:
-                TaskReviewAnswer.objects.get_or_create(
-                    task=task_obj,
-                    employer=employer,
-                    respondent=respondent,
-                    question=question,
-                    defaults={"grade": 0},
-                )
-            _, created_notification = _create_review_log(
-                employer=employer,
-                respondent=respondent,
-                period=None,
-                context=ReviewLog.CONTEXT_TASK,
-                metadata={"task_id": str(task_obj.id), "task_title": task_obj.title},
-            )
-            if created_notification:
-                notifications_for_task += 1
+    now = timezone.now()
+    task_ids = [task_obj.id for task_obj in tasks]
+    outstanding = {
+        task_obj.id: len(respondents_by_employer[task_obj.goal.employer_id] | {task_obj.goal.employer_id})
+        for task_obj in tasks
+    }
+    ReviewTask.objects.filter(id__in=task_ids).update(
+        status="review",
+        outstanding_reviews=Case(
+            *[When(id=task_id, then=Value(count)) for task_id, count in outstanding.items()],
+            output_field=ReviewTask._meta.get_field("outstanding_reviews"),
+        ),
+        updated_at=now,
+    )
 
+    results = []
+    for task_obj in tasks:
         task_obj.status = "review"
-        task_obj.save(update_fields=["status", "updated_at"])
-        ReviewSchedule.objects.filter(related_task=task_obj).update(status="in_progress")
+        task_obj.outstanding_reviews = outstanding[task_obj.id]
+        employer_id = task_obj.goal.employer_id
         results.append({
             "task_id": str(task_obj.id),
-            "respondents": [r.id for r in respondents],
-            "notifications_created": notifications_for_task,
+            "respondents": sorted(respondents_by_employer[employer_id] | {employer_id}),
+            "notifications_created": notifications_by_task.get(task_obj.id, 0),
         })
 
     return results
 
 
-def _task_respondents(employer: Employer, population: Iterable[Employer]) -> set:
-    explicit_relations = set(
-        TeamRelation.objects.filter(employer=employer).values_list("peer_id", flat=True)
+def _active_employers_queryset(as_of: date):
+    """Queryset counterpart of ``_active_employers``."""
+    return Employer.objects.filter(
+        Q(activation_date__lte=as_of) | Q(activation_date__isnull=True, date_of_employment__lte=as_of),
+    ).filter(Q(date_of_dismissal__isnull=True) | Q(date_of_dismissal__gt=as_of))
+
+
+def _task_respondent_ids(employers: List[Employer], as_of: date) -> Dict[int, set]:
+    """Respondents per employer: explicit ``TeamRelation`` peers, otherwise the org structure.
+
+    Without explicit relations the respondents are the active colleagues from the
+    same team (or department when the employee has no team) plus the managers
+    whose leadership scope covers the employee. The number of queries does not
+    depend on the number of employers: the structure is fetched for all of them
+    at once and matched in Python.
+    """
+    from api.models import DepartmentClosure, Employee, EmployeeRoleAssignment, TeamClosure
+
+    respondents: Dict[int, set] = {employer.id: set() for employer in employers}
+    for employer_id, peer_id in TeamRelation.objects.filter(
+        employer_id__in=respondents.keys()
+    ).values_list("employer_id", "peer_id"):
+        respondents[employer_id].add(peer_id)
+
+    implicit = [employer for employer in employers if not respondents[employer.id] and employer.user_id]
+    if not implicit:
+        return respondents
+
+    profiles = {
+        profile.user_id: profile
+        for profile in Employee.objects.select_related("department").filter(
+            user_id__in=[employer.user_id for employer in implicit]
+        )
+    }
+    if not profiles:
+        return respondents
+
+    department_ids = {profile.department_id for profile in profiles.values() if profile.department_id}
+    team_ids = {profile.team_id for profile in profiles.values() if profile.team_id}
+    department_ancestors: Dict[int, set] = defaultdict(set)
+    for ancestor_id, descendant_id in DepartmentClosure.objects.filter(
+        descendant_id__in=department_ids
+    ).values_list("ancestor_id", "descendant_id"):
+        department_ancestors[descendant_id].add(ancestor_id)
+    team_ancestors: Dict[int, set] = defaultdict(set)
+    for ancestor_id, descendant_id in TeamClosure.objects.filter(
+        descendant_id__in=team_ids
+    ).values_list("ancestor_id", "descendant_id"):
+        team_ancestors[descendant_id].add(ancestor_id)
+
+    # Same scopes as ``EmployeeRoleAssignmentQuerySet.covering_employee``, keyed by (role, scope id).
+    roles = EmployeeRoleAssignment.Role
+    leaders: Dict[Tuple[str, int], set] = defaultdict(set)
+    for leader_id, role, organization_id, department_id, team_id, position_id in (
+        EmployeeRoleAssignment.objects.active()
+        .leadership()
+        .filter(
+            Q(
+                role=roles.ORGANIZATION_LEAD,
+                organization_id__in={
+                    profile.department.organization_id for profile in profiles.values() if profile.department_id
+                },
+            )
+            | Q(role=roles.DEPARTMENT_HEAD, department_id__in=set().union(*department_ancestors.values()))
+            | Q(role=roles.TEAM_LEAD, team_id__in=set().union(*team_ancestors.values()))
+            | Q(
+                role=roles.POSITION_LEAD,
+                position_id__in={profile.position_id for profile in profiles.values() if profile.position_id},
+            )
+        )
+        .values_list("employee_id", "role", "organization_id", "department_id", "team_id", "position_id")
+    ):
+        scope_id = {
+            roles.ORGANIZATION_LEAD: organization_id,
+            roles.DEPARTMENT_HEAD: department_id,
+            roles.TEAM_LEAD: team_id,
+            roles.POSITION_LEAD: position_id,
+        }[role]
+        leaders[(role, scope_id)].add(leader_id)
+
+    related_by_profile: Dict[int, set] = {}
+    for profile in profiles.values():
+        managers = set(leaders[(roles.POSITION_LEAD, profile.position_id)]) if profile.position_id else set()
+        if profile.department_id:
+            managers |= leaders[(roles.ORGANIZATION_LEAD, profile.department.organization_id)]
+            for ancestor_id in department_ancestors[profile.department_id]:
+                managers |= leaders[(roles.DEPARTMENT_HEAD, ancestor_id)]
+        if profile.team_id:
+            for ancestor_id in team_ancestors[profile.team_id]:
+                managers |= leaders[(roles.TEAM_LEAD, ancestor_id)]
+        related_by_profile[profile.pk] = managers
+
+    teamless_department_ids = {
+        profile.department_id for profile in profiles.values() if not profile.team_id and profile.department_id
+    }
+    candidates = list(
+        Employee.objects.filter(
+            Q(team_id__in=team_ids)
+            | Q(department_id__in=teamless_department_ids)
+            | Q(pk__in=set().union(*related_by_profile.values()))
+        ).values_list("pk", "user_id", "team_id", "department_id")
+    )
+    for profile in profiles.values():
+        related = related_by_profile[profile.pk]
+        for pk, _, team_id, department_id in candidates:
+            if profile.team_id:
+                if team_id == profile.team_id:
+                    related.add(pk)
+            elif profile.department_id and department_id == profile.department_id:
+                related.add(pk)
+        related.discard(profile.pk)
+
+    user_ids = {pk: user_id for pk, user_id, _, _ in candidates if user_id}
+    employers_by_user: Dict[int, List[int]] = defaultdict(list)
+    for employer_id, user_id in _active_employers_queryset(as_of).filter(
+        user_id__in=set(user_ids.values())
+    ).values_list("id", "user_id"):
+        employers_by_user[user_id].append(employer_id)
+
+    for employer in implicit:
+        profile = profiles.get(employer.user_id)
+        if not profile:
+            continue
+        for pk in related_by_profile[profile.pk]:
+            respondents[employer.id].update(employers_by_user.get(user_ids.get(pk), ()))
+        respondents[employer.id].discard(employer.id)
+    return respondents
+
+
+def _ensure_task_review_logs(pairs: List[Tuple[ReviewTask, int]]) -> Dict:
+    """Reuse or create one pending task review log (and its notification) per task and respondent.
+
+    Returns the number of notifications created per task id.
+    """
+    if not pairs:
+        return {}
+
+    task_ids = {str(task_obj.id) for task_obj, _ in pairs}
+    open_logs = ReviewLog.objects.filter(
+        employer_id__in={task_obj.goal.employer_id for task_obj, _ in pairs},
+        period__isnull=True,
+        context=ReviewLog.CONTEXT_TASK,
+        status__in=[ReviewLog.STATUS_PENDING, ReviewLog.STATUS_PENDING_EMAIL],
+        metadata__task_id__in=task_ids,
     )
-    if explicit_relations:
-        respondents_qs = Employer.objects.filter(id__in=explicit_relations)
-    else:
-        respondents_qs = Employer.objects.filter(id__in=[item.id for item in population if item.id != employer.id])
-    return set(respondents_qs)
+    existing: Dict[Tuple[str, int], ReviewLog] = {}
+    for log in open_logs:
+        existing.setdefault(((log.metadata or {}).get("task_id"), log.respondent_id), log)
+
+    now = timezone.now()
+    expires_at = default_token_expiry()
+    for task_obj, respondent_id in pairs:
+        log = existing.get((str(task_obj.id), respondent_id))
+        if log is not None:
+            log.metadata = {**(log.metadata or {}), "task_id": str(task_obj.id), "task_title": task_obj.title}
+            log.status = ReviewLog.STATUS_PENDING
+            log.expires_at = expires_at
+            log.updated_at = now
+    ReviewLog.objects.bulk_update(
+        list(existing.values()),
+        ["metadata", "status", "expires_at", "updated_at"],
+        batch_size=1000,
+    )
+
+    new_logs = [
+        ReviewLog(
+            employer_id=task_obj.goal.employer_id,
+            respondent_id=respondent_id,
+            period=None,
+            context=ReviewLog.CONTEXT_TASK,
+            metadata={"task_id": str(task_obj.id), "task_title": task_obj.title},
+            status=ReviewLog.STATUS_PENDING_EMAIL,
+        )
+        for task_obj, respondent_id in pairs
+        if (str(task_obj.id), respondent_id) not in existing
+    ]
+    ReviewLog.objects.bulk_create(new_logs, batch_size=1000)
+
+    logs = list(existing.values()) + new_logs
+    notifications_by_log = {
+        notification.related_log_id: notification
+        for notification in SiteNotification.objects.filter(related_log__in=logs)
+    }
+
+    refreshed = []
+    created = []
+    created_per_task: Dict = defaultdict(int)
+    task_ids_by_key = {str(task_obj.id): task_obj.id for task_obj, _ in pairs}
+    for log in logs:
+        notification = notifications_by_log.get(log.pk)
+        if notification is None:
+            notification = SiteNotification(related_log=log, context=log.context)
+            created.append(notification)
+            created_per_task[task_ids_by_key[log.metadata["task_id"]]] += 1
+        else:
+            notification.is_read = False
+            notification.read_at = None
+            notification.updated_at = now
+            refreshed.append(notification)
+        # Same content as ``_ensure_notification_for_log`` writes for a single log.
+        title, message, base_path, extra_meta = _notification_content_for_log(log)
+        notification.recipient_id = log.respondent_id
+        notification.title = title
+        notification.message = message
+        notification.metadata = {
+            **log.metadata,
+            **extra_meta,
+            "employer_id": log.employer_id,
+            "respondent_id": log.respondent_id,
+            "token": str(log.token),
+            "notification_id": str(notification.id),
+        }
+        notification.link = _notification_link(log, str(notification.id), base_path)
+
+    SiteNotification.objects.bulk_update(
+        refreshed,
+        ["recipient", "title", "message", "metadata", "link", "is_read", "read_at", "updated_at"],
+        batch_size=1000,
+    )
+    SiteNotification.objects.bulk_create(created, batch_size=1000)
+    return dict(created_per_task)
 
 
 def fetch_task_form(token: str) -> Dict:
@@ -1419,47 +1820,69 @@ def submit_task_answers(token: str, answers: List[Dict]) -> Dict:
     if not isinstance(answers, list) or not answers:
         raise ServiceError("Answers payload is empty", code="empty_answers")
 
-    updated = 0
+    grades: Dict[uuid.UUID, int] = {}
     for row in answers:
         question_id = row.get("id_question") or row.get("id")
         grade = row.get("grade")
         if question_id is None:
             raise ServiceError("Question id is required", code="missing_question")
         try:
-            question = ReviewQuestion.objects.get(id=question_id, context=ReviewLog.CONTEXT_TASK)
-        except ReviewQuestion.DoesNotExist as exc:
+            question_uuid = uuid.UUID(str(question_id))
+        except ValueError as exc:
             raise ServiceError("Question not found", code="unknown_question") from exc
-
         if not isinstance(grade, int) or grade not in range(0, 11):
             raise ServiceError("Grade must be an integer between 0 and 10", code="invalid_grade")
+        grades[question_uuid] = grade
 
-        answer, _ = TaskReviewAnswer.objects.get_or_create(
-            task=task,
-            employer=review_log.employer,
-            respondent=review_log.respondent,
-            question=question,
-            defaults={"grade": 0},
-        )
-        answer.grade = grade
-        answer.save(update_fields=["grade", "updated_at"])
-        updated += 1
-
-    review_log.status = ReviewLog.STATUS_COMPLETED
-    review_log.metadata = {**(review_log.metadata or {}), "submitted_at": timezone.now().isoformat()}
-    review_log.save(update_fields=["status", "metadata", "updated_at"])
+    known_questions = set(
+        ReviewQuestion.objects.filter(id__in=grades.keys(), context=ReviewLog.CONTEXT_TASK).values_list("id", flat=True)
+    )
+    if known_questions != set(grades):
+        raise ServiceError("Question not found", code="unknown_question")
 
     now = timezone.now()
+    TaskReviewAnswer.objects.bulk_create(
+        [
+            TaskReviewAnswer(
+                task=task,
+                employer_id=review_log.employer_id,
+                respondent_id=review_log.respondent_id,
+                question_id=question_id,
+                grade=grade,
+                created_at=now,
+                updated_at=now,
+            )
+            for question_id, grade in grades.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["task", "employer", "respondent", "question"],
+        update_fields=["grade", "updated_at"],
+    )
+    updated = len(grades)
+
+    claimed = ReviewLog.objects.filter(pk=review_log.pk).exclude(
+        status__in=[ReviewLog.STATUS_COMPLETED, ReviewLog.STATUS_AWAITING_FEEDBACK]
+    ).update(
+        status=ReviewLog.STATUS_COMPLETED,
+        submitted_at=now,
+        updated_at=now,
+    )
+    if not claimed:
+        raise ServiceError("Review already submitted", code="already_submitted", status=409)
+
     SiteNotification.objects.filter(related_log=review_log).update(
         is_read=True,
         read_at=now,
         updated_at=now,
     )
 
-    remaining = TaskReviewAnswer.objects.filter(task=task, grade=0).exists()
+    ReviewTask.objects.filter(pk=task.pk, outstanding_reviews__gt=0).update(
+        outstanding_reviews=F("outstanding_reviews") - 1,
+    )
+    remaining = ReviewTask.objects.filter(pk=task.pk).values_list("outstanding_reviews", flat=True).get()
     if not remaining:
-        task.status = "completed"
-        task.save(update_fields=["status", "updated_at"])
-        ReviewSchedule.objects.filter(related_task=task).update(status="completed")
+        ReviewTask.objects.filter(pk=task.pk).exclude(status="completed").update(status="completed", updated_at=now)
+        ReviewSchedule.objects.filter(related_task=task).update(status="completed", updated_at=now)
 
     return {
         "status": "success",
@@ -1506,8 +1929,7 @@ def manager_skill_review_queue(manager: Employer) -> Dict:
     items: List[Dict] = []
 
     for log in logs:
-        metadata = log.metadata or {}
-        due_date = _period_due_date(log.employer, log.period, metadata)
+        due_date = _period_due_date(log.employer, log.period, log.due_at)
         status = "scheduled"
         days_overdue = max((today - due_date).days, 0) if today > due_date else 0
         overdue_threshold_passed = today > (due_date + timedelta(days=30))
@@ -1552,13 +1974,7 @@ def manager_skill_review_queue(manager: Employer) -> Dict:
 
         score = _self_score_for_period(log.employer, log.period) if log.period else None
 
-        submitted_iso = metadata.get("submitted_at")
-        submitted_at = None
-        if submitted_iso:
-            try:
-                submitted_at = datetime.fromisoformat(submitted_iso)
-            except ValueError:
-                submitted_at = None
+        submitted_at = log.submitted_at
 
         items.append(
             {
@@ -1581,14 +1997,14 @@ def manager_skill_review_queue(manager: Employer) -> Dict:
 
 def _synchronize_feedback_completion(log: ReviewLog, *, shared_at_iso: str) -> None:
     metadata = {**(log.metadata or {})}
-    metadata.pop("awaiting_feedback_since", None)
     metadata["feedback_shared_at"] = shared_at_iso
 
     if log.status != ReviewLog.STATUS_COMPLETED:
         log.status = ReviewLog.STATUS_COMPLETED
 
     log.metadata = metadata
-    log.save(update_fields=["status", "metadata", "updated_at"])
+    log.awaiting_feedback_since = None
+    log.save(update_fields=["status", "metadata", "awaiting_feedback_since", "updated_at"])
 
     if log.respondent_id != log.employer_id:
         sibling = (
@@ -1674,22 +2090,11 @@ def submit_skill_feedback(manager: Employer, *, log_id: int, message: str) -> Di
 
 
 def _log_completed_at(log: ReviewLog) -> Optional[datetime]:
-    metadata = log.metadata or {}
-    submitted_at = metadata.get("submitted_at")
-    if submitted_at:
-        try:
-            return datetime.fromisoformat(submitted_at)
-        except (TypeError, ValueError):
-            pass
-    return log.updated_at
+    return log.submitted_at or log.updated_at
 
 
 def _employee_for_employer(employer: Employer) -> Optional["Employee"]:
-    if employer.user_id is None:
-        return None
-    from api.models import Employee
-
-    return Employee.objects.select_related("department").filter(user=employer.user).first()
+    return current_profiles().employee_for_employer(employer)
 
 
 def _managers_for_employer(employer: Employer) -> List[Employer]:
@@ -1739,24 +2144,10 @@ def _team_employers_for_manager(manager: Employer) -> List[int]:
     if not employee_profile:
         return []
 
-    from api.models import Employee
-
     if manager.user and manager.user.is_superuser:
         return list(Employer.objects.values_list("id", flat=True))
 
-    managed_ids = employee_profile.managed_employee_ids()
-    if employee_profile.has_global_visibility():
-        managed_ids = set(Employee.objects.exclude(pk=employee_profile.pk).values_list("id", flat=True))
-
-    if not managed_ids:
-        return []
-
-    team_user_ids = [
-        row
-        for row in Employee.objects.filter(id__in=managed_ids).values_list("user_id", flat=True)
-        if row
-    ]
-
+    team_user_ids = employee_profile.managed_employees().values("user_id")
     return list(
         Employer.objects.filter(user_id__in=team_user_ids).values_list("id", flat=True)
     )
@@ -1771,9 +2162,7 @@ def _notify_feedback_required(log: ReviewLog, managers: Iterable[Employer]) -> i
 
     created = 0
     period_label = _period_label(log.period) if log.period else ""
-    due_at = None
-    if log.metadata:
-        due_at = log.metadata.get("due_at")
+    due_at = log.due_at.isoformat() if log.due_at else None
 
     for manager in managers:
         defaults = {
@@ -1888,7 +2277,7 @@ def skill_review_overview(employer: Employer) -> Dict:
                 logs_by_period[period.id] = log
 
         metadata = log.metadata or {} if log else {}
-        due_date = _period_due_date(employer, period, metadata)
+        due_date = _period_due_date(employer, period, log.due_at if log else None)
 
         stats = per_period_scores.get(period.id, {"sum": 0.0, "weight": 0.0})
         peer_stats = per_period_peer_scores.get(period.id, {"sum": 0.0, "weight": 0.0})
@@ -1907,20 +2296,12 @@ def skill_review_overview(employer: Employer) -> Dict:
         expires_at = None
         completed_at = None
         feedback_payload = None
-        submitted_at_iso = metadata.get("submitted_at")
-        awaiting_feedback_since = metadata.get("awaiting_feedback_since")
+        submitted_at_iso = log.submitted_at.isoformat() if log and log.submitted_at else None
+        awaiting_feedback_since = log.awaiting_feedback_since if log else None
         waiting_days = 0
-        available_from_iso = metadata.get("available_since") or due_date.isoformat()
-        try:
-            available_from_date = datetime.fromisoformat(available_from_iso).date()
-        except (TypeError, ValueError):
-            available_from_date = due_date
-
-        available_until_date = (
-            datetime.fromisoformat(available_from_iso).date() + timedelta(days=SKILL_REVIEW_MISS_GRACE_DAYS)
-            if available_from_iso
-            else due_date + timedelta(days=SKILL_REVIEW_MISS_GRACE_DAYS)
-        )
+        available_from_date = (log.available_since if log else None) or due_date
+        available_from_iso = available_from_date.isoformat()
+        available_until_date = available_from_date + timedelta(days=SKILL_REVIEW_MISS_GRACE_DAYS)
         days_left = max((available_until_date - today).days, 0)
         days_past_due = (today - available_until_date).days if today > available_until_date else 0
         overdue_flag = today > available_until_date
@@ -1958,13 +2339,7 @@ def skill_review_overview(employer: Employer) -> Dict:
                 tests_completed_by_employee += 1
                 completed_at = submitted_at_iso
                 if awaiting_feedback_since:
-                    try:
-                        waiting_days = max(
-                            (today - datetime.fromisoformat(awaiting_feedback_since).date()).days,
-                            0,
-                        )
-                    except (TypeError, ValueError):
-                        waiting_days = 0
+                    waiting_days = max((today - awaiting_feedback_since.date()).days, 0)
                 waiting_feedback_max = max(waiting_feedback_max, waiting_days)
             elif log.status in {ReviewLog.STATUS_PENDING, ReviewLog.STATUS_PENDING_EMAIL}:
                 if today < available_from_date:
@@ -2422,14 +2797,28 @@ def sync_employer_from_employee(employee: "Employee") -> Optional[Employer]:
         "date_of_employment": employee.hire_date,
     }
 
-    employer, created = Employer.objects.get_or_create(email=email, defaults=defaults)
-
     update_fields: List[str] = []
 
+    employer = (
+        Employer.objects.filter(employee=employee).first()
+        or Employer.objects.filter(user=user).first()
+    )
+    created = False
+    if employer is None:
+        employer, created = Employer.objects.get_or_create(email=email, defaults=defaults)
+    elif employer.email != email and not Employer.objects.filter(email=email).exclude(pk=employer.pk).exists():
+        employer.email = email
+        update_fields.append("email")
+
     if employer.user_id != user.id:
         employer.user = user
         update_fields.append("user")
 
+    if employer.employee_id != employee.id:
+        Employer.objects.filter(employee=employee).exclude(pk=employer.pk).update(employee=None)
+        employer.employee = employee
+        update_fields.append("employee")
+
     if employer.fio != fio:
         employer.fio = fio
         update_fields.append("fio")
@@ -2448,4 +2837,5 @@ def sync_employer_from_employee(employee: "Employee") -> Optional[Employer]:
     elif created:
         employer.save()
 
+    current_profiles().remember(employer=employer, employee=employee)
     return employer
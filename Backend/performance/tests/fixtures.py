@@ -0,0 +1,40 @@
+import datetime
+
+from django.contrib.auth.models import User
+
+from api.models import Employee
+from performance.models import ReviewQuestion
+from performance.services import create_goal_with_tasks, sync_employer_from_employee
+
+TODAY = datetime.date(2026, 3, 2)
+
+
+def make_employer(username, *, department=None, team=None, position=None):
+    user = User.objects.create_user(username=username, email=f"{username}@example.com", password="x")
+    employee = Employee.objects.create(
+        user=user,
+        department=department,
+        team=team,
+        position=position,
+        hire_date=datetime.date(2025, 1, 1),
+    )
+    return sync_employer_from_employee(employee)
+
+
+def make_task_questions(count=2):
+    return [
+        ReviewQuestion.objects.create(context="task", category=f"C{index}", question_text=f"Q{index}")
+        for index in range(count)
+    ]
+
+
+def make_task(employer, *, title="Task", end_date=TODAY):
+    result = create_goal_with_tasks(
+        title=f"Goal for {title}",
+        description="",
+        employer=employer,
+        creator=employer,
+        deadline=end_date,
+        tasks_payload=[{"title": title, "start_date": end_date - datetime.timedelta(days=30), "end_date": end_date}],
+    )
+    return result["tasks"][0]
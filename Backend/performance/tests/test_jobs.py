@@ -0,0 +1,154 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from performance import jobs
+from performance.jobs import (
+    PermanentJobError,
+    claim_next_job,
+    enqueue,
+    execute_job,
+    requeue_stale_jobs,
+    retry_delay,
+)
+from performance.models import BackgroundJob
+
+
+def _fail(payload):
+    raise RuntimeError("boom")
+
+
+def _fail_permanently(payload):
+    raise PermanentJobError("cannot succeed")
+
+
+TEST_HANDLERS = {
+    "echo": lambda payload: {"echo": payload},
+    "fail": _fail,
+    "fail_permanently": _fail_permanently,
+}
+
+
+@mock.patch.dict(jobs.HANDLERS, TEST_HANDLERS)
+class JobQueueTests(TestCase):
+
+    def test_claim_takes_oldest_due_job(self):
+        later = enqueue("echo")
+        BackgroundJob.objects.filter(pk=later.pk).update(run_after=timezone.now() - timedelta(minutes=1))
+        earlier = enqueue("echo")
+        BackgroundJob.objects.filter(pk=earlier.pk).update(run_after=timezone.now() - timedelta(minutes=5))
+        future = enqueue("echo")
+        BackgroundJob.objects.filter(pk=future.pk).update(run_after=timezone.now() + timedelta(minutes=5))
+
+        job = claim_next_job("worker")
+
+        self.assertEqual(job.pk, earlier.pk)
+        self.assertEqual(job.status, BackgroundJob.STATUS_RUNNING)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.locked_by, "worker")
+        self.assertGreater(job.locked_until, timezone.now())
+        self.assertEqual(claim_next_job("worker").pk, later.pk)
+        self.assertIsNone(claim_next_job("worker"))
+
+    def test_success_stores_result_and_releases_lock(self):
+        enqueue("echo", {"value": 1})
+
+        job = execute_job(claim_next_job("worker"))
+
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.result, {"echo": {"value": 1}})
+        self.assertEqual(job.locked_by, "")
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failure_is_retried_with_backoff_then_fails(self):
+        enqueue("fail", max_attempts=2)
+
+        before = timezone.now()
+        job = execute_job(claim_next_job("worker"))
+        self.assertEqual(job.status, BackgroundJob.STATUS_QUEUED)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.locked_by, "")
+        self.assertIn("boom", job.error)
+        self.assertGreaterEqual(job.run_after, before + retry_delay(1))
+        self.assertIsNone(claim_next_job("worker"))
+
+        BackgroundJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        job = execute_job(claim_next_job("worker"))
+        self.assertEqual(job.status, BackgroundJob.STATUS_FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_permanent_error_is_not_retried(self):
+        enqueue("fail_permanently", max_attempts=3)
+
+        job = execute_job(claim_next_job("worker"))
+
+        self.assertEqual(job.status, BackgroundJob.STATUS_FAILED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn("cannot succeed", job.error)
+
+    def test_retry_delay_is_capped(self):
+        self.assertEqual(retry_delay(1), timedelta(seconds=jobs.JOB_RETRY_BASE_SECONDS))
+        self.assertEqual(retry_delay(2), timedelta(seconds=jobs.JOB_RETRY_BASE_SECONDS * 2))
+        self.assertEqual(retry_delay(20), timedelta(seconds=jobs.JOB_RETRY_MAX_SECONDS))
+
+    def test_expired_lease_requeues_or_fails(self):
+        enqueue("echo", max_attempts=2)
+        retried = claim_next_job("dead")
+        enqueue("echo", max_attempts=1)
+        exhausted = claim_next_job("dead")
+        enqueue("echo")
+        alive = claim_next_job("alive")
+        now = timezone.now()
+        BackgroundJob.objects.filter(pk__in=[retried.pk, exhausted.pk]).update(locked_until=now - timedelta(seconds=1))
+
+        self.assertEqual(requeue_stale_jobs(now), 2)
+
+        retried.refresh_from_db()
+        exhausted.refresh_from_db()
+        alive.refresh_from_db()
+        self.assertEqual(retried.status, BackgroundJob.STATUS_QUEUED)
+        self.assertEqual(retried.locked_by, "")
+        self.assertEqual(exhausted.status, BackgroundJob.STATUS_FAILED)
+        self.assertEqual(exhausted.error, "Worker lease expired")
+        self.assertEqual(alive.status, BackgroundJob.STATUS_RUNNING)
+        self.assertEqual(alive.locked_by, "alive")
+
+    def test_outcome_of_requeued_job_is_discarded(self):
+        def requeued_meanwhile(payload):
+            BackgroundJob.objects.filter(name="requeued").update(
+                status=BackgroundJob.STATUS_QUEUED, locked_by="", locked_until=None
+            )
+            return {"done": True}
+
+        with mock.patch.dict(jobs.HANDLERS, {"requeued": requeued_meanwhile}):
+            enqueue("requeued")
+            with self.assertLogs("performance.jobs", level="ERROR"):
+                job = execute_job(claim_next_job("worker"))
+
+        self.assertEqual(job.status, BackgroundJob.STATUS_QUEUED)
+        self.assertEqual(job.result, {})
+
+
+@mock.patch.dict(jobs.HANDLERS, TEST_HANDLERS)
+class JobLeaseTests(TransactionTestCase):
+
+    def test_long_job_keeps_its_lease(self):
+        requeued = []
+
+        def slow(payload):
+            time.sleep(0.6)
+            # Well past the original lease: the job must not look abandoned.
+            requeued.append(requeue_stale_jobs())
+            return {"done": True}
+
+        with mock.patch.dict(jobs.HANDLERS, {"slow": slow}), mock.patch.object(jobs, "JOB_LEASE", timedelta(seconds=0.3)):
+            enqueue("slow")
+            job = execute_job(claim_next_job("worker"))
+
+        self.assertEqual(requeued, [0])
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.attempts, 1)
@@ -0,0 +1,52 @@
+import time
+from datetime import timedelta
+
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from performance.models import ScheduledJobRun, ScheduledJobState
+from performance.scheduler import ScheduledJob, _acquire, run_due_jobs
+
+
+class SchedulerLeaseTests(TransactionTestCase):
+
+    def test_long_run_keeps_its_lease(self):
+        taken_over = []
+
+        def slow_job():
+            time.sleep(0.6)
+            # Well past the original lease: another scheduler must still be locked out.
+            taken_over.append(_acquire(job, "other", timezone.now()))
+            return {"done": True}
+
+        job = ScheduledJob("slow", timedelta(hours=1), slow_job, lease=timedelta(seconds=0.3))
+        runs = run_due_jobs([job], worker="owner")
+
+        self.assertEqual(taken_over, [False])
+        self.assertEqual(runs[0].status, ScheduledJobRun.STATUS_SUCCESS)
+        state = ScheduledJobState.objects.get(name="slow")
+        self.assertEqual(state.locked_by, "")
+        self.assertIsNotNone(state.last_finished_at)
+
+    def test_lost_lock_is_reported(self):
+        def hijacked_job():
+            ScheduledJobState.objects.filter(name="hijacked").update(locked_by="other")
+            return {}
+
+        job = ScheduledJob("hijacked", timedelta(hours=1), hijacked_job)
+        runs = run_due_jobs([job], worker="owner")
+
+        self.assertEqual(runs[0].status, ScheduledJobRun.STATUS_FAILED)
+        self.assertIn("taken over", runs[0].error)
+        state = ScheduledJobState.objects.get(name="hijacked")
+        self.assertEqual(state.locked_by, "other")
+        self.assertIsNone(state.last_finished_at)
+
+    def test_due_job_runs_once(self):
+        calls = []
+        job = ScheduledJob("once", timedelta(hours=1), lambda: calls.append(1) or {})
+
+        run_due_jobs([job], worker="a")
+        run_due_jobs([job], worker="b")
+
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,283 @@
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.models import Department, DepartmentPosition, Employee, EmployeeRoleAssignment, Organization, Team
+from performance.models import (
+    Employer,
+    ReviewLog,
+    ReviewQuestion,
+    ReviewSchedule,
+    ReviewTask,
+    SiteNotification,
+    TaskReviewAnswer,
+    TeamRelation,
+)
+from performance.services import (
+    ServiceError,
+    _expire_review_logs,
+    _task_respondent_ids,
+    expire_stale_review_logs,
+    fetch_task_form,
+    process_review_schedules,
+    submit_task_answers,
+    trigger_task_reviews,
+)
+
+from .fixtures import TODAY, make_employer, make_task, make_task_questions
+
+
+class TaskRespondentTests(TestCase):
+
+    def setUp(self):
+        roles = EmployeeRoleAssignment.Role
+        self.organization = Organization.objects.create(name="Org")
+        self.root = Department.objects.create(name="Root", organization=self.organization)
+        self.department = Department.objects.create(name="Dev", organization=self.organization, parent=self.root)
+        self.team = Team.objects.create(department=self.department, name="Backend")
+        self.position = DepartmentPosition.objects.create(department=self.department, title="Engineer")
+
+        self.alice = make_employer("alice", department=self.department, team=self.team, position=self.position)
+        self.bob = make_employer("bob", department=self.department, team=self.team)
+        self.carol = make_employer("carol", department=self.department)
+        self.dave = make_employer("dave", department=self.department)
+        self.head = make_employer("head", department=self.root)
+        self.lead = make_employer("lead")
+        self.position_lead = make_employer("plead")
+        self.dismissed = make_employer("gone", department=self.department, team=self.team)
+        Employer.objects.filter(pk=self.dismissed.pk).update(date_of_dismissal=TODAY - datetime.timedelta(days=1))
+
+        EmployeeRoleAssignment.objects.create(employee=self.head.employee, role=roles.DEPARTMENT_HEAD, department=self.root)
+        EmployeeRoleAssignment.objects.create(employee=self.lead.employee, role=roles.ORGANIZATION_LEAD, organization=self.organization)
+        EmployeeRoleAssignment.objects.create(employee=self.position_lead.employee, role=roles.POSITION_LEAD, position=self.position)
+
+    def _reference(self, employer):
+        """Respondents resolved one employer at a time through ``Employee.responsible_managers``."""
+        profile = employer.employee
+        if profile.team_id:
+            colleagues = Employee.objects.filter(team_id=profile.team_id)
+        else:
+            colleagues = Employee.objects.filter(department_id=profile.department_id)
+        colleagues = set(colleagues.values_list("user_id", flat=True))
+        managers = set(profile.responsible_managers().values_list("user_id", flat=True))
+        users = (colleagues | managers) - {profile.user_id}
+        return set(
+            Employer.objects.filter(user_id__in=users)
+            .exclude(pk=self.dismissed.pk)
+            .values_list("id", flat=True)
+        )
+
+    def test_matches_per_employer_resolution(self):
+        employers = [self.alice, self.bob, self.carol, self.dave, self.head]
+        respondents = _task_respondent_ids(employers, TODAY)
+
+        for employer in employers:
+            self.assertEqual(respondents[employer.id], self._reference(employer), employer.fio)
+        self.assertEqual(
+            respondents[self.alice.id],
+            {self.bob.id, self.head.id, self.lead.id, self.position_lead.id},
+        )
+        self.assertEqual(respondents[self.carol.id], {self.alice.id, self.bob.id, self.dave.id, self.head.id, self.lead.id})
+
+    def test_explicit_relations_win(self):
+        TeamRelation.objects.create(employer=self.alice, peer=self.carol)
+        self.assertEqual(_task_respondent_ids([self.alice], TODAY)[self.alice.id], {self.carol.id})
+
+    def test_query_count_does_not_grow_with_employers(self):
+        with CaptureQueriesContext(connection) as few:
+            _task_respondent_ids([self.alice, self.carol], TODAY)
+        with CaptureQueriesContext(connection) as many:
+            _task_respondent_ids([self.alice, self.bob, self.carol, self.dave, self.head, self.lead], TODAY)
+        self.assertEqual(len(few), len(many))
+
+
+class TaskReviewLogReuseTests(TestCase):
+
+    def setUp(self):
+        make_task_questions()
+        department = Department.objects.create(name="Dev")
+        self.owner = make_employer("owner", department=department)
+        self.peer = make_employer("peer", department=department)
+        self.task = make_task(self.owner, title="Old title")
+
+    def test_retrigger_refreshes_metadata_and_notifications(self):
+        first = trigger_task_reviews(TODAY, task=self.task)
+        self.assertEqual(first[0]["notifications_created"], 2)
+        SiteNotification.objects.update(is_read=True)
+        log_ids = set(ReviewLog.objects.values_list("pk", flat=True))
+
+        self.task.title = "New title"
+        self.task.save()
+        ReviewLog.objects.update(metadata={"task_id": str(self.task.id), "task_title": "Old title", "extra": 1})
+        second = trigger_task_reviews(TODAY, task=self.task)
+
+        self.assertEqual(second[0]["notifications_created"], 0)
+        self.assertEqual(set(ReviewLog.objects.values_list("pk", flat=True)), log_ids)
+        for log in ReviewLog.objects.all():
+            self.assertEqual(log.metadata, {"task_id": str(self.task.id), "task_title": "New title", "extra": 1})
+            self.assertEqual(log.status, ReviewLog.STATUS_PENDING)
+        for notification in SiteNotification.objects.all():
+            self.assertFalse(notification.is_read)
+            self.assertIn("New title", notification.title)
+            self.assertEqual(notification.metadata["task_title"], "New title")
+            self.assertEqual(notification.metadata["notification_id"], str(notification.id))
+
+
+class ReviewScheduleProcessingTests(TestCase):
+
+    def setUp(self):
+        make_task_questions()
+        department = Department.objects.create(name="Dev")
+        self.owner = make_employer("owner", department=department)
+        make_employer("peer", department=department)
+        self.task = make_task(self.owner, end_date=TODAY)
+        self.pending = self.task.schedules.get()
+        self.closed = ReviewSchedule.objects.create(
+            context=ReviewLog.CONTEXT_TASK,
+            related_task=self.task,
+            review_start=TODAY - datetime.timedelta(days=60),
+            review_end=TODAY - datetime.timedelta(days=50),
+            status="completed",
+        )
+
+    def test_only_claimed_schedules_move(self):
+        summary = process_review_schedules(TODAY)
+
+        self.assertEqual(summary["started"], 1)
+        self.pending.refresh_from_db()
+        self.closed.refresh_from_db()
+        self.assertEqual(self.pending.status, "in_progress")
+        self.assertEqual(self.closed.status, "completed")
+
+    def test_schedules_of_inactive_tasks_are_closed_not_started(self):
+        ReviewTask.objects.filter(pk=self.task.pk).update(status="completed")
+
+        summary = process_review_schedules(TODAY)
+
+        self.assertEqual(summary["started"], 0)
+        self.assertEqual(summary["tasks"], [])
+        self.pending.refresh_from_db()
+        self.assertEqual(self.pending.status, "completed")
+
+    def _overdue_schedule(self):
+        return ReviewSchedule.objects.create(
+            context=ReviewLog.CONTEXT_TASK,
+            related_task=self.task,
+            review_start=TODAY - datetime.timedelta(days=20),
+            review_end=TODAY - datetime.timedelta(days=1),
+            status="in_progress",
+        )
+
+    def test_overdue_schedules_close_without_task_questions(self):
+        overdue = self._overdue_schedule()
+        ReviewQuestion.objects.filter(context="task").update(is_active=False)
+
+        summary = process_review_schedules(TODAY)
+
+        self.assertEqual((summary["started"], summary["closed"]), (0, 1))
+        overdue.refresh_from_db()
+        self.pending.refresh_from_db()
+        self.assertEqual(overdue.status, "completed")
+        self.assertEqual(self.pending.status, "pending")
+
+    def test_start_and_close_have_separate_batch_budgets(self):
+        overdue = self._overdue_schedule()
+
+        summary = process_review_schedules(TODAY, batch_size=1, max_batches=1)
+
+        self.assertEqual((summary["started"], summary["closed"], summary["batches"]), (1, 1, 2))
+        overdue.refresh_from_db()
+        self.assertEqual(overdue.status, "completed")
+
+    def test_manual_trigger_keeps_closed_schedules(self):
+        trigger_task_reviews(TODAY, task=self.task)
+
+        self.pending.refresh_from_db()
+        self.closed.refresh_from_db()
+        self.assertEqual(self.pending.status, "in_progress")
+        self.assertEqual(self.closed.status, "completed")
+
+
+class ReviewLogExpiryTests(TestCase):
+
+    def setUp(self):
+        make_task_questions()
+        department = Department.objects.create(name="Dev")
+        self.owner = make_employer("owner", department=department)
+        self.peer = make_employer("peer", department=department)
+        self.task = make_task(self.owner)
+        trigger_task_reviews(TODAY, task=self.task)
+        self.log = ReviewLog.objects.get(respondent=self.peer)
+
+    def _outstanding(self):
+        return ReviewTask.objects.values_list("outstanding_reviews", flat=True).get(pk=self.task.pk)
+
+    def test_double_expiry_decrements_once(self):
+        self.assertEqual(self._outstanding(), 2)
+
+        first = _expire_review_logs([self.log.id], timezone.now())
+        second = _expire_review_logs([self.log.id], timezone.now())
+
+        self.assertEqual(first["expired"], 1)
+        self.assertEqual(second, {"expired": 0, "notifications_removed": 0, "tasks_completed": 0})
+        self.assertEqual(self._outstanding(), 1)
+
+    def test_lazy_expiry_and_sweep_decrement_once(self):
+        ReviewLog.objects.filter(pk=self.log.pk).update(expires_at=timezone.now() - datetime.timedelta(minutes=1))
+
+        for _ in range(2):
+            with self.assertRaises(ServiceError) as raised:
+                fetch_task_form(self.log.token)
+            self.assertEqual(raised.exception.code, "link_expired")
+        self.assertEqual(expire_stale_review_logs()["expired"], 0)
+
+        self.assertEqual(self._outstanding(), 1)
+        self.assertFalse(SiteNotification.objects.filter(related_log=self.log).exists())
+
+
+class TaskReviewSubmitTests(TestCase):
+
+    def setUp(self):
+        self.questions = make_task_questions()
+        department = Department.objects.create(name="Dev")
+        self.owner = make_employer("owner", department=department)
+        self.peer = make_employer("peer", department=department)
+        self.task = make_task(self.owner)
+        trigger_task_reviews(TODAY, task=self.task)
+
+    def _submit(self, respondent, grades):
+        log = ReviewLog.objects.get(respondent=respondent)
+        return submit_task_answers(log.token, [{"id": str(question.id), "grade": grade} for question, grade in grades])
+
+    def _outstanding(self):
+        return ReviewTask.objects.values_list("outstanding_reviews", flat=True).get(pk=self.task.pk)
+
+    def test_submit_counts_distinct_answers_and_decrements_once(self):
+        first, second = self.questions
+        result = self._submit(self.peer, [(first, 3), (first, 7), (second, 5)])
+
+        self.assertEqual(result["answers_saved"], 2)
+        self.assertFalse(result["review_completed"])
+        self.assertEqual(self._outstanding(), 1)
+        self.assertEqual(
+            dict(TaskReviewAnswer.objects.filter(respondent=self.peer).values_list("question_id", "grade")),
+            {first.id: 7, second.id: 5},
+        )
+        self.assertEqual(ReviewLog.objects.get(respondent=self.peer).status, ReviewLog.STATUS_COMPLETED)
+
+        with self.assertRaises(ServiceError) as raised:
+            self._submit(self.peer, [(first, 1)])
+        self.assertEqual((raised.exception.code, raised.exception.status), ("already_submitted", 409))
+        self.assertEqual(self._outstanding(), 1)
+
+    def test_last_submit_completes_task_and_schedules(self):
+        self._submit(self.peer, [(question, 6) for question in self.questions])
+        result = self._submit(self.owner, [(question, 8) for question in self.questions])
+
+        self.assertTrue(result["review_completed"])
+        self.assertEqual(self._outstanding(), 0)
+        self.assertEqual(ReviewTask.objects.get(pk=self.task.pk).status, "completed")
+        self.assertEqual(set(self.task.schedules.values_list("status", flat=True)), {"completed"})
@@ -8,6 +8,7 @@ router.register(r"skill-questions", views.SkillQuestionViewSet, basename="skill-
 
 urlpatterns = [
     path("review/initiate/", views.ReviewCycleInitiateView.as_view(), name="review-initiate"),
+    path("review/initiate/async/", views.ReviewCycleInitiateAsyncView.as_view(), name="review-initiate-async"),
     path("review/form/", views.ReviewFormView.as_view(), name="review-form"),
     path("review/submit/", views.ReviewSubmitView.as_view(), name="review-submit"),
     path("review/analytics/", views.ReviewAnalyticsView.as_view(), name="review-analytics"),
@@ -19,6 +20,7 @@ urlpatterns = [
     path("task-review/start/", views.TaskReviewTriggerView.as_view(), name="task-review-start"),
     path("task-review/form/", views.TaskReviewFormView.as_view(), name="task-review-form"),
     path("task-review/submit/", views.TaskReviewSubmitView.as_view(), name="task-review-submit"),
+    path("jobs/<uuid:job_id>/", views.BackgroundJobDetailView.as_view(), name="background-job-detail"),
     path("notifications/", views.NotificationListView.as_view(), name="notifications"),
     path(
         "notifications/<uuid:notification_id>/read/",
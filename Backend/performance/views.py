@@ -9,11 +9,13 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
-from api.models import Employee
-from .models import Employer, ReviewGoal, ReviewPeriod, ReviewTask, SiteNotification, SkillQuestion
+from .jobs import accepted_job_response, enqueue
+from .models import BackgroundJob, Employer, ReviewGoal, ReviewPeriod, ReviewTask, SiteNotification, SkillQuestion
+from .profiles import current_profiles
 from .serializers import (
     AdaptationIndexQuerySerializer,
     AnalyticsQuerySerializer,
+    BackgroundJobSerializer,
     NotificationSerializer,
     ReviewCycleTriggerSerializer,
     ReviewSubmitSerializer,
@@ -54,6 +56,18 @@ def _service_error_response(error: ServiceError) -> Response:
     )
 
 
+class BackgroundJobDetailView(APIView):
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, job_id):
+        jobs = BackgroundJob.objects.all()
+        if not request.user.is_staff:
+            jobs = jobs.filter(requested_by=request.user)
+        job = get_object_or_404(jobs, pk=job_id)
+        return Response(BackgroundJobSerializer(job).data)
+
+
 class ReviewCycleInitiateView(APIView):
 
     permission_classes = [permissions.IsAdminUser]
@@ -66,6 +80,21 @@ class ReviewCycleInitiateView(APIView):
         return Response({"status": "success", **result})
 
 
+class ReviewCycleInitiateAsyncView(APIView):
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        serializer = ReviewCycleTriggerSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = enqueue(
+            "skill_review_cycles",
+            {"current_date": serializer.get_current_date().isoformat()},
+            requested_by=request.user,
+        )
+        return accepted_job_response(request, job)
+
+
 class ReviewFormView(APIView):
 
     permission_classes = [permissions.AllowAny]
@@ -127,8 +156,9 @@ class SkillReviewOverviewView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        employer = Employer.objects.filter(user=request.user).first()
-        employee = Employee.objects.filter(user=request.user).first()
+        profiles = current_profiles()
+        employer = profiles.employer_for_user(request.user)
+        employee = profiles.employee_for_user(request.user)
 
         if not employer and employee:
             employer = sync_employer_from_employee(employee)
@@ -177,8 +207,9 @@ class SkillReviewManagerQueueView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        employer = Employer.objects.filter(user=request.user).first()
-        employee = Employee.objects.filter(user=request.user).first()
+        profiles = current_profiles()
+        employer = profiles.employer_for_user(request.user)
+        employee = profiles.employee_for_user(request.user)
 
         if not employer and employee:
             employer = sync_employer_from_employee(employee)
@@ -195,6 +226,7 @@ class SkillReviewManagerQueueView(APIView):
                     "position": "Администратор",
                 },
             )
+            profiles.remember(employer=employer)
 
         if not employer:
             return Response(
@@ -224,8 +256,9 @@ class SkillReviewFeedbackView(APIView):
         serializer.is_valid(raise_exception=True)
         message = serializer.validated_data["message"].strip()
 
-        employer = Employer.objects.filter(user=request.user).first()
-        employee = Employee.objects.filter(user=request.user).first()
+        profiles = current_profiles()
+        employer = profiles.employer_for_user(request.user)
+        employee = profiles.employee_for_user(request.user)
 
         if not employer and employee:
             employer = sync_employer_from_employee(employee)
@@ -242,6 +275,7 @@ class SkillReviewFeedbackView(APIView):
                     "position": "Администратор",
                 },
             )
+            profiles.remember(employer=employer)
 
         if not employer:
             return Response(
@@ -398,7 +432,7 @@ class NotificationListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        employer = Employer.objects.filter(user=request.user).first()
+        employer = current_profiles().employer_for_user(request.user)
         if not employer:
             return Response({"results": [], "unread_count": 0})
 
@@ -428,7 +462,7 @@ class NotificationMarkReadView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, notification_id):
-        employer = Employer.objects.filter(user=request.user).first()
+        employer = current_profiles().employer_for_user(request.user)
         if not employer:
             return Response({"detail": "Profile not linked"}, status=status.HTTP_404_NOT_FOUND)
 
@@ -441,7 +475,7 @@ class NotificationMarkAllView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
-        employer = Employer.objects.filter(user=request.user).first()
+        employer = current_profiles().employer_for_user(request.user)
         if not employer:
             return Response({"status": "success", "updated": 0})
 
@@ -484,7 +518,7 @@ class SkillQuestionViewSet(viewsets.ModelViewSet):
         if self.request.user.is_superuser:
             return queryset
 
-        employee = Employee.objects.filter(user=self.request.user).first()
+        employee = current_profiles().employee_for_user(self.request.user)
         if employee and employee.has_global_visibility():
             return queryset
 
@@ -498,7 +532,7 @@ class SkillQuestionViewSet(viewsets.ModelViewSet):
         if user.is_superuser:
             return [permissions.IsAuthenticated()]
 
-        employee = Employee.objects.filter(user=user).first()
+        employee = current_profiles().employee_for_user(user)
         if employee and employee.has_global_visibility():
             return [permissions.IsAuthenticated()]
 